@@ -0,0 +1,76 @@
+"""
+Benchmark for the float32 numeric pipeline option.
+Fits the preprocessor on data/raw/stud.csv once per precision, runs the model search
+on the transformed training matrix and prints the matrix size, the peak memory
+allocated during the search, search seconds and the per-family validation R2, plus
+the champion's test R2 against the float64 run. Nothing under artifacts/ is written.
+
+Usage (from the project root):
+    python -m benchmarks.bench_float_precision [--target math_score] [--replicate 1] [--n-jobs 1]
+"""
+import time
+import argparse
+import tracemalloc
+import numpy as np
+import pandas as pd
+from sklearn.model_selection import train_test_split
+from sklearn.metrics import r2_score
+#------------------------------------------------------------------
+import src.myproject.utils as utils
+import src.myproject.constants as constants
+from src.myproject.config.config_app import ModelTrainerConfig
+from src.myproject.components.model_search import ModelSearch
+#------------------------------------------------------------------
+def load_splits(target: str, replicate: int):
+    """Train/validation/test splits of the raw student file, replicated `replicate` times."""
+    df = pd.read_csv(constants.DATA_RAW_FILE_AND_PATH)
+    df = pd.concat([df] * replicate, ignore_index=True)
+    X, y = df.drop(columns=[target]), df[target]
+    X_train, X_rest, y_train, y_rest = train_test_split(X, y, test_size=0.4, random_state=constants.RANDOM_STATE)
+    X_val, X_test, y_val, y_test = train_test_split(X_rest, y_rest, test_size=0.5, random_state=constants.RANDOM_STATE)
+    return X_train, y_train, X_val, y_val, X_test, y_test
+#------------------------------------------------------------------
+def run_precision(precision: str, splits, n_jobs: int) -> dict:
+    X_train, y_train, X_val, y_val, X_test, y_test = splits
+    dtype = utils.get_float_dtype(precision)
+    X_train, X_val, X_test = (utils.cast_numeric_features(part, dtype) for part in (X_train, X_val, X_test))
+    num_cols, cat_cols = utils.list_dataframe_columns_by_type(X_train)
+    preprocessor = utils.create_data_transformation_object(num_cols, cat_cols, dtype=dtype)
+    x_train = np.asarray(preprocessor.fit_transform(X_train))
+    x_val, x_test = np.asarray(preprocessor.transform(X_val)), np.asarray(preprocessor.transform(X_test))
+
+    search = ModelSearch(n_jobs=n_jobs, cv_folds=constants.MODEL_TRAINER_CV_FOLDS)
+    tracemalloc.start()
+    started = time.perf_counter()
+    results = search.run(ModelTrainerConfig().model_hyperparameters, x_train, y_train.to_numpy())
+    seconds = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    val_r2 = {family: r2_score(y_val, result.best_estimator.predict(x_val)) for family, result in results.items()}
+    champion = max(val_r2, key=val_r2.get)
+    return {"dtype": str(x_train.dtype), "matrix_bytes": x_train.nbytes, "peak_bytes": peak, "seconds": seconds,
+            "val_r2": val_r2, "champion": champion,
+            "test_r2": r2_score(y_test, results[champion].best_estimator.predict(x_test))}
+#------------------------------------------------------------------
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target", default="math_score")
+    parser.add_argument("--replicate", type=int, default=1)
+    parser.add_argument("--n-jobs", type=int, default=1)
+    args = parser.parse_args()
+
+    splits = load_splits(args.target, args.replicate)
+    runs = {precision: run_precision(precision, splits, args.n_jobs) for precision in ("float64", "float32")}
+    print(f"{'precision':>10} {'matrix MB':>10} {'peak MB':>9} {'seconds':>9} {'champion':>26} {'test R2':>9}")
+    for precision, run in runs.items():
+        print(f"{precision:>10} {run['matrix_bytes'] / 1e6:>10.3f} {run['peak_bytes'] / 1e6:>9.1f} "
+              f"{run['seconds']:>9.2f} {run['champion']:>26} {run['test_r2']:>9.4f}")
+    print(f"\n{'family':>26} {'val R2 f64':>11} {'val R2 f32':>11} {'delta':>10}")
+    for family, score in runs["float64"]["val_r2"].items():
+        other = runs["float32"]["val_r2"].get(family, float("nan"))
+        print(f"{family:>26} {score:>11.5f} {other:>11.5f} {other - score:>10.2e}")
+    print(f"\nchampion test R2 delta (float32 - float64): {runs['float32']['test_r2'] - runs['float64']['test_r2']:.2e}")
+#------------------------------------------------------------------
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+Benchmark for multi-process bulk scoring.
+Builds a synthetic input by replicating data/raw/stud.csv, scores it with
+BulkScoringPipeline for each worker count and prints rows/sec and the speed-up
+over a single worker.
+
+Usage (from the project root):
+    python -m benchmarks.bench_parallel_scoring [--rows 2000000] [--chunk-size 100000] [--workers 1 2 4 8]
+"""
+import os
+import argparse
+import tempfile
+from pathlib import Path
+import pandas as pd
+#------------------------------------------------------------------
+import src.myproject.constants as constants
+from src.myproject.pipeline.batch_predict_pipeline import BulkScoringPipeline
+#------------------------------------------------------------------
+def make_input(path: Path, n_rows: int) -> Path:
+    """Replicates the raw student file (without the target) up to n_rows."""
+    df = pd.read_csv(constants.DATA_RAW_FILE_AND_PATH)
+    df = df.drop(columns=[col for col in ("math_score", constants.TARGET_COLUMN) if col in df.columns])
+    repeats = -(-n_rows // len(df))
+    pd.concat([df] * repeats, ignore_index=True).head(n_rows).to_csv(path, index=False)
+    return path
+#------------------------------------------------------------------
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--chunk-size", type=int, default=100_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, os.cpu_count() or 1])
+    args = parser.parse_args()
+
+    pipeline = BulkScoringPipeline()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        input_path = make_input(Path(tmp_dir) / "input.csv", args.rows)
+        print(f"{'workers':>8} {'seconds':>10} {'rows/sec':>12} {'speed-up':>9}")
+        baseline = None
+        for workers in sorted(set(args.workers)):
+            summary = pipeline.score(input_path, Path(tmp_dir) / f"out_{workers}.csv",
+                                     chunk_size=args.chunk_size, resume=False, workers=workers)
+            baseline = baseline or summary["rows_per_sec"]
+            print(f"{workers:>8} {summary['seconds']:>10.2f} {summary['rows_per_sec']:>12.0f} "
+                  f"{summary['rows_per_sec'] / baseline:>8.2f}x")
+#------------------------------------------------------------------
+if __name__ == "__main__":
+    main()
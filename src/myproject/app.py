@@ -1,8 +1,19 @@
+import io
+import hmac
+import time
+import functools
+import numpy as np
 import pandas as pd
-import joblib
-from flask import Flask, render_template, request
+from flask import Flask, render_template, request, jsonify, Response
 import os
 
+import src.myproject.utils as utils
+import src.myproject.constants as constants
+import src.myproject.metrics as metrics
+from src.myproject.pipeline.request_coalescer import RequestCoalescer
+from src.myproject.pipeline.model_registry import ModelRegistry
+from src.myproject.config.config_app import PredictionPipelineConfig
+
 # Get the directory of the current script (src/myproject)
 current_dir = os.path.dirname(os.path.abspath(__file__))
 # Go up two levels to reach the PROJECT_ROOT
@@ -17,39 +28,171 @@ app = applicaton
 PREPROCESSOR_PATH = os.path.join(project_root, "artifacts", "models", "preprocessor.joblib")
 MODEL_PATH = os.path.join(project_root, "artifacts", "models", "champion_model.joblib")
 #----------------------------------------------------------------
-# Load artifacts once when app starts
-preprocessor = joblib.load(PREPROCESSOR_PATH)
-model = joblib.load(MODEL_PATH)
+# Load and warm artifacts once when app starts; the registry swaps them on hot reload.
+# The preprocessor outputs DataFrames as configured when it was built; the registry never reconfigures it.
+# The exhaustive lookup table is included when PREDICT_SERVING_MODE=table, and a
+# linear champion is served through its compiled NumPy fast path.
+#----------------------------------------------------------------
+serving_config = PredictionPipelineConfig()
+registry = ModelRegistry(PREPROCESSOR_PATH, MODEL_PATH, table_path=serving_config.prediction_table_file_path,
+                         use_table=constants.PREDICT_SERVING_MODE == "table",
+                         compiled_path=serving_config.compiled_model_file_path)
+registry.start_watcher()
+#----------------------------------------------------------------
+# Optional micro-batching: concurrent /predict calls share one transform/predict
+#----------------------------------------------------------------
+def predict_dataframe(df: pd.DataFrame):
+    return registry.current.predict_dataframe(df)
+
+coalescer = RequestCoalescer(predict_dataframe) if constants.PREDICT_COALESCE_ENABLED else None
+#----------------------------------------------------------------
+def admin_authorized() -> bool:
+    """Admin endpoints require X-Admin-Token to match ADMIN_TOKEN; without a configured token they are closed."""
+    if not constants.ADMIN_TOKEN:
+        return False
+    return hmac.compare_digest(request.headers.get('X-Admin-Token', ''), constants.ADMIN_TOKEN)
 #----------------------------------------------------------------
-# Critical: Ensure the preprocessor always outputs a DataFrame
-preprocessor.set_output(transform="pandas")
+def instrumented(endpoint: str):
+    """Counts requests and errors (exceptions or 4xx/5xx) and times the whole request."""
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            metrics.prediction_requests.inc(endpoint=endpoint)
+            started = time.perf_counter()
+            try:
+                response = view(*args, **kwargs)
+            except Exception:
+                metrics.prediction_errors.inc(endpoint=endpoint)
+                raise
+            finally:
+                metrics.request_latency.observe(time.perf_counter() - started, endpoint=endpoint)
+            if isinstance(response, tuple) and response[1] >= 400:
+                metrics.prediction_errors.inc(endpoint=endpoint)
+            return response
+        return wrapper
+    return decorator
 #----------------------------------------------------------------
 @app.route('/')
 def index():
     return render_template('index.html')
 #----------------------------------------------------------------
 @app.route('/predict', methods=['POST'])
+@instrumented('predict')
 def predict():
     # Extract data from form matching stud.csv columns
+    parse_started = time.perf_counter()
     data = {
-        'gender': [request.form.get('gender')],
-        'race_ethnicity': [request.form.get('race_ethnicity')],
-        'parental_level_of_education': [request.form.get('parental_level_of_education')],
-        'lunch': [request.form.get('lunch')],
-        'test_preparation_course': [request.form.get('test_preparation_course')],
-        'reading_score': [float(request.form.get('reading_score'))],
-        'writing_score': [float(request.form.get('writing_score'))]
+        'gender': request.form.get('gender'),
+        'race_ethnicity': request.form.get('race_ethnicity'),
+        'parental_level_of_education': request.form.get('parental_level_of_education'),
+        'lunch': request.form.get('lunch'),
+        'test_preparation_course': request.form.get('test_preparation_course'),
+        'reading_score': float(request.form.get('reading_score')),
+        'writing_score': float(request.form.get('writing_score'))
     }
+    metrics.stage_latency.observe(time.perf_counter() - parse_started, stage='parse')
+    metrics.prediction_rows.inc(endpoint='predict')
     #----------------------------------------------------------------
-    # Convert to DataFrame
-    df = pd.DataFrame(data)
+    # Pin one artifact bundle for the whole request (hot reload safe)
     #----------------------------------------------------------------
-    # Transform and Predict
+    artifacts = registry.current
     #----------------------------------------------------------------
-    transformed_data = preprocessor.transform(df)
-    prediction = model.predict(transformed_data)
+    # Table path: O(1) lookup, falls through to the model when out of range
+    #----------------------------------------------------------------
+    if artifacts.prediction_table is not None:
+        with metrics.stage_latency.time(stage='lookup'):
+            prediction = artifacts.prediction_table.lookup(data)
+        if prediction is not None:
+            return render_template('index.html', results=round(prediction, 2))
+    #----------------------------------------------------------------
+    # Coalesced path: queue the row and wait for its micro-batch
+    #----------------------------------------------------------------
+    if coalescer is not None:
+        prediction = coalescer.predict(data)
+        return render_template('index.html', results=round(prediction, 2))
+    #----------------------------------------------------------------
+    # Encode straight into a NumPy row (no DataFrame) and Predict
+    #----------------------------------------------------------------
+    prediction = artifacts.predict_record(data)
     
-    return render_template('index.html', results=round(prediction[0], 2))
+    return render_template('index.html', results=round(prediction, 2))
+#----------------------------------------------------------------
+@app.route('/predict/batch', methods=['POST'])
+@instrumented('predict_batch')
+def predict_batch():
+    """Scores a JSON array of records (or a CSV body) in a single transform/predict call."""
+    #----------------------------------------------------------------
+    # Parse the request body into one DataFrame
+    #----------------------------------------------------------------
+    parse_started = time.perf_counter()
+    try:
+        if request.is_json:
+            payload = request.get_json()
+            records = payload.get('records') if isinstance(payload, dict) else payload
+            if not isinstance(records, list):
+                return jsonify(error="Expected a JSON array of records or {\"records\": [...]}"), 400
+            df = pd.DataFrame.from_records(records)
+        elif 'file' in request.files:
+            df = pd.read_csv(request.files['file'])
+        else:
+            df = pd.read_csv(io.StringIO(request.get_data(as_text=True)))
+    except Exception as e:
+        return jsonify(error=f"Could not parse request body: {e}"), 400
+    metrics.stage_latency.observe(time.perf_counter() - parse_started, stage='parse')
+    #----------------------------------------------------------------
+    # Validate the whole batch before scoring any of it
+    #----------------------------------------------------------------
+    if df.empty:
+        return jsonify(error="No records supplied"), 400
+    if len(df) > constants.PREDICT_BATCH_MAX_ROWS:
+        return jsonify(error=f"Batch of {len(df)} rows exceeds the limit of {constants.PREDICT_BATCH_MAX_ROWS}"), 413
+    artifacts = registry.current
+    with metrics.stage_latency.time(stage='validate'):
+        df, errors = utils.validate_prediction_records(df, artifacts.preprocessor)
+    if errors:
+        return jsonify(error="Validation failed", details=errors), 400
+    #----------------------------------------------------------------
+    # One vectorized Transform and Predict for the entire batch
+    #----------------------------------------------------------------
+    metrics.batch_size.observe(len(df), endpoint='predict_batch')
+    metrics.prediction_rows.inc(len(df), endpoint='predict_batch')
+    if artifacts.prediction_table is not None:
+        with metrics.stage_latency.time(stage='lookup'):
+            predictions = artifacts.prediction_table.lookup_many(df)
+        missing = np.isnan(predictions)
+        if missing.any():
+            predictions[missing] = artifacts.predict_dataframe(df[missing])
+    else:
+        predictions = artifacts.predict_dataframe(df)
+
+    return jsonify(count=len(predictions), predictions=predictions.tolist())
+#----------------------------------------------------------------
+@app.route('/predict/coalescer', methods=['GET'])
+def coalescer_stats():
+    """Batch-size and queueing-delay metrics of the micro-batching layer."""
+    if coalescer is None:
+        return jsonify(enabled=False)
+    return jsonify(enabled=True, **coalescer.stats(reset=request.args.get('reset') == '1'))
+#----------------------------------------------------------------
+@app.route('/metrics', methods=['GET'])
+def prometheus_metrics():
+    """Request/error counters and per-stage latency histograms in Prometheus text format."""
+    return Response(metrics.REGISTRY.render_prometheus(), content_type=metrics.PROMETHEUS_CONTENT_TYPE)
+#----------------------------------------------------------------
+@app.route('/admin/model', methods=['GET'])
+def model_status():
+    """Version of the champion currently served and the state of the last reload."""
+    if not admin_authorized():
+        return jsonify(error="Unauthorized"), 401
+    return jsonify(registry.status())
+#----------------------------------------------------------------
+@app.route('/admin/reload', methods=['POST'])
+def reload_model():
+    """Loads and warms the artifacts on disk in the background, then swaps them in atomically."""
+    if not admin_authorized():
+        return jsonify(error="Unauthorized"), 401
+    started = registry.reload(wait=request.args.get('wait') == '1')
+    return jsonify(started=started, **registry.status()), 202 if started else 409
 #----------------------------------------------------------------
 if __name__ == "__main__":
     app.run(host="0.0.0.0", port=5000, debug=True)
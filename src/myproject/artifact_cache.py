@@ -0,0 +1,108 @@
+"""
+Artifact Cache Module for the Application
+This module keeps loaded joblib artifacts (preprocessor, champion model) in a
+process-wide, size-bounded LRU cache so repeated predictions reuse them and
+only reload an artifact when it actually changes on disk.
+"""
+import sys
+import hashlib
+import threading
+from pathlib import Path
+from collections import OrderedDict
+import joblib
+#------------------------------------------------------------------
+# Import custom exception and constants
+#------------------------------------------------------------------
+import src.myproject.exception as exception
+import src.myproject.constants as constants
+#------------------------------------------------------------------
+# Helpers to fingerprint an artifact file
+#------------------------------------------------------------------
+def _stat_fingerprint(path: Path):
+    """Cheap fingerprint from file metadata: (mtime in ns, size in bytes)."""
+    stat = path.stat()
+    return stat.st_mtime_ns, stat.st_size
+#------------------------------------------------------------------
+def file_content_hash(path: Path, block_size: int = 1 << 20) -> str:
+    """Expensive fingerprint from the file content (SHA-256)."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for block in iter(lambda: file.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+#------------------------------------------------------------------
+# Artifact Cache Class
+#------------------------------------------------------------------
+class ArtifactCache:
+    def __init__(self, max_entries: int = constants.ARTIFACT_CACHE_MAX_ENTRIES,
+                 hash_content: bool = constants.ARTIFACT_CACHE_HASH_CONTENT):
+        """
+        max_entries: number of artifacts kept before the least recently used is evicted.
+        hash_content: when the file metadata changes, compare a content hash before
+                      reloading, so a touched-but-identical file keeps its cached object.
+        """
+        self.max_entries = max(1, int(max_entries))
+        self.hash_content = hash_content
+        self._entries = OrderedDict()   # path -> (stat fingerprint, content hash, object)
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+    #----------------------------------------------------------------
+    def load(self, file_path, mmap_mode=None):
+        """Returns the cached object for file_path, loading it only if it is new or changed."""
+        try:
+            path = Path(file_path).resolve()
+            key = (str(path), mmap_mode)
+            stat_fp = _stat_fingerprint(path)
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    cached_stat_fp, cached_content_fp, obj = entry
+                    if cached_stat_fp == stat_fp:
+                        self._entries.move_to_end(key)
+                        self.hits += 1
+                        return obj
+                    #----------------------------------------------------
+                    # Metadata changed: optionally confirm via content hash
+                    #----------------------------------------------------
+                    if self.hash_content:
+                        content_fp = file_content_hash(path)
+                        if content_fp == cached_content_fp:
+                            self._entries[key] = (stat_fp, content_fp, obj)
+                            self._entries.move_to_end(key)
+                            self.hits += 1
+                            return obj
+                #----------------------------------------------------
+                # Miss: load from disk and evict the least recently used entries
+                #----------------------------------------------------
+                self.misses += 1
+                content_fp = file_content_hash(path) if self.hash_content else None
+                obj = joblib.load(path, mmap_mode=mmap_mode)
+                self._entries[key] = (stat_fp, content_fp, obj)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                return obj
+        except Exception as e:
+            exc_type, exc_value, exc_traceback = sys.exc_info()
+            raise exception.CustomException(exc_type, exc_value, exc_traceback) from e
+    #----------------------------------------------------------------
+    def invalidate(self, file_path=None):
+        """Drops one artifact (every mmap mode of it) from the cache, or all of them when no path is given."""
+        with self._lock:
+            if file_path is None:
+                self._entries.clear()
+                return
+            path = str(Path(file_path).resolve())
+            for key in [key for key in self._entries if key[0] == path]:
+                del self._entries[key]
+    #----------------------------------------------------------------
+    def stats(self) -> dict:
+        """Returns hit/miss counters and the current cache size."""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses,
+                    "entries": len(self._entries), "max_entries": self.max_entries}
+#------------------------------------------------------------------
+# Process-wide cache instance shared by the prediction pipeline and the app
+#------------------------------------------------------------------
+artifact_cache = ArtifactCache()
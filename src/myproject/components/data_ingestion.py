@@ -7,7 +7,12 @@ and handles exceptions using the CustomException class.
 # Import necessary Standard and 3rd party libraries
 #------------------------------------------------------------------
 import sys
+import time
+from itertools import chain
+from contextlib import ExitStack
+import numpy as np
 import pandas as pd
+from joblib import effective_n_jobs
 #------------------------------------------------------------------
 # Import Modules: Custom Exception and Logger
 #------------------------------------------------------------------
@@ -15,6 +20,8 @@ import src.myproject.utils as utils
 import src.myproject.logger as logger
 import src.myproject.exception as exception
 from src.myproject.config.config_app import DataIngestionConfig
+from src.myproject.components.data_splits import DataSplits
+from src.myproject.components.db_source import DatabaseSource
 #------------------------------------------------------------------
 # Log module loading
 #------------------------------------------------------------------
@@ -51,6 +58,8 @@ class DataIngestion:
             #----------------------------------------------------------------
             logger.app_logger.info("Separating features and target variable: %s", str(self.ingestion_config.target_column))
             X = df.drop(columns=[self.ingestion_config.target_column], axis=1)
+            if utils.get_float_dtype(self.ingestion_config.float_precision) != np.float64:
+                X = utils.cast_numeric_features(X, utils.get_float_dtype(self.ingestion_config.float_precision))
             y = df[self.ingestion_config.target_column]
             logger.app_logger.info("Feature and target variable separation completed successfully.")
             
@@ -59,6 +68,267 @@ class DataIngestion:
             exc_type, exc_value, exc_traceback = sys.exc_info()
             raise exception.CustomException(exc_type, exc_value, exc_traceback) from ce
     #-----------------------------------------------------------------
+    # Database source: DATABASE_URL / DB_TABLE instead of the raw file
+    #-----------------------------------------------------------------
+    def database_source(self) -> DatabaseSource:
+        """The configured table read with the configured columns, predicate and ordering."""
+        config = self.ingestion_config
+        columns = [col.strip() for col in config.db_columns.split(",") if col.strip()]
+        if columns and config.target_column not in columns:
+            columns.append(config.target_column)
+        params = [value.strip() for value in config.db_params.split(",")] if config.db_params else []
+        return DatabaseSource(config.database_url, config.db_table, columns=columns or None, where=config.db_where,
+                              params=params, order_by=config.db_order_by, fetch_size=config.db_fetch_size)
+    #-----------------------------------------------------------------
+    def database_batches(self, batch_size: int | None = None):
+        """
+        (dtype schema, batches) of the database source. The schema is the saved ingestion schema
+        when its columns match the query, else it is inferred from the first batch, so every
+        batch is cast the same way as the chunks of a raw file.
+        """
+        config = self.ingestion_config
+        source = self.database_source()
+        batches = source.iter_batches(batch_size)
+        first = next(batches, None)
+        if first is None:
+            raise ValueError(f"{source.describe()} returned no rows")
+        if config.target_column not in first.columns:
+            raise ValueError(f"Target column {config.target_column!r} is not in {source.describe()}")
+        schema = utils.resolve_dtype_schema(source.describe(), config.ingestion_schema_path, config.target_column,
+                                            float_dtype=utils.get_float_dtype(config.float_precision), sample=first)
+        return schema, (batch.astype(schema) for batch in chain([first], batches))
+    #-----------------------------------------------------------------
+    def initiate_data_ingestion_from_db(self):
+        """
+        Ingest the configured database table in batches of db_fetch_size rows; returns the
+        DataFrame and X, y as initiate_data_ingestion_from_file does.
+        """
+        try:
+            config = self.ingestion_config
+            logger.app_logger.info("Starting data ingestion from database (%d rows per fetch)", config.db_fetch_size)
+            schema, batches = self.database_batches(config.db_fetch_size)
+            #----------------------------------------------------------------
+            # Batches carry their own categories; restore one category dtype per column after concat
+            #----------------------------------------------------------------
+            df = pd.concat(list(batches), ignore_index=True)
+            df = df.astype({col: "category" for col, dtype in schema.items() if dtype == "category"})
+            X = df.drop(columns=[config.target_column])
+            y = df[config.target_column]
+            logger.app_logger.info("Data ingestion from database completed: %s", df.shape)
+            return df, X, y
+        except Exception as e:
+            exc_type, exc_value, exc_traceback = sys.exc_info()
+            raise exception.CustomException(exc_type, exc_value, exc_traceback) from e
+    #-----------------------------------------------------------------
+    # Raw directory: RAW_DATA_GLOB shards parsed in parallel worker processes
+    #-----------------------------------------------------------------
+    def raw_directory_files(self) -> list:
+        config = self.ingestion_config
+        return utils.list_raw_files(config.raw_path, config.raw_data_glob)
+    #-----------------------------------------------------------------
+    def raw_directory_schema(self, files: list) -> dict:
+        """The dtype schema shared by every shard, inferred from the first one."""
+        config = self.ingestion_config
+        return utils.resolve_dtype_schema(files[0], config.ingestion_schema_path, config.target_column,
+                                          config.schema_sample_rows, utils.get_float_dtype(config.float_precision))
+    #-----------------------------------------------------------------
+    def raw_directory_frames(self, files: list, schema: dict):
+        """
+        Yields the shards as DataFrames in file order while n_jobs worker processes parse the
+        next ones, and logs the parse rate of every file, every worker and the whole run.
+        """
+        workers = max(1, min(effective_n_jobs(self.ingestion_config.n_jobs), len(files)))
+        started, per_worker = time.perf_counter(), {}
+        for df, stats in utils.read_csv_files(files, schema, workers):
+            logger.app_logger.info("Parsed %s: %d rows, %.1f MB in %.2f s (%.1f MB/s, pid %d)", stats["file"],
+                                   stats["rows"], stats["bytes"] / 1e6, stats["seconds"],
+                                   stats["bytes"] / 1e6 / max(stats["seconds"], 1e-9), stats["pid"])
+            worker = per_worker.setdefault(stats["pid"], {"files": 0, "rows": 0, "bytes": 0, "seconds": 0.0})
+            worker["files"] += 1
+            for key in ("rows", "bytes", "seconds"):
+                worker[key] += stats[key]
+            yield df
+        #----------------------------------------------------------------
+        # Busy seconds per worker give the parse rate per core; wall seconds the overall rate
+        #----------------------------------------------------------------
+        seconds = time.perf_counter() - started
+        for pid, worker in per_worker.items():
+            logger.app_logger.info("Worker pid %d: %d files, %d rows, %.1f MB in %.2f s busy (%.1f MB/s, %.0f rows/s)",
+                                   pid, worker["files"], worker["rows"], worker["bytes"] / 1e6, worker["seconds"],
+                                   worker["bytes"] / 1e6 / max(worker["seconds"], 1e-9),
+                                   worker["rows"] / max(worker["seconds"], 1e-9))
+        rows = sum(worker["rows"] for worker in per_worker.values())
+        size = sum(worker["bytes"] for worker in per_worker.values()) / 1e6
+        logger.app_logger.info("Parsed %d files (%d rows, %.1f MB) in %.2f s with %d workers: %.1f MB/s overall, "
+                               "%.1f MB/s per core.", len(files), rows, size, seconds, workers,
+                               size / max(seconds, 1e-9), size / max(seconds, 1e-9) / workers)
+    #-----------------------------------------------------------------
+    def initiate_data_ingestion_from_directory(self):
+        """
+        Ingest every raw shard matching RAW_DATA_GLOB under the raw directory, parsed in parallel
+        with one dtype schema and concatenated in file order; returns the DataFrame and X, y as
+        initiate_data_ingestion_from_file does.
+        """
+        try:
+            config = self.ingestion_config
+            files = self.raw_directory_files()
+            logger.app_logger.info("Starting data ingestion of %d raw files matching %s under %s",
+                                   len(files), config.raw_data_glob, str(config.raw_path))
+            schema = self.raw_directory_schema(files)
+            #----------------------------------------------------------------
+            # Shards carry their own categories; restore one category dtype per column after concat
+            #----------------------------------------------------------------
+            df = pd.concat(list(self.raw_directory_frames(files, schema)), ignore_index=True)
+            df = df.astype({col: "category" for col, dtype in schema.items() if dtype == "category"})
+            X = df.drop(columns=[config.target_column])
+            y = df[config.target_column]
+            logger.app_logger.info("Data ingestion from raw directory completed: %s", df.shape)
+            return df, X, y
+        except Exception as e:
+            exc_type, exc_value, exc_traceback = sys.exc_info()
+            raise exception.CustomException(exc_type, exc_value, exc_traceback) from e
+    #-----------------------------------------------------------------
+    def initiate_data_ingestion_streaming(self) -> dict:
+        """
+        Out-of-core ingestion: reads the raw file (or the database source when DATABASE_URL is set)
+        in chunks of chunk_size rows with an explicit dtype schema, splits features and target per
+        chunk and appends them to the data, X and y artifacts, so peak memory is bounded by the
+        chunk size rather than the dataset size. With RAW_DATA_GLOB each parsed shard is one chunk.
+        Returns a summary with the row and chunk counts, the schema and the artifact paths.
+        """
+        try:
+            config = self.ingestion_config
+            source = ("database" if config.database_url else
+                      f"raw files {config.raw_data_glob} under {config.raw_path}" if config.raw_data_glob else
+                      f"file: {config.raw_file_and_path}")
+            logger.app_logger.info("Starting chunked data ingestion from %s (%d rows per chunk)",
+                                   source, config.chunk_size)
+            utils.ensure_directory_exists(config.processed_dir_path)
+            if config.database_url:
+                schema, reader = self.database_batches(config.chunk_size)
+            elif config.raw_data_glob:
+                files = self.raw_directory_files()
+                schema = self.raw_directory_schema(files)
+                reader = self.raw_directory_frames(files, schema)
+            else:
+                schema = utils.resolve_dtype_schema(config.raw_file_and_path, config.ingestion_schema_path,
+                                                    config.target_column, config.schema_sample_rows,
+                                                    utils.get_float_dtype(config.float_precision))
+                reader = utils.read_csv_chunks(config.raw_file_and_path, schema, config.chunk_size)
+            logger.app_logger.info("Ingestion dtype schema: %s", schema)
+            #----------------------------------------------------------------
+            # One incremental writer per artifact; all are discarded if any chunk fails
+            #----------------------------------------------------------------
+            chunks = 0
+            with ExitStack() as stack:
+                data_writer, x_writer, y_writer = (
+                    stack.enter_context(utils.ChunkedArtifactWriter(file_path, config.artifact_format,
+                                                                    config.artifact_compression,
+                                                                    config.artifact_csv_export))
+                    for file_path in (config.data, config.input_feature_data, config.target_feature_data))
+                for chunk in reader:
+                    data_writer.write(chunk)
+                    x_writer.write(chunk.drop(columns=[config.target_column]))
+                    y_writer.write(chunk[config.target_column])
+                    chunks += 1
+                rows = data_writer.rows
+            #----------------------------------------------------------------
+            summary = {"rows": rows, "chunks": chunks, "schema": schema,
+                       "paths": [str(writer.target_path) for writer in (data_writer, x_writer, y_writer)]}
+            logger.app_logger.info("Chunked data ingestion completed: %d rows in %d chunks.", rows, chunks)
+            return summary
+        except Exception as e:
+            exc_type, exc_value, exc_traceback = sys.exc_info()
+            raise exception.CustomException(exc_type, exc_value, exc_traceback) from e
+    #-----------------------------------------------------------------
+    def load_ingested_features(self):
+        """X and y as saved by save_ingested_data or initiate_data_ingestion_streaming."""
+        try:
+            config = self.ingestion_config
+            X = utils.load_data_artifact(config.input_feature_data, config.artifact_format, config.artifact_compression)
+            y = utils.load_data_artifact(config.target_feature_data, config.artifact_format,
+                                         config.artifact_compression, series=True)
+            return X, y
+        except Exception as e:
+            exc_type, exc_value, exc_traceback = sys.exc_info()
+            raise exception.CustomException(exc_type, exc_value, exc_traceback) from e
+    #-----------------------------------------------------------------
+    # Incremental ingestion: only rows appended since the watermark
+    #-----------------------------------------------------------------
+    def incremental_settings(self) -> dict:
+        """Settings that shape the processed outputs; a change forces a full rebuild."""
+        config = self.ingestion_config
+        if config.database_url or config.raw_data_glob:
+            raise ValueError("Incremental ingestion tracks appends to the raw file; unset DATABASE_URL and RAW_DATA_GLOB")
+        if config.split_storage != "indices" or config.split_strategy != "hash":
+            raise ValueError("Incremental ingestion needs SPLIT_STORAGE=indices and SPLIT_STRATEGY=hash")
+        return {"target_column": config.target_column, "artifact_format": utils.resolve_artifact_format(config.artifact_format),
+                "artifact_compression": config.artifact_compression, "float_precision": config.float_precision,
+                "split_key_column": config.split_key_column, "random_state": config.random_state,
+                "test_size": config.test_size, "test_size_val": config.test_size_val}
+    #-----------------------------------------------------------------
+    def incremental_artifacts(self) -> list:
+        """Processed files appended to by incremental runs (their sizes are part of the watermark)."""
+        config = self.ingestion_config
+        return [utils.artifact_path(path, config.artifact_format)
+                for path in (config.data, config.input_feature_data, config.target_feature_data)] + \
+               [config.split_indices_path]
+    #-----------------------------------------------------------------
+    def ingest_delta(self, byte_offset: int = 0):
+        """
+        Reads the rows appended to the raw file after byte_offset (every row for 0) with the
+        ingestion dtype schema, so full and delta reads type the columns the same way.
+        Returns (data, X, y, byte offset reached).
+        """
+        try:
+            config = self.ingestion_config
+            schema = utils.resolve_dtype_schema(config.raw_file_and_path, config.ingestion_schema_path,
+                                                config.target_column, config.schema_sample_rows,
+                                                utils.get_float_dtype(config.float_precision))
+            data, end_offset = utils.read_csv_delta(config.raw_file_and_path, byte_offset, schema)
+            X = data.drop(columns=[config.target_column])
+            y = data[config.target_column]
+            logger.app_logger.info("Read %d rows of %s from byte %d to %d.", len(data),
+                                   str(config.raw_file_and_path), byte_offset, end_offset)
+            return data, X, y, end_offset
+        except Exception as e:
+            exc_type, exc_value, exc_traceback = sys.exc_info()
+            raise exception.CustomException(exc_type, exc_value, exc_traceback) from e
+    #-----------------------------------------------------------------
+    def append_ingested_data(self, data, X, y):
+        """Appends newly ingested rows to the data, X and y artifacts."""
+        config = self.ingestion_config
+        for frame, file_path in ((data, config.data), (X, config.input_feature_data), (y, config.target_feature_data)):
+            utils.append_data_artifact(frame, file_path, config.artifact_format,
+                                       config.artifact_compression, config.artifact_csv_export)
+        logger.app_logger.info("Appended %d rows to the processed data, X and y artifacts.", len(data))
+    #-----------------------------------------------------------------
+    def extend_split_indices(self, X_new: pd.DataFrame) -> DataSplits:
+        """
+        Merges the new rows into the saved hash split (existing rows keep their part) and saves it.
+        The returned split is attached to the full y; the features are attached after transformation.
+        """
+        try:
+            config = self.ingestion_config
+            splits = DataSplits.load(config.split_indices_path).extended(
+                X_new, test_size=config.test_size, test_size_val=config.test_size_val,
+                random_state=config.random_state, key_column=config.split_key_column or None)
+            splits.save(config.split_indices_path)
+            y = utils.load_data_artifact(config.target_feature_data, config.artifact_format,
+                                         config.artifact_compression, series=True)
+            logger.app_logger.info("Hash split extended by %d rows: %s", len(X_new), splits.sizes())
+            return splits.with_data(None, y)
+        except Exception as e:
+            exc_type, exc_value, exc_traceback = sys.exc_info()
+            raise exception.CustomException(exc_type, exc_value, exc_traceback) from e
+    #-----------------------------------------------------------------
+    def save_artifact(self, data, file_path):
+        """Writes one processed artifact in the configured format (CSV only as an optional export)."""
+        return utils.save_data_artifact(data, file_path,
+                                        artifact_format=self.ingestion_config.artifact_format,
+                                        compression=self.ingestion_config.artifact_compression,
+                                        csv_export=self.ingestion_config.artifact_csv_export)
+    #-----------------------------------------------------------------
     def save_ingested_data(self, data, X, y):
         """Save the training and testing data splits to their respective paths."""
         try:
@@ -66,10 +336,10 @@ class DataIngestion:
             # Save Processed Data, X and y to their respective file paths
             #----------------------------------------------------------------
             utils.ensure_directory_exists(self.ingestion_config.processed_dir_path)
-            # Save training data
-            data.to_csv(self.ingestion_config.data, index=False, header=True, encoding='utf-8')
-            X.to_csv(self.ingestion_config.input_feature_data, index=False, header=True, encoding='utf-8')
-            y.to_csv(self.ingestion_config.target_feature_data, index=False, header=True, encoding='utf-8')
+            for frame, file_path in ((data, self.ingestion_config.data),
+                                     (X, self.ingestion_config.input_feature_data),
+                                     (y, self.ingestion_config.target_feature_data)):
+                self.save_artifact(frame, file_path)
             #----------------------------------------------------------------
             logger.app_logger.info("Processed Data - data, X, y - Saved Successfully.")
             logger.app_logger.info("Processed Data shape: %s", data.shape)
@@ -83,6 +353,9 @@ class DataIngestion:
     def train_test_split_data(self, X: pd.DataFrame, y: pd.Series):
         """Split the data into training, validation, and testing sets."""
         try:
+            if self.ingestion_config.split_strategy == "hash":
+                splits = self.split_data_indices(X, y)
+                return tuple((splits.X_part(part), splits.y_part(part)) for part in ("train", "val", "test"))
             # First split into training+validation and testing sets
             (X_train, y_train), (X_val, y_val), (X_test, y_test) = utils.train_valid_test_split_data(self, X, y)
 
@@ -91,6 +364,35 @@ class DataIngestion:
             exc_type, exc_value, exc_traceback = sys.exc_info()
             raise exception.CustomException(exc_type, exc_value, exc_traceback) from ce
     #-----------------------------------------------------------------
+    def split_data_indices(self, X: pd.DataFrame, y: pd.Series) -> DataSplits:
+        """
+        Index-only split: the same rows as train_test_split_data, kept as positions into X and y.
+        SPLIT_STRATEGY=hash assigns rows by a stable hash of SPLIT_KEY_COLUMN (or the row) instead,
+        computed chunk_size rows at a time.
+        """
+        try:
+            config = self.ingestion_config
+            if config.split_strategy == "hash":
+                splits = DataSplits.hashed(X, y, test_size=config.test_size, test_size_val=config.test_size_val,
+                                           random_state=config.random_state,
+                                           key_column=config.split_key_column or None, chunk_size=config.chunk_size)
+            elif config.split_strategy == "random":
+                splits = DataSplits.random(X, y, test_size=config.test_size, test_size_val=config.test_size_val,
+                                           random_state=config.random_state)
+            else:
+                raise ValueError(f"SPLIT_STRATEGY must be 'random' or 'hash', got {config.split_strategy!r}")
+            logger.app_logger.info("Index-only %s data split sizes: %s", config.split_strategy, splits.sizes())
+            return splits
+        except Exception as e:
+            exc_type, exc_value, exc_traceback = sys.exc_info()
+            raise exception.CustomException(exc_type, exc_value, exc_traceback) from e
+    #-----------------------------------------------------------------
+    def save_split_indices(self, splits: DataSplits):
+        """Saves the split as one small index file instead of six data files."""
+        file_path = splits.save(self.ingestion_config.split_indices_path)
+        logger.app_logger.info("Split indices saved at: %s", file_path)
+        return file_path
+    #-----------------------------------------------------------------
     def save_data_splits(self, X_train, y_train, X_val, y_val, X_test, y_test):
         """Save the training and testing data splits to their respective paths."""
         try:
@@ -100,14 +402,14 @@ class DataIngestion:
             #----------------------------------------------------------------
             utils.ensure_directory_exists(self.ingestion_config.processed_dir_path)
             # Save training data
-            X_train.to_csv(self.ingestion_config.x_train_data, index=False)
-            y_train.to_csv(self.ingestion_config.y_train_data, index=False)
+            self.save_artifact(X_train, self.ingestion_config.x_train_data)
+            self.save_artifact(y_train, self.ingestion_config.y_train_data)
             # Save validation data
-            X_val.to_csv(self.ingestion_config.x_val_data, index=False)
-            y_val.to_csv(self.ingestion_config.y_val_data, index=False)
+            self.save_artifact(X_val, self.ingestion_config.x_val_data)
+            self.save_artifact(y_val, self.ingestion_config.y_val_data)
             # Save testing data
-            X_test.to_csv(self.ingestion_config.x_test_data, index=False)
-            y_test.to_csv(self.ingestion_config.y_test_data, index=False)
+            self.save_artifact(X_test, self.ingestion_config.x_test_data)
+            self.save_artifact(y_test, self.ingestion_config.y_test_data)
             logger.app_logger.info("Training and testing data splits saved successfully.")
             logger.app_logger.info("X_Train shape: %s", X_train.shape)
             logger.app_logger.info("Y_Train shape: %s", y_train.shape)
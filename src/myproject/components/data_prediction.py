@@ -1,9 +1,10 @@
 import sys
 import pandas as pd
-import joblib
 
 import src.myproject.exception as exception
 import src.myproject.logger as logger
+import src.myproject.metrics as metrics
+from src.myproject.artifact_cache import artifact_cache
 #------------------------------------------------------------------
 # Import Prediction Pipeline Config
 #------------------------------------------------------------------
@@ -28,24 +29,29 @@ class PredictionPipeline:
         try:
             logger.app_logger.info("Starting prediction process...")
             #----------------------------------------------------------------
-            # Load Preprocessor Object
+            # Load Preprocessor Object (reused from the artifact cache until it changes on disk)
             #----------------------------------------------------------------
-            preprocessor = joblib.load(self.prediction_pipeline_config.preprocessor_file_path)
+            preprocessor = artifact_cache.load(self.prediction_pipeline_config.preprocessor_file_path)
             logger.app_logger.info("Preprocessor object loaded successfully.")
             #----------------------------------------------------------------
             # Transform Input Data
             #----------------------------------------------------------------
-            input_data_transformed = preprocessor.transform(input_data)
+            metrics.prediction_requests.inc(endpoint='pipeline')
+            metrics.batch_size.observe(len(input_data), endpoint='pipeline')
+            with metrics.stage_latency.time(stage='transform'):
+                input_data_transformed = preprocessor.transform(input_data)
             logger.app_logger.info("Input data transformed successfully.")
             #----------------------------------------------------------------
-            # Load Champion Model
+            # Load Champion Model (reused from the artifact cache until it changes on disk)
             #----------------------------------------------------------------
-            champion_model = joblib.load(self.prediction_pipeline_config.champion_model_file_path)
+            champion_model = artifact_cache.load(self.prediction_pipeline_config.champion_model_file_path)
             logger.app_logger.info("Champion model loaded successfully.")
             #----------------------------------------------------------------
             # Generate Predictions
             #----------------------------------------------------------------
-            predictions = champion_model.predict(input_data_transformed)
+            with metrics.stage_latency.time(stage='predict'):
+                predictions = champion_model.predict(input_data_transformed)
+            metrics.prediction_rows.inc(len(predictions), endpoint='pipeline')
             logger.app_logger.info("Predictions generated successfully.")
             return pd.Series(predictions)
         except exception.CustomException as ce:
@@ -0,0 +1,163 @@
+"""
+Module for index-only train/validation/test splits.
+A split is recorded as the row positions of each part, persisted in one .npz
+file together with the size and content fingerprint of the base dataset. The parts
+are taken from the base X and y only when they are used, so the dataset is neither
+written nor held as separate train/validation/test copies.
+Rows are assigned either by the shuffled train_test_split of the random splitter or by
+a keyed hash of each row (hash splitter), which needs no global shuffle: it can run
+chunk by chunk and keeps every row in its part when new rows are appended.
+"""
+import os
+import sys
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from sklearn.model_selection import train_test_split
+#------------------------------------------------------------------
+# Import custom exception and helpers
+#------------------------------------------------------------------
+import src.myproject.exception as exception
+from src.myproject.components.fit_cache import data_fingerprint
+from src.myproject.utils import take_rows
+#------------------------------------------------------------------
+PARTS = ("train", "val", "test")
+#------------------------------------------------------------------
+# Hash Splitter
+#------------------------------------------------------------------
+def hash_split_scores(df: pd.DataFrame, key_column: str | None = None, random_state: int = 42) -> np.ndarray:
+    """
+    Stable per-row score in [0, 1): a hash of the key column (or of the whole row when no key
+    is given) keyed with random_state. Numbers are hashed as float64 and text by value, so a
+    row's score does not depend on its chunk, its position or how its columns were typed.
+    """
+    data = df[[key_column]] if key_column else df
+    numeric = data.select_dtypes(include=['number', 'bool']).columns
+    canonical = data.astype({col: np.float64 for col in numeric}) if len(numeric) else data
+    hashes = pd.util.hash_pandas_object(canonical, index=False, hash_key=f"{random_state % 10**16:016d}")
+    return (hashes.to_numpy() >> np.uint64(11)).astype(np.float64) / 2.0**53
+#------------------------------------------------------------------
+def assign_hash_split(scores: np.ndarray, test_size: float, test_size_val: float) -> np.ndarray:
+    """
+    Part code per row (0 = train, 1 = val, 2 = test): test_size of the rows go to test and
+    test_size_val of the remainder to validation, the same proportions as the random splitter.
+    """
+    codes = np.zeros(len(scores), dtype=np.int8)
+    codes[scores < test_size + (1 - test_size) * test_size_val] = 1
+    codes[scores < test_size] = 2
+    return codes
+#------------------------------------------------------------------
+# Data Splits Class
+#------------------------------------------------------------------
+class DataSplits:
+    def __init__(self, X, y, indices: dict, fingerprint: str | None = None,
+                 scores: np.ndarray | None = None, n_rows: int | None = None):
+        """
+        X, y: base dataset (DataFrame/Series or arrays) the indices point into.
+        indices: {"train" | "val" | "test": row positions}; the order of each part is kept.
+        fingerprint: content fingerprint of the base features the indices were made for.
+        scores: per-row hash scores of a hash split, kept so appended rows can be merged in.
+        n_rows: base row count when X is not loaded.
+        """
+        self.X = X
+        self.y = y
+        self.indices = {part: np.asarray(indices[part], dtype=np.int64) for part in PARTS}
+        self.fingerprint = fingerprint
+        self.scores = scores
+        self.n_rows = len(X) if X is not None else int(n_rows)
+    #----------------------------------------------------------------
+    @classmethod
+    def random(cls, X, y, test_size: float, test_size_val: float, random_state: int) -> "DataSplits":
+        """Same rows, in the same order, as utils.train_valid_test_split_data(X, y)."""
+        positions = np.arange(len(X))
+        train_full, test = train_test_split(positions, test_size=test_size, random_state=random_state)
+        train, val = train_test_split(train_full, test_size=test_size_val, random_state=random_state)
+        return cls(X, y, {"train": train, "val": val, "test": test}, fingerprint=data_fingerprint(X))
+    #----------------------------------------------------------------
+    @classmethod
+    def hashed(cls, X: pd.DataFrame, y, test_size: float, test_size_val: float, random_state: int,
+               key_column: str | None = None, chunk_size: int = 0) -> "DataSplits":
+        """
+        Deterministic split from hash_split_scores, computed chunk_size rows at a time (0 = one pass).
+        Each part is ordered by score, a fixed pseudo-random order for the unshuffled CV folds.
+        """
+        if key_column and key_column not in X.columns:
+            raise ValueError(f"SPLIT_KEY_COLUMN {key_column!r} is not a feature column")
+        step = chunk_size if chunk_size > 0 else max(len(X), 1)
+        scores = np.concatenate([hash_split_scores(X.iloc[start:start + step], key_column, random_state)
+                                 for start in range(0, len(X), step)] or [np.empty(0)])
+        return cls(X, y, cls._hash_indices(scores, test_size, test_size_val),
+                   fingerprint=data_fingerprint(X), scores=scores)
+    #----------------------------------------------------------------
+    @staticmethod
+    def _hash_indices(scores: np.ndarray, test_size: float, test_size_val: float) -> dict:
+        codes = assign_hash_split(scores, test_size, test_size_val)
+        indices = {}
+        for code, part in enumerate(PARTS):
+            rows = np.flatnonzero(codes == code)
+            indices[part] = rows[np.argsort(scores[rows], kind="stable")]
+        return indices
+    #----------------------------------------------------------------
+    def extended(self, X_new: pd.DataFrame, test_size: float, test_size_val: float, random_state: int,
+                 key_column: str | None = None) -> "DataSplits":
+        """
+        Hash split of the base dataset with X_new appended after its last row, computed from the
+        new rows only: existing rows keep their part, and the result equals DataSplits.hashed on
+        the combined data. The base is not attached (X and y are None; use with_data).
+        """
+        if self.scores is None:
+            raise ValueError("Only a hash split (SPLIT_STRATEGY=hash) can be extended with appended rows")
+        scores = np.concatenate([self.scores, hash_split_scores(X_new, key_column, random_state)])
+        return DataSplits(None, None, self._hash_indices(scores, test_size, test_size_val),
+                          scores=scores, n_rows=len(scores))
+    #----------------------------------------------------------------
+    def rows(self, part: str) -> np.ndarray:
+        return self.indices[part]
+    #----------------------------------------------------------------
+    def X_part(self, part: str):
+        return take_rows(self.X, self.indices[part])
+    #----------------------------------------------------------------
+    def y_part(self, part: str):
+        return take_rows(self.y, self.indices[part])
+    #----------------------------------------------------------------
+    def sizes(self) -> dict:
+        return {part: len(self.indices[part]) for part in PARTS}
+    #----------------------------------------------------------------
+    def with_data(self, X, y=None) -> "DataSplits":
+        """The same split over another row-aligned base, e.g. the transformed features."""
+        return DataSplits(X, self.y if y is None else y, self.indices, self.fingerprint, self.scores, self.n_rows)
+    #----------------------------------------------------------------
+    def save(self, file_path) -> Path:
+        """Writes the indices, base row count, fingerprint and any hash scores to one .npz file (atomically)."""
+        try:
+            file_path = Path(file_path)
+            file_path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = file_path.with_name(file_path.name + ".tmp")
+            index_dtype = np.int32 if self.n_rows < 2**31 else np.int64
+            extra = {} if self.scores is None else {"scores": self.scores}
+            with open(temp_path, "wb") as file:
+                np.savez(file, n_rows=np.int64(self.n_rows), fingerprint=np.str_(self.fingerprint or ""),
+                         **{part: rows.astype(index_dtype) for part, rows in self.indices.items()}, **extra)
+            os.replace(temp_path, file_path)
+            return file_path
+        except Exception as e:
+            exc_type, exc_value, exc_traceback = sys.exc_info()
+            raise exception.CustomException(exc_type, exc_value, exc_traceback) from e
+    #----------------------------------------------------------------
+    @classmethod
+    def load(cls, file_path, X=None, y=None) -> "DataSplits":
+        """
+        Reopens a saved split over X and y. Raises if X does not have the row count or
+        content fingerprint the split was made for. Without X only the indices are loaded.
+        """
+        try:
+            with np.load(file_path, allow_pickle=False) as arrays:
+                n_rows, fingerprint = int(arrays["n_rows"]), str(arrays["fingerprint"])
+                indices = {part: arrays[part] for part in PARTS}
+                scores = arrays["scores"] if "scores" in arrays.files else None
+            if X is not None and (len(X) != n_rows or (fingerprint and data_fingerprint(X) != fingerprint)):
+                raise ValueError(f"Split {file_path} was made for a different dataset ({n_rows} rows)")
+            return cls(X, y, indices, fingerprint or None, scores, n_rows)
+        except Exception as e:
+            exc_type, exc_value, exc_traceback = sys.exc_info()
+            raise exception.CustomException(exc_type, exc_value, exc_traceback) from e
@@ -1,3 +1,4 @@
+import sys
 import pandas as pd
 import numpy as np
 import joblib
@@ -8,7 +9,10 @@ from sklearn.compose import ColumnTransformer
 #------------------------------------------------------------------
 import src.myproject.utils as utils
 import src.myproject.logger as logger
+import src.myproject.exception as exception
 from src.myproject.config.config_app import DataTransformationConfig
+from src.myproject.components.fit_cache import data_fingerprint
+from src.myproject.components.data_splits import DataSplits
 #------------------------------------------------------------------
 # Data Transformation Class
 #------------------------------------------------------------------
@@ -28,7 +32,8 @@ class DataTransformation:
         Standard: Encapsulate all transformations in a single ColumnTransformer.
         """
         num_cols, cat_cols = utils.list_dataframe_columns_by_type(df)
-        preprocessor = utils.create_data_transformation_object(num_cols, cat_cols)
+        preprocessor = utils.create_data_transformation_object(
+            num_cols, cat_cols, dtype=utils.get_float_dtype(self.transform_config.float_precision))
 
         return preprocessor
     #----------------------------------------------------------------
@@ -57,12 +62,95 @@ class DataTransformation:
         joblib.dump(preprocessor_object, self.transform_config.joblib_object_file_path)
         logger.app_logger.info("Preprocessor object saved at: %s", self.transform_config.joblib_object_file_path)
         #----------------------------------------------------------------
-        # Save canonical processed CSVs
+        # Save canonical processed datasets in the configured artifact format
         #----------------------------------------------------------------
-        logger.app_logger.info("Saving transformed datasets to CSV files...")
-        x_train_transformed.to_csv(self.transform_config.x_transformed_data, index=False, header=True)
-        x_val_transformed.to_csv(self.transform_config.x_val_transformed_data, index=False, header=True)
-        x_test_transformed.to_csv(self.transform_config.x_test_transformed_data, index=False, header=True)
+        logger.app_logger.info("Saving transformed datasets as %s artifacts...",
+                               utils.resolve_artifact_format(self.transform_config.artifact_format))
+        for transformed, file_path in ((x_train_transformed, self.transform_config.x_transformed_data),
+                                       (x_val_transformed, self.transform_config.x_val_transformed_data),
+                                       (x_test_transformed, self.transform_config.x_test_transformed_data)):
+            utils.save_data_artifact(transformed, file_path,
+                                     artifact_format=self.transform_config.artifact_format,
+                                     compression=self.transform_config.artifact_compression,
+                                     csv_export=self.transform_config.artifact_csv_export)
         logger.app_logger.info("Transformed datasets saved successfully.")
+        #----------------------------------------------------------------
+        # Save memory-mapped float matrices that parallel training workers open read-only
+        #----------------------------------------------------------------
+        if self.transform_config.write_memmap_matrices:
+            for transformed, matrix_path in ((x_train_transformed, self.transform_config.x_transformed_matrix),
+                                             (x_val_transformed, self.transform_config.x_val_transformed_matrix),
+                                             (x_test_transformed, self.transform_config.x_test_transformed_matrix)):
+                utils.save_matrix_memmap(transformed, matrix_path, fingerprint=data_fingerprint(transformed),
+                                         dtype=utils.get_preprocessor_float_dtype(preprocessor_object))
+            logger.app_logger.info("Memory-mapped matrices saved in: %s", self.transform_config.x_transformed_matrix.parent)
         
-        return x_train_transformed, x_val_transformed, x_test_transformed
\ No newline at end of file
+        return x_train_transformed, x_val_transformed, x_test_transformed
+    #----------------------------------------------------------------
+    def initiate_data_transformation_indexed(self, preprocessor_object: ColumnTransformer,
+                                             splits: DataSplits) -> DataSplits:
+        """
+        Index-only variant: fits on the training rows only (no leakage), transforms the whole
+        base dataset once and saves it as a single artifact and memory-mapped matrix.
+        Returns the same split over the transformed features.
+        """
+        logger.app_logger.info("Fitting the preprocessor on %d training rows and transforming %d rows...",
+                               len(splits.rows("train")), len(splits.X))
+        preprocessor_object.fit(splits.X_part("train"))
+        x_all_transformed = preprocessor_object.transform(splits.X)
+        #----------------------------------------------------------------
+        utils.ensure_directory_exists(self.transform_config.joblib_object_file_path.parent)
+        joblib.dump(preprocessor_object, self.transform_config.joblib_object_file_path)
+        logger.app_logger.info("Preprocessor object saved at: %s", self.transform_config.joblib_object_file_path)
+        utils.save_data_artifact(x_all_transformed, self.transform_config.x_all_transformed_data,
+                                 artifact_format=self.transform_config.artifact_format,
+                                 compression=self.transform_config.artifact_compression,
+                                 csv_export=self.transform_config.artifact_csv_export)
+        if self.transform_config.write_memmap_matrices:
+            utils.save_matrix_memmap(x_all_transformed, self.transform_config.x_all_transformed_matrix,
+                                     fingerprint=data_fingerprint(x_all_transformed),
+                                     dtype=utils.get_preprocessor_float_dtype(preprocessor_object))
+        logger.app_logger.info("Transformed dataset saved once for all splits.")
+
+        return splits.with_data(x_all_transformed)
+    #----------------------------------------------------------------
+    def incremental_artifacts(self) -> list:
+        """Transformation outputs appended to by incremental runs (their sizes are part of the watermark)."""
+        return [utils.artifact_path(self.transform_config.x_all_transformed_data, self.transform_config.artifact_format),
+                self.transform_config.x_all_transformed_matrix, self.transform_config.joblib_object_file_path]
+    #----------------------------------------------------------------
+    def initiate_data_transformation_incremental(self, x_new: pd.DataFrame, splits: DataSplits) -> DataSplits:
+        """
+        Incremental variant: transforms only the appended rows with the saved preprocessor (it is
+        refitted on the next full rebuild) and appends them to the transformed artifact and matrix.
+        Returns the extended split over the full transformed features. Training needs every
+        transformed row, so the artifact is still read in full once per run: after an in-place
+        append (csv, pickle), or before a rewrite (parquet, feather), which then reuses that copy.
+        The matrix fingerprint hashes all rows as well.
+        """
+        try:
+            config = self.transform_config
+            preprocessor_object = joblib.load(config.joblib_object_file_path)
+            x_new_transformed = preprocessor_object.transform(x_new)
+            x_existing = None if utils.appends_in_place(config.artifact_format, config.artifact_compression) else \
+                utils.load_data_artifact(config.x_all_transformed_data, config.artifact_format, config.artifact_compression)
+            utils.append_data_artifact(x_new_transformed, config.x_all_transformed_data,
+                                       artifact_format=config.artifact_format,
+                                       compression=config.artifact_compression,
+                                       csv_export=config.artifact_csv_export,
+                                       existing=x_existing)
+            if x_existing is None:
+                x_all_transformed = utils.load_data_artifact(config.x_all_transformed_data, config.artifact_format,
+                                                             config.artifact_compression)
+            else:
+                x_all_transformed = pd.concat([x_existing, x_new_transformed], ignore_index=True)
+            if config.write_memmap_matrices:
+                utils.append_matrix_memmap(x_new_transformed, config.x_all_transformed_matrix,
+                                           fingerprint=data_fingerprint(x_all_transformed),
+                                           dtype=utils.get_preprocessor_float_dtype(preprocessor_object))
+            logger.app_logger.info("Transformed %d appended rows (%d in total).", len(x_new), len(x_all_transformed))
+
+            return splits.with_data(x_all_transformed)
+        except Exception as e:
+            exc_type, exc_value, exc_traceback = sys.exc_info()
+            raise exception.CustomException(exc_type, exc_value, exc_traceback) from e
@@ -0,0 +1,137 @@
+"""
+Module for database ingestion sources.
+A DatabaseSource reads one table or view through a DB-API 2.0 connection. The column list,
+row filter and ordering are part of the SELECT, so projection and filtering happen in the
+database, and rows reach pandas fetch_size at a time. PostgreSQL sources use a named
+(server-side) cursor so the result set stays on the server between batches; SQLite and
+other drivers step through the result with fetchmany.
+Column and table names are validated and quoted, and values are bound as DB-API parameters;
+the where and order_by clauses are SQL text from the operator's configuration (DB_WHERE,
+DB_ORDER_BY) and are inserted verbatim, so they must never be built from untrusted input.
+"""
+import re
+import sys
+import time
+import sqlite3
+from pathlib import Path
+import pandas as pd
+#------------------------------------------------------------------
+# Import custom exception and logger
+#------------------------------------------------------------------
+import src.myproject.constants as constants
+import src.myproject.exception as exception
+import src.myproject.logger as logger
+#------------------------------------------------------------------
+IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*(\.[A-Za-z_][A-Za-z0-9_]*)?$")
+SERVER_SIDE_CURSOR_NAME = "myproject_ingestion"
+#------------------------------------------------------------------
+# Connection Helpers
+#------------------------------------------------------------------
+def quote_identifier(name: str) -> str:
+    """Double-quotes a column or [schema.]table name; anything but plain identifiers is rejected."""
+    if not IDENTIFIER.match(name):
+        raise ValueError(f"Not a plain SQL identifier: {name!r}")
+    return ".".join(f'"{part}"' for part in name.split("."))
+#------------------------------------------------------------------
+def mask_url(url: str) -> str:
+    """The database URL with any password replaced, for logs."""
+    return re.sub(r"//([^:/@]+):[^@]*@", r"//\1:***@", url)
+#------------------------------------------------------------------
+def connect(url: str):
+    """
+    DB-API connection for url. sqlite:///relative/path.db (relative to the project root) and
+    sqlite:////absolute/path.db open the file read-only; postgresql:// URLs need psycopg2.
+    """
+    scheme, _, rest = url.partition("://")
+    scheme = scheme.split("+")[0].lower()
+    if scheme == "sqlite":
+        path = Path(rest[1:] if rest.startswith("/") else rest)
+        path = path if path.is_absolute() else constants.PROJECT_ROOT / path
+        if not path.exists():
+            raise FileNotFoundError(f"SQLite database not found: {path}")
+        return sqlite3.connect(f"{path.as_uri()}?mode=ro", uri=True)
+    if scheme in ("postgresql", "postgres"):
+        try:
+            import psycopg2
+        except ImportError as e:
+            raise ImportError("PostgreSQL sources need psycopg2 (pip install psycopg2-binary)") from e
+        return psycopg2.connect(f"postgresql://{rest}")
+    raise ValueError(f"Unsupported DATABASE_URL scheme {scheme!r}; use sqlite:// or postgresql://")
+#------------------------------------------------------------------
+# Database Source Class
+#------------------------------------------------------------------
+class DatabaseSource:
+    def __init__(self, url: str, table: str, columns=None, where: str = "", params=(),
+                 order_by: str = "", fetch_size: int = 10000):
+        """
+        url: DATABASE_URL of the source; table: [schema.]table or view to read.
+        columns: columns to select (None = every column).
+        where: SQL predicate evaluated by the database, with DB-API placeholders bound to params.
+        order_by: SQL ORDER BY list; fixes the row order the random splitter depends on.
+        where and order_by are trusted SQL text inserted verbatim; pass values through params.
+        fetch_size: rows per fetchmany call / server-side fetch.
+        """
+        if not table:
+            raise ValueError("A database source needs DB_TABLE")
+        self.url = url
+        self.table = table
+        self.columns = list(columns) if columns else None
+        self.where = where
+        self.params = tuple(params)
+        self.order_by = order_by
+        self.fetch_size = int(fetch_size)
+    #----------------------------------------------------------------
+    def describe(self) -> str:
+        return f"{mask_url(self.url)} table {self.table}"
+    #----------------------------------------------------------------
+    def build_query(self) -> str:
+        select = ", ".join(quote_identifier(col) for col in self.columns) if self.columns else "*"
+        query = f"SELECT {select} FROM {quote_identifier(self.table)}"
+        if self.where:
+            query += f" WHERE {self.where}"
+        if self.order_by:
+            query += f" ORDER BY {self.order_by}"
+        return query
+    #----------------------------------------------------------------
+    def _cursor(self, connection):
+        if self.url.split("://")[0].split("+")[0].lower() in ("postgresql", "postgres"):
+            cursor = connection.cursor(name=SERVER_SIDE_CURSOR_NAME)
+            cursor.itersize = self.fetch_size
+        else:
+            cursor = connection.cursor()
+        cursor.arraysize = self.fetch_size
+        return cursor
+    #----------------------------------------------------------------
+    def iter_batches(self, batch_size: int | None = None):
+        """
+        Yields DataFrames of at most batch_size rows (fetch_size by default) in query order, typed
+        as the driver returns them. The connection is closed when the iteration ends or is abandoned.
+        """
+        batch_size = batch_size or self.fetch_size
+        query = self.build_query()
+        logger.app_logger.info("Reading %s: %s", self.describe(), query)
+        started, rows = time.perf_counter(), 0
+        connection = connect(self.url)
+        try:
+            cursor = self._cursor(connection)
+            cursor.execute(query, self.params)
+            while True:
+                records = cursor.fetchmany(batch_size)
+                if not records:
+                    break
+                #----------------------------------------------------------------
+                # Named cursors only report their columns after the first fetch
+                #----------------------------------------------------------------
+                names = [column[0] for column in cursor.description]
+                batch = pd.DataFrame.from_records(records, columns=names)
+                rows += len(batch)
+                yield batch
+            cursor.close()
+        except Exception as e:
+            exc_type, exc_value, exc_traceback = sys.exc_info()
+            raise exception.CustomException(exc_type, exc_value, exc_traceback) from e
+        finally:
+            connection.close()
+            seconds = time.perf_counter() - started
+            logger.app_logger.info("Read %d rows from %s in %.2f s (%.0f rows/s).", rows, self.describe(),
+                                   seconds, rows / seconds if seconds > 0 else 0.0)
@@ -0,0 +1,186 @@
+"""
+Module for persistent memoization of model fits during hyperparameter search.
+Cross-validation scores and refitted estimators are stored on disk under a key
+built from content hashes of the training data and target, the estimator class,
+its full parameter set, the exact fold indices and the versions of the libraries
+that fit and pickle the estimators, so a rerun on unchanged data
+loads them instead of refitting and only new grid points cost compute.
+Scores live in the JSON index; estimators are joblib files next to it. The cache
+is bounded in bytes and evicts least recently used entries. Only the parent
+process reads or writes it; search workers never touch the cache.
+"""
+import os
+import sys
+import json
+import time
+import hashlib
+from pathlib import Path
+import numpy as np
+import pandas as pd
+import scipy
+import joblib
+import sklearn
+#------------------------------------------------------------------
+# Import custom exception, logger and constants
+#------------------------------------------------------------------
+import src.myproject.exception as exception
+import src.myproject.logger as logger
+import src.myproject.constants as constants
+#------------------------------------------------------------------
+INDEX_FILE = "index.json"
+SCORE_ENTRY_BYTES = 128   # accounted size of a score entry held in the index
+LIBRARY_VERSIONS = repr(sorted({"sklearn": sklearn.__version__, "numpy": np.__version__, "scipy": scipy.__version__,
+                                "pandas": pd.__version__, "joblib": joblib.__version__}.items()))
+#------------------------------------------------------------------
+# Fingerprint helpers
+#------------------------------------------------------------------
+def data_fingerprint(data) -> str:
+    """SHA-256 of a DataFrame, Series or array: values, index, column names and dtypes."""
+    digest = hashlib.sha256()
+    if isinstance(data, (pd.DataFrame, pd.Series)):
+        digest.update(pd.util.hash_pandas_object(data, index=True).values.tobytes())
+        columns = list(data.columns) if isinstance(data, pd.DataFrame) else [data.name]
+        dtypes = list(data.dtypes) if isinstance(data, pd.DataFrame) else [data.dtype]
+        digest.update(repr((columns, [str(dtype) for dtype in dtypes])).encode())
+    else:
+        array = np.ascontiguousarray(data)
+        digest.update(repr((array.shape, str(array.dtype))).encode())
+        digest.update(array.tobytes())
+    return digest.hexdigest()
+#------------------------------------------------------------------
+def estimator_fingerprint(estimator, params: dict) -> str:
+    """Estimator class plus every parameter it would be fitted with (defaults included)."""
+    settings = {**estimator.get_params(deep=False), **params}
+    cls = type(estimator)
+    return repr((f"{cls.__module__}.{cls.__qualname__}", sorted(settings.items())))
+#------------------------------------------------------------------
+def make_key(*parts) -> str:
+    """Cache key of the parts; every key also covers LIBRARY_VERSIONS, so an upgrade never reuses old fits."""
+    digest = hashlib.sha256(LIBRARY_VERSIONS.encode() + b"\x1f")
+    for part in parts:
+        if isinstance(part, np.ndarray):
+            digest.update(np.ascontiguousarray(part, dtype=np.int64).tobytes())
+        else:
+            digest.update(str(part).encode())
+        digest.update(b"\x1f")
+    return digest.hexdigest()
+#------------------------------------------------------------------
+# Fit Cache Class
+#------------------------------------------------------------------
+class FitCache:
+    def __init__(self, cache_dir=constants.FIT_CACHE_DIR, max_bytes: int = constants.FIT_CACHE_MAX_BYTES):
+        """
+        cache_dir: directory holding index.json and the estimator files.
+        max_bytes: total size kept before least recently used entries are evicted.
+        """
+        try:
+            self.cache_dir = Path(cache_dir)
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            self.max_bytes = int(max_bytes)
+            self.index_path = self.cache_dir / INDEX_FILE
+            self._index = self._read_index()
+            self._dirty = False
+            self.hits = 0
+            self.misses = 0
+        except Exception as e:
+            exc_type, exc_value, exc_traceback = sys.exc_info()
+            raise exception.CustomException(exc_type, exc_value, exc_traceback) from e
+    #----------------------------------------------------------------
+    def _read_index(self) -> dict:
+        if not self.index_path.exists():
+            return {}
+        try:
+            with open(self.index_path, encoding="utf-8") as file:
+                return json.load(file)
+        except (OSError, ValueError) as e:
+            logger.app_logger.warning("Fit cache index unreadable, starting empty: %s", e)
+            return {}
+    #----------------------------------------------------------------
+    def _touch(self, key: str):
+        self._index[key]["last_used"] = time.time()
+        self._dirty = True
+    #----------------------------------------------------------------
+    # Scores
+    #----------------------------------------------------------------
+    def get_score(self, key: str):
+        """Cached CV score for key, or None."""
+        entry = self._index.get(key)
+        if entry is None or "score" not in entry:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._touch(key)
+        return entry["score"]
+    #----------------------------------------------------------------
+    def put_score(self, key: str, score: float):
+        self._index[key] = {"score": float(score), "size": SCORE_ENTRY_BYTES, "last_used": time.time()}
+        self._dirty = True
+    #----------------------------------------------------------------
+    # Fitted estimators
+    #----------------------------------------------------------------
+    def get_estimator(self, key: str):
+        """Cached fitted estimator for key, or None (a missing or corrupt file counts as a miss)."""
+        entry = self._index.get(key)
+        if entry is None or "file" not in entry:
+            self.misses += 1
+            return None
+        try:
+            estimator = joblib.load(self.cache_dir / entry["file"])
+        except Exception as e:
+            logger.app_logger.warning("Dropping unreadable fit cache entry %s: %s", entry["file"], e)
+            self._remove(key)
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._touch(key)
+        return estimator
+    #----------------------------------------------------------------
+    def put_estimator(self, key: str, estimator):
+        file_name = f"{key}.joblib"
+        temp_path = self.cache_dir / f"{file_name}.tmp"
+        joblib.dump(estimator, temp_path)
+        os.replace(temp_path, self.cache_dir / file_name)
+        self._index[key] = {"file": file_name, "size": (self.cache_dir / file_name).stat().st_size,
+                            "last_used": time.time()}
+        self._dirty = True
+    #----------------------------------------------------------------
+    # Eviction and persistence
+    #----------------------------------------------------------------
+    def _remove(self, key: str):
+        entry = self._index.pop(key, None)
+        if entry and "file" in entry:
+            (self.cache_dir / entry["file"]).unlink(missing_ok=True)
+        self._dirty = True
+    #----------------------------------------------------------------
+    def size_bytes(self) -> int:
+        return sum(entry["size"] for entry in self._index.values())
+    #----------------------------------------------------------------
+    def evict(self):
+        """Drops least recently used entries until the cache fits in max_bytes."""
+        total = self.size_bytes()
+        if total <= self.max_bytes:
+            return
+        for key in sorted(self._index, key=lambda k: self._index[k]["last_used"]):
+            if total <= self.max_bytes:
+                break
+            total -= self._index[key]["size"]
+            self._remove(key)
+    #----------------------------------------------------------------
+    def save(self):
+        """Evicts down to the size bound and writes the index atomically."""
+        try:
+            self.evict()
+            if not self._dirty:
+                return
+            temp_path = self.index_path.with_suffix(".json.tmp")
+            with open(temp_path, "w", encoding="utf-8") as file:
+                json.dump(self._index, file)
+            os.replace(temp_path, self.index_path)
+            self._dirty = False
+        except Exception as e:
+            exc_type, exc_value, exc_traceback = sys.exc_info()
+            raise exception.CustomException(exc_type, exc_value, exc_traceback) from e
+    #----------------------------------------------------------------
+    def stats(self) -> dict:
+        return {"entries": len(self._index), "size_bytes": self.size_bytes(), "max_bytes": self.max_bytes,
+                "hits": self.hits, "misses": self.misses}
@@ -0,0 +1,99 @@
+"""
+Module for the incremental-ingestion watermark.
+For each raw source the watermark records how far it has been ingested (byte offset
+and row count), a SHA-256 of every byte before that offset, the settings that shape
+the processed outputs and the size of every processed artifact written from it.
+A later run may ingest only the bytes after the offset when the source was appended
+to rather than rewritten (any edit, insertion or deletion before the offset changes the
+digest), the settings are unchanged and the artifacts are exactly as the last run left
+them; otherwise the caller rebuilds everything from the full file. Checking reads the
+ingested prefix once; recording extends the verified digest with the new bytes only.
+"""
+import os
+import sys
+import json
+import time
+from pathlib import Path
+#------------------------------------------------------------------
+# Import custom exception and logger
+#------------------------------------------------------------------
+import src.myproject.utils as utils
+import src.myproject.exception as exception
+import src.myproject.logger as logger
+#------------------------------------------------------------------
+# Ingestion Watermark Class
+#------------------------------------------------------------------
+class IngestionWatermark:
+    def __init__(self, file_path):
+        """file_path: JSON file holding one watermark per raw source."""
+        self.file_path = Path(file_path)
+        self._verified = {}   # raw path -> (byte offset, SHA-256 of the prefix) confirmed by check()
+    #----------------------------------------------------------------
+    def _read(self) -> dict:
+        if not self.file_path.exists():
+            return {}
+        try:
+            with open(self.file_path, encoding="utf-8") as file:
+                return json.load(file)
+        except (OSError, ValueError) as e:
+            logger.app_logger.warning("Ignoring unreadable ingestion watermark %s: %s", self.file_path, e)
+            return {}
+    #----------------------------------------------------------------
+    @staticmethod
+    def artifact_sizes(artifacts) -> dict:
+        return {str(path): Path(path).stat().st_size if Path(path).exists() else None for path in artifacts}
+    #----------------------------------------------------------------
+    def check(self, raw_path, settings: dict, artifacts) -> dict | None:
+        """
+        The stored watermark of raw_path when an append-only delta can be ingested on top of the
+        current artifacts, else None (the reason is logged and a full rebuild is expected).
+        """
+        mark = self._read().get(str(raw_path))
+        if mark is None:
+            reason = "no watermark yet"
+        elif mark["settings"] != settings:
+            reason = "ingestion settings changed"
+        elif not Path(raw_path).exists() or Path(raw_path).stat().st_size < mark["byte_offset"]:
+            reason = "raw file missing or truncated"
+        elif "prefix_digest" not in mark:
+            reason = "watermark has no prefix digest"
+        elif self.artifact_sizes(artifacts) != mark["artifacts"]:
+            reason = "processed artifacts changed since the last incremental run"
+        else:
+            digest = utils.file_range_digest(raw_path, 0, mark["byte_offset"])
+            if digest.hexdigest() == mark["prefix_digest"]:
+                self._verified[str(raw_path)] = (mark["byte_offset"], digest)
+                return mark
+            reason = "raw file rewritten before the watermark"
+        logger.app_logger.info("Full ingestion of %s: %s", raw_path, reason)
+        return None
+    #----------------------------------------------------------------
+    def _prefix_digest(self, raw_path, byte_offset: int) -> str:
+        """SHA-256 of the first byte_offset bytes, continued from the prefix check() verified when there is one."""
+        verified_offset, digest = self._verified.pop(str(raw_path), (0, None))
+        if verified_offset > byte_offset:
+            verified_offset, digest = 0, None
+        digest = None if digest is None else digest.copy()
+        return utils.file_range_digest(raw_path, verified_offset, byte_offset, digest).hexdigest()
+    #----------------------------------------------------------------
+    def record(self, raw_path, byte_offset: int, rows: int, settings: dict, artifacts) -> dict:
+        """Stores the new watermark of raw_path after its artifacts are written (atomically)."""
+        try:
+            marks = self._read()
+            marks[str(raw_path)] = {
+                "byte_offset": int(byte_offset),
+                "rows": int(rows),
+                "prefix_digest": self._prefix_digest(raw_path, byte_offset),
+                "settings": settings,
+                "artifacts": self.artifact_sizes(artifacts),
+                "updated_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            }
+            self.file_path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = self.file_path.with_name(self.file_path.name + ".tmp")
+            with open(temp_path, "w", encoding="utf-8") as file:
+                json.dump(marks, file, indent=2)
+            os.replace(temp_path, self.file_path)
+            return marks[str(raw_path)]
+        except Exception as e:
+            exc_type, exc_value, exc_traceback = sys.exc_info()
+            raise exception.CustomException(exc_type, exc_value, exc_traceback) from e
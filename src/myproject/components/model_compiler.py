@@ -0,0 +1,217 @@
+"""
+Module for compiling a linear champion into a NumPy fast path.
+When the champion is LinearRegression, Ridge or Lasso, the preprocessing built by
+utils.create_data_transformation_object (imputers + StandardScaler + OneHotEncoder)
+is an affine map, so preprocessor + model fold into:
+    prediction = bias + sum(category contribution tables) + dot(numeric weights, numeric values)
+The compiled model scores rows with dictionary lookups and a dot product, without
+calling into sklearn or pandas. Tables and vectorized predictions use the FLOAT_PRECISION
+dtype (utils.get_float_dtype()), also when the preprocessor was fitted in another precision.
+"""
+import sys
+import numpy as np
+import joblib
+from pathlib import Path
+from sklearn.compose import ColumnTransformer
+from sklearn.linear_model import LinearRegression, Ridge, Lasso
+#------------------------------------------------------------------
+# Import custom exception, logger and helpers
+#------------------------------------------------------------------
+import src.myproject.utils as utils
+import src.myproject.exception as exception
+import src.myproject.logger as logger
+#------------------------------------------------------------------
+LINEAR_MODEL_TYPES = (LinearRegression, Ridge, Lasso)
+#------------------------------------------------------------------
+def is_linear_champion(model) -> bool:
+    """True when the champion can be folded into the compiled linear fast path."""
+    return isinstance(model, LINEAR_MODEL_TYPES)
+#------------------------------------------------------------------
+def _is_missing(value) -> bool:
+    """Mirrors the numeric imputer: None and NaN both become NaN in a float column and are imputed."""
+    return value is None or value != value
+#------------------------------------------------------------------
+def _is_nan(value) -> bool:
+    """Mirrors the categorical imputer, which fills NaN but keeps None (then encoded as an unknown level)."""
+    return value != value
+#------------------------------------------------------------------
+# Compiled Linear Model Class
+#------------------------------------------------------------------
+class CompiledLinearModel:
+    def __init__(self, bias, categorical_columns, categorical_levels, categorical_contributions,
+                 categorical_fill, numerical_columns, numerical_weights, numerical_fill, dtype=np.float64):
+        """
+        bias: intercept plus the folded-in scaler offsets.
+        categorical_levels / categorical_contributions: one sorted level array and one
+            contribution array per categorical column (unknown levels contribute 0).
+        categorical_fill / numerical_fill: the fitted imputer statistics.
+        numerical_weights: model coefficients divided by the scaler scale.
+        dtype: float dtype of the stored tables and of vectorized predictions.
+        """
+        self.dtype = np.dtype(dtype)
+        self.bias = float(bias)
+        self.categorical_columns = [str(col) for col in categorical_columns]
+        self.categorical_levels = [np.asarray(levels).astype(str) for levels in categorical_levels]
+        self.categorical_contributions = [np.asarray(contrib, dtype=self.dtype) for contrib in categorical_contributions]
+        self.categorical_fill = [str(fill) for fill in categorical_fill]
+        self.numerical_columns = [str(col) for col in numerical_columns]
+        self.numerical_weights = np.asarray(numerical_weights, dtype=self.dtype)
+        self.numerical_fill = np.asarray(numerical_fill, dtype=self.dtype)
+        #----------------------------------------------------------------
+        # Plain-Python views of the tables for the single-row path
+        #----------------------------------------------------------------
+        self._category_tables = [
+            (col, dict(zip(levels.tolist(), contrib.tolist())), fill)
+            for col, levels, contrib, fill in zip(self.categorical_columns, self.categorical_levels,
+                                                  self.categorical_contributions, self.categorical_fill)
+        ]
+        self._numeric_terms = list(zip(self.numerical_columns, self.numerical_weights.tolist(),
+                                       self.numerical_fill.tolist()))
+    #----------------------------------------------------------------
+    def predict_one(self, record: dict) -> float:
+        """Scores a single {column: value} record with table lookups and a dot product."""
+        total = self.bias
+        for col, table, fill in self._category_tables:
+            value = record.get(col)
+            total += table.get(fill if _is_nan(value) else value, 0.0)
+        for col, weight, fill in self._numeric_terms:
+            value = record.get(col)
+            total += weight * (fill if _is_missing(value) else float(value))
+        return total
+    #----------------------------------------------------------------
+    def predict(self, columns) -> np.ndarray:
+        """
+        Scores a batch given as {column: sequence of values} (a DataFrame works too).
+        Vectorized with np.searchsorted over the sorted category levels.
+        """
+        n_rows = len(columns[self.numerical_columns[0] if self.numerical_columns else self.categorical_columns[0]])
+        predictions = np.full(n_rows, self.bias, dtype=self.dtype)
+        for col, levels, contrib, fill in zip(self.categorical_columns, self.categorical_levels,
+                                              self.categorical_contributions, self.categorical_fill):
+            values = np.asarray(columns[col], dtype=object)
+            missing = np.array([_is_nan(value) for value in values], dtype=bool)
+            absent = np.array([value is None for value in values], dtype=bool)
+            values = np.where(missing, fill, values).astype(str)
+            positions = np.clip(np.searchsorted(levels, values), 0, len(levels) - 1)
+            known = (levels[positions] == values) & ~absent
+            predictions += np.where(known, contrib[positions], self.dtype.type(0))
+        if self.numerical_columns:
+            numeric = np.column_stack([np.asarray(columns[col], dtype=self.dtype) for col in self.numerical_columns])
+            numeric = np.where(np.isnan(numeric), self.numerical_fill, numeric)
+            predictions += numeric @ self.numerical_weights
+        return predictions
+    #----------------------------------------------------------------
+    def save(self, file_path):
+        """Persists the compiled tables as a pickle-free .npz archive."""
+        arrays = {
+            "bias": np.array(self.bias),
+            "categorical_columns": np.array(self.categorical_columns, dtype=str),
+            "categorical_fill": np.array(self.categorical_fill, dtype=str),
+            "numerical_columns": np.array(self.numerical_columns, dtype=str),
+            "numerical_weights": self.numerical_weights,
+            "numerical_fill": self.numerical_fill,
+        }
+        for i, (levels, contrib) in enumerate(zip(self.categorical_levels, self.categorical_contributions)):
+            arrays[f"levels_{i}"] = levels
+            arrays[f"contrib_{i}"] = contrib
+        with open(file_path, 'wb') as file:
+            np.savez(file, **arrays)
+    #----------------------------------------------------------------
+    @classmethod
+    def load(cls, file_path) -> "CompiledLinearModel":
+        """Loads a compiled model written by save()."""
+        with np.load(file_path, allow_pickle=False) as arrays:
+            n_categorical = len(arrays["categorical_columns"])
+            return cls(
+                bias=arrays["bias"].item(),
+                categorical_columns=arrays["categorical_columns"].tolist(),
+                categorical_levels=[arrays[f"levels_{i}"] for i in range(n_categorical)],
+                categorical_contributions=[arrays[f"contrib_{i}"] for i in range(n_categorical)],
+                categorical_fill=arrays["categorical_fill"].tolist(),
+                numerical_columns=arrays["numerical_columns"].tolist(),
+                numerical_weights=arrays["numerical_weights"],
+                numerical_fill=arrays["numerical_fill"],
+                dtype=arrays["numerical_weights"].dtype,
+            )
+#------------------------------------------------------------------
+# Compile Preprocessor + Linear Champion
+#------------------------------------------------------------------
+def compile_linear_pipeline(preprocessor: ColumnTransformer, model, dtype=None) -> CompiledLinearModel:
+    """
+    Folds the fitted preprocessor into the coefficients of a linear champion.
+    dtype: float dtype of the compiled tables (None = the FLOAT_PRECISION setting).
+    The folding itself runs in float64; only the finished tables are cast.
+    Raises CustomException when the model or preprocessor layout is not supported.
+    """
+    try:
+        if not is_linear_champion(model):
+            raise TypeError(f"Only {[cls.__name__ for cls in LINEAR_MODEL_TYPES]} can be compiled, got {type(model).__name__}")
+        coef = np.asarray(model.coef_, dtype=np.float64)
+        if coef.ndim == 2 and coef.shape[0] == 1:
+            coef = coef.ravel()
+        if coef.ndim != 1:
+            raise ValueError("Multi-output linear models cannot be compiled")
+        bias = float(np.ravel(model.intercept_)[0]) if np.ndim(model.intercept_) else float(model.intercept_)
+        #----------------------------------------------------------------
+        # Walk the fitted transformers; output_indices_ maps each one to its coef slice
+        #----------------------------------------------------------------
+        cat_columns, cat_levels, cat_contrib, cat_fill = [], [], [], []
+        num_columns, num_weights, num_fill = [], [], []
+        for name, transformer, columns in preprocessor.transformers_:
+            if name == 'remainder':
+                continue
+            coef_slice = coef[preprocessor.output_indices_[name]]
+            if name == 'cat':
+                imputer, onehot = transformer.named_steps['imputer'], transformer.named_steps['onehot']
+                if onehot.drop is not None:
+                    raise ValueError("OneHotEncoder with drop is not supported by the compiler")
+                offset = 0
+                for col, levels, fill in zip(columns, onehot.categories_, imputer.statistics_):
+                    cat_columns.append(col)
+                    cat_levels.append(np.asarray(levels))
+                    cat_contrib.append(coef_slice[offset:offset + len(levels)])
+                    cat_fill.append(fill)
+                    offset += len(levels)
+            elif name == 'num':
+                imputer, scaler = transformer.named_steps['imputer'], transformer.named_steps['scaler']
+                mean = scaler.mean_ if scaler.mean_ is not None else np.zeros(len(columns))
+                scale = scaler.scale_ if scaler.scale_ is not None else np.ones(len(columns))
+                weights = coef_slice / scale
+                bias -= float(weights @ mean)
+                num_columns.extend(columns)
+                num_weights.extend(weights.tolist())
+                num_fill.extend(imputer.statistics_.tolist())
+            else:
+                raise ValueError(f"Unsupported transformer '{name}' in preprocessor")
+
+        return CompiledLinearModel(bias, cat_columns, cat_levels, cat_contrib, cat_fill,
+                                   num_columns, num_weights, num_fill,
+                                   dtype=utils.get_float_dtype() if dtype is None else dtype)
+    except Exception as e:
+        exc_type, exc_value, exc_traceback = sys.exc_info()
+        raise exception.CustomException(exc_type, exc_value, exc_traceback) from e
+#------------------------------------------------------------------
+def export_compiled_model(preprocessor: ColumnTransformer, model, file_path) -> Path | None:
+    """
+    Compiles and saves the fast path when the champion is linear.
+    Removes any stale compiled artifact otherwise, so serving never uses an outdated one.
+    """
+    file_path = Path(file_path)
+    if not is_linear_champion(model):
+        file_path.unlink(missing_ok=True)
+        logger.app_logger.info("Champion %s is not linear; no compiled fast path exported.", type(model).__name__)
+        return None
+    compiled_model = compile_linear_pipeline(preprocessor, model)
+    compiled_model.save(file_path)
+    logger.app_logger.info("Compiled linear fast path saved at: %s", file_path)
+    return file_path
+#------------------------------------------------------------------
+if __name__ == "__main__":
+    #----------------------------------------------------------------
+    # Compile the currently persisted preprocessor + champion
+    #----------------------------------------------------------------
+    from src.myproject.config.config_app import ModelTrainerConfig
+    trainer_config = ModelTrainerConfig()
+    export_compiled_model(joblib.load(trainer_config.joblib_object_file_path),
+                          joblib.load(trainer_config.champion_model_and_path),
+                          trainer_config.compiled_model_and_path)
@@ -0,0 +1,637 @@
+"""
+Module for hyperparameter search across all model families at once.
+Instead of one GridSearchCV per family run back to back, every
+(family, parameter-set, fold) fit becomes one task in a single joblib pool,
+so all cores stay busy across families. Candidate order, fold splits, scoring
+and best-candidate selection follow GridSearchCV(cv=KFold(cv_folds), scoring='r2'),
+so the selected parameters and scores match the serial search.
+
+Each family can opt into a faster search strategy through an optional "search" entry
+next to its "model" and "params"; without "strategy" it runs the exhaustive grid and the
+other keys only apply when MODEL_SEARCH_STRATEGY selects that strategy for every family:
+    {"strategy": "grid"}                                    exhaustive (default)
+    {"strategy": "random", "n_iter": 20}                    fixed-budget random sample of the grid
+    {"strategy": "halving", "resource": "n_samples"}        successive halving on training rows
+    {"strategy": "halving", "resource": "n_estimators"}     successive halving on ensemble size
+    {"strategy": "path", "n_alphas": 300}                   regularization path (Ridge and Lasso only)
+Halving runs in rounds: every surviving candidate is cross-validated with the
+current resource, the best 1/factor move on, and the resource grows by factor
+until the last round runs at the full resource. Rounds of all families share the pool.
+
+Candidates of a forest or gradient-boosting family that differ only by
+n_estimators are fitted once per fold at the largest size; smaller sizes are
+scored from tree prefixes (forests) or staged predictions (boosting), which
+reproduce a from-scratch fit with the same random_state exactly.
+
+The path strategy scores every alpha of a fold in one pass: a single SVD of the
+centered training fold for Ridge, warm-started coordinate descent along a
+descending alpha path (lasso_path) for Lasso. The alphas are the configured "alpha"
+values, plus n_alphas log-spaced between their smallest and largest when given
+(a generated alpha within rounding of a configured one is dropped).
+The other grid keys stay grid axes when the path honours them (fit_intercept; Lasso
+max_iter, tol, positive); a key it cannot reproduce (e.g. a Ridge solver other than
+svd) is rejected, or the family falls back to grid under MODEL_SEARCH_STRATEGY=path.
+
+With a wall-clock or CPU-seconds budget the pool is fed one task at a time. Families
+run in order of expected value (the previous run's validation R2), a family whose best
+CV score trails the overall best by more than the dominance margin is stopped,
+and once the budget is spent the remaining tasks are skipped. The budget is checked
+before each task is dispatched, so it is a soft limit: tasks already running finish,
+and the refits come after it, so a run can overshoot by about one task per worker
+plus the refit time. Every family with
+at least one fully scored candidate still gets its best-so-far refit; the search
+report records what ran, what came from the fit cache and what was skipped.
+"""
+import sys
+import math
+import time
+import numpy as np
+from dataclasses import dataclass, field
+from joblib import Parallel, delayed
+from sklearn.base import clone
+from sklearn.ensemble import RandomForestRegressor, ExtraTreesRegressor, GradientBoostingRegressor
+from sklearn.linear_model import Ridge, Lasso, lasso_path
+from sklearn.metrics import r2_score
+from sklearn.model_selection import KFold, ParameterGrid, ParameterSampler
+from sklearn.utils import check_array
+#------------------------------------------------------------------
+# Import custom exception, logger and constants
+#------------------------------------------------------------------
+import src.myproject.exception as exception
+import src.myproject.logger as logger
+import src.myproject.constants as constants
+from src.myproject.utils import take_rows
+from src.myproject.components.fit_cache import FitCache, data_fingerprint, estimator_fingerprint, make_key
+#------------------------------------------------------------------
+SEARCH_STRATEGIES = ("grid", "random", "halving", "path")
+FOREST_TYPES = (RandomForestRegressor, ExtraTreesRegressor)
+PATH_TYPES = (Ridge, Lasso)
+PATH_GRID_PARAMS = {Ridge: ("alpha", "fit_intercept", "solver"), Lasso: ("alpha", "fit_intercept", "max_iter", "tol", "positive")}
+#------------------------------------------------------------------
+def fit_and_score(estimator, params: dict, X, y, train_idx, test_idx) -> float:
+    """One search task: fit a fresh clone on the training fold and return its R2 on the held-out fold."""
+    model = clone(estimator).set_params(**params)
+    model.fit(take_rows(X, train_idx), take_rows(y, train_idx))
+    return r2_score(take_rows(y, test_idx), model.predict(take_rows(X, test_idx)))
+#------------------------------------------------------------------
+def supports_warm_start_sizes(estimator, params: dict) -> bool:
+    """Whether smaller n_estimators can be scored exactly from a prefix of a larger fit."""
+    merged = {**estimator.get_params(), **params}
+    if merged.get("warm_start"):
+        return False
+    if isinstance(estimator, FOREST_TYPES):
+        return True
+    return isinstance(estimator, GradientBoostingRegressor) and merged.get("n_iter_no_change") is None
+#------------------------------------------------------------------
+def fit_and_score_sizes(estimator, params: dict, sizes: list, X, y, train_idx, test_idx) -> list:
+    """
+    One warm-start task: fits the largest n_estimators in sizes once on the training fold
+    and returns the held-out R2 of every size, in the order given.
+    """
+    model = clone(estimator).set_params(**params, n_estimators=max(sizes))
+    model.fit(take_rows(X, train_idx), take_rows(y, train_idx))
+    X_test, y_test = take_rows(X, test_idx), take_rows(y, test_idx)
+    wanted, scores = set(sizes), {}
+    if isinstance(model, FOREST_TYPES):
+        #----------------------------------------------------------------
+        # Same accumulation order and input dtype (float32) as ForestRegressor.predict
+        #----------------------------------------------------------------
+        X_checked = check_array(X_test, dtype=np.float32, accept_sparse="csr")
+        total = np.zeros(X_checked.shape[0], dtype=np.float64)
+        for n_trees, tree in enumerate(model.estimators_, start=1):
+            total += tree.predict(X_checked, check_input=False)
+            if n_trees in wanted:
+                scores[n_trees] = r2_score(y_test, total / n_trees)
+    else:
+        for n_stages, y_pred in enumerate(model.staged_predict(X_test), start=1):
+            if n_stages in wanted:
+                scores[n_stages] = r2_score(y_test, y_pred)
+    return [scores[size] for size in sizes]
+#------------------------------------------------------------------
+def fit_and_score_alpha_path(estimator, params: dict, alphas: list, X, y, train_idx, test_idx) -> list:
+    """
+    One path task: solves Ridge or Lasso for every alpha on the training fold in a single
+    pass and returns the held-out R2 of every alpha, in the order given.
+    The intercept is handled like sklearn does for dense input: center X and y, fit, add the offset back.
+    """
+    settings = {**estimator.get_params(), **params}
+    X_train = np.asarray(take_rows(X, train_idx))
+    dtype = np.result_type(X_train.dtype, np.float32)   # float32 features stay float32, anything else float64
+    X_train = X_train.astype(dtype, copy=False)
+    y_train = np.asarray(take_rows(y, train_idx), dtype=dtype)
+    X_test = np.asarray(take_rows(X, test_idx), dtype=dtype)
+    y_test = take_rows(y, test_idx)
+    X_offset = X_train.mean(axis=0) if settings["fit_intercept"] else np.zeros(X_train.shape[1], dtype=dtype)
+    y_offset = y_train.mean() if settings["fit_intercept"] else dtype.type(0)
+    X_centered, y_centered = X_train - X_offset, y_train - y_offset
+    alphas = np.asarray(alphas, dtype=dtype)
+    if isinstance(estimator, Ridge):
+        #----------------------------------------------------------------
+        # w(alpha) = V diag(s / (s^2 + alpha)) U^T y, same cut-off as Ridge(solver='svd')
+        #----------------------------------------------------------------
+        U, s, Vt = np.linalg.svd(X_centered, full_matrices=False)
+        keep = s > 1e-15
+        U, s, Vt = U[:, keep], s[keep], Vt[keep]
+        coefs = (s * (U.T @ y_centered) / (s ** 2 + alphas[:, None])) @ Vt
+    else:
+        order = np.argsort(-alphas, kind="stable")
+        _, path_coefs, _ = lasso_path(X_centered, y_centered, alphas=alphas[order], max_iter=settings["max_iter"],
+                                      tol=settings["tol"], positive=settings["positive"])
+        coefs = np.empty((len(alphas), X_train.shape[1]), dtype=dtype)
+        coefs[order] = path_coefs.T
+    predictions = (X_test - X_offset) @ coefs.T + y_offset
+    return [r2_score(y_test, predictions[:, i]) for i in range(len(alphas))]
+#------------------------------------------------------------------
+def group_fit_units(estimator, round_candidates: list, warm_start: bool = True, sweep: str | None = None) -> list:
+    """
+    Groups one round's (params, n_samples) candidates into fit units:
+    [(sweep parameter or None, base params, n_samples, [(candidate index, sweep value or None), ...])].
+    Candidates share a unit only when they differ just by the swept parameter:
+    alpha for path families, n_estimators for warm-startable ensembles.
+    """
+    groups, units = {}, []
+    for index, (params, n_samples) in enumerate(round_candidates):
+        name = sweep or "n_estimators"
+        if sweep is None and (not warm_start or name not in params or not supports_warm_start_sizes(estimator, params)):
+            units.append((None, params, n_samples, [(index, None)]))
+            continue
+        base = {key: value for key, value in params.items() if key != name}
+        key = (n_samples, repr(sorted(base.items())))
+        if key not in groups:
+            groups[key] = (name, base, n_samples, [])
+            units.append(groups[key])
+        groups[key][3].append((index, params[name]))
+    return units
+#------------------------------------------------------------------
+def score_unit(estimator, sweep: str | None, params: dict, members: list, X, y, train_idx, test_idx) -> list:
+    """Runs one fit unit: a single from-scratch fit, an n_estimators warm-start group or an alpha path."""
+    values = [value for _, value in members]
+    if sweep == "alpha":
+        return fit_and_score_alpha_path(estimator, params, values, X, y, train_idx, test_idx)
+    if len(members) == 1:
+        full_params = params if sweep is None else {**params, sweep: values[0]}
+        return [fit_and_score(estimator, full_params, X, y, train_idx, test_idx)]
+    return fit_and_score_sizes(estimator, params, values, X, y, train_idx, test_idx)
+#------------------------------------------------------------------
+def timed_score_unit(deadline, *args) -> tuple:
+    """
+    score_unit plus the CPU seconds the worker spent on it. A task that only starts after
+    deadline (epoch seconds; None = no deadline) was queued past the budget and returns (None, 0.0).
+    """
+    if deadline is not None and time.time() >= deadline:
+        return None, 0.0
+    started = time.process_time()
+    scores = score_unit(*args)
+    return scores, time.process_time() - started
+#------------------------------------------------------------------
+def best_candidate_index(mean_scores: np.ndarray) -> int:
+    """GridSearchCV rule: highest mean score, first candidate wins ties, NaN ranks last."""
+    return int(np.argmax(np.where(np.isnan(mean_scores), -np.inf, mean_scores)))
+#------------------------------------------------------------------
+@dataclass
+class FamilySearchResult:
+    """Cross-validation outcome of one model family (last round only for halving)."""
+    family: str
+    candidates: list
+    fold_scores: np.ndarray                 # shape (n_candidates, n_folds)
+    strategy: str = "grid"
+    n_fits: int = 0                         # CV fit tasks run across all rounds (a warm-start group or alpha path
+                                            # counts once, fit-cache hits do not count)
+    best_index: int = -1
+    best_estimator: object = None
+    mean_scores: np.ndarray = field(init=False)
+    #----------------------------------------------------------------
+    def __post_init__(self):
+        self.mean_scores = np.mean(self.fold_scores, axis=1)
+        if self.best_index < 0:
+            self.best_index = best_candidate_index(self.mean_scores)
+    #----------------------------------------------------------------
+    @property
+    def best_params(self) -> dict:
+        return self.candidates[self.best_index]
+    #----------------------------------------------------------------
+    @property
+    def best_score(self) -> float:
+        return float(self.mean_scores[self.best_index])
+#------------------------------------------------------------------
+# Search plans: each yields rounds of (candidate params, n_samples or None) and consumes their scores
+#------------------------------------------------------------------
+class _SinglePassPlan:
+    """Grid or randomized search: one round over a fixed candidate list."""
+    def __init__(self, strategy: str, candidates: list, sweep: str | None = None):
+        self.strategy = strategy
+        self.sweep = sweep
+        self._candidates = candidates
+        self.round = None
+        self.done = False
+    #----------------------------------------------------------------
+    def next_round(self):
+        if self.done:
+            return None
+        self.round = [(params, None) for params in self._candidates]
+        return self.round
+    #----------------------------------------------------------------
+    def report(self, fold_scores: np.ndarray):
+        self.fold_scores = fold_scores
+        self.done = True
+    #----------------------------------------------------------------
+    def final(self):
+        return [params for params, _ in self.round], self.fold_scores
+#------------------------------------------------------------------
+class _HalvingPlan:
+    """Successive halving on training rows (n_samples) or on an estimator parameter such as n_estimators."""
+    def __init__(self, candidates: list, resource: str, max_resources: int,
+                 factor: int = 3, min_resources: int | None = None):
+        self.strategy = "halving"
+        self.sweep = None
+        self.resource = resource
+        self.factor = max(2, int(factor))
+        self.max_resources = int(max_resources)
+        self._survivors = candidates
+        #----------------------------------------------------------------
+        # Enough rounds to get down to ~1 candidate, starting as small as allowed
+        # ("exhaust": the last round runs at max_resources)
+        #----------------------------------------------------------------
+        n_rounds = 1 + int(math.floor(math.log(len(candidates), self.factor))) if len(candidates) > 1 else 1
+        floor_resources = min_resources or (50 if resource == "n_samples" else 10)
+        start = max(floor_resources, self.max_resources // self.factor ** (n_rounds - 1))
+        start = min(start, self.max_resources)
+        n_rounds = min(n_rounds, 1 + int(math.floor(math.log(self.max_resources / start, self.factor))))
+        self._resources = [min(self.max_resources, start * self.factor ** i) for i in range(n_rounds)]
+        self._resources[-1] = self.max_resources
+        self._round_index = 0
+        self.round = None
+        self.done = False
+    #----------------------------------------------------------------
+    def _with_resource(self, params: dict, resource: int):
+        if self.resource == "n_samples":
+            return params, resource
+        return {**params, self.resource: resource}, None
+    #----------------------------------------------------------------
+    def next_round(self):
+        if self.done:
+            return None
+        resource = self._resources[self._round_index]
+        self.round = [self._with_resource(params, resource) for params in self._survivors]
+        return self.round
+    #----------------------------------------------------------------
+    def report(self, fold_scores: np.ndarray):
+        self.fold_scores = fold_scores
+        self._round_index += 1
+        if self._round_index >= len(self._resources) or len(self._survivors) == 1:
+            self.done = True
+            return
+        #----------------------------------------------------------------
+        # Keep the top 1/factor (stable order, so ties keep grid order)
+        #----------------------------------------------------------------
+        mean_scores = np.mean(fold_scores, axis=1)
+        n_keep = max(1, int(math.ceil(len(self._survivors) / self.factor)))
+        ranked = np.argsort(-np.where(np.isnan(mean_scores), -np.inf, mean_scores), kind="stable")
+        self._survivors = [self._survivors[i] for i in sorted(ranked[:n_keep])]
+    #----------------------------------------------------------------
+    def final(self):
+        return [params for params, _ in self.round], self.fold_scores
+#------------------------------------------------------------------
+# Model Search Class
+#------------------------------------------------------------------
+class ModelSearch:
+    def __init__(self, n_jobs: int = -1, cv_folds: int = 3,
+                 strategy_override: str = constants.MODEL_SEARCH_STRATEGY,
+                 random_state: int = constants.RANDOM_STATE,
+                 warm_start: bool = constants.MODEL_SEARCH_WARM_START,
+                 fit_cache: FitCache | None = None,
+                 budget_seconds: float = 0.0, budget_cpu_seconds: float = 0.0,
+                 dominance_margin: float = constants.MODEL_SEARCH_DOMINANCE_MARGIN,
+                 dominance_min_candidates: int = 3,
+                 family_priority: dict | None = None):
+        """
+        n_jobs: worker processes for the shared task pool (-1 = all cores, 1 = serial).
+        cv_folds: number of unshuffled KFold splits, as GridSearchCV(cv=cv_folds) uses for regressors.
+        strategy_override: when set ("grid", "random", "halving", "path"), replaces every family's own strategy.
+        random_state: seed for randomized sampling and halving row subsamples.
+        warm_start: score n_estimators variants of ensembles from one fit of the largest size.
+        fit_cache: optional on-disk cache of CV scores and refitted estimators from earlier runs.
+        budget_seconds / budget_cpu_seconds: stop dispatching new fit tasks once this much wall-clock
+                                             or worker CPU time is spent (0 = unlimited); running
+                                             tasks and the final refits still complete.
+        dominance_margin: with a budget, stop a family whose best CV R2 trails the overall best by more than this.
+        dominance_min_candidates: fully scored candidates a family needs before it can be stopped as dominated.
+        family_priority: {family: expected score}; higher runs first (e.g. the previous run's validation R2).
+        """
+        self.n_jobs = n_jobs
+        self.cv_folds = cv_folds
+        self.strategy_override = strategy_override or None
+        self.random_state = random_state
+        self.warm_start = warm_start
+        self.fit_cache = fit_cache
+        self.budget_seconds = float(budget_seconds or 0)
+        self.budget_cpu_seconds = float(budget_cpu_seconds or 0)
+        self.dominance_margin = dominance_margin
+        self.dominance_min_candidates = max(1, int(dominance_min_candidates))
+        self.family_priority = family_priority or {}
+        self.report = {}
+    #----------------------------------------------------------------
+    @property
+    def budgeted(self) -> bool:
+        return self.budget_seconds > 0 or self.budget_cpu_seconds > 0
+    #----------------------------------------------------------------
+    def _ordered_families(self, families) -> list:
+        """Families with a known expected score first (best first), the rest in config order."""
+        known = sorted((family for family in families if family in self.family_priority),
+                       key=lambda family: -self.family_priority[family])
+        return known + [family for family in families if family not in self.family_priority]
+    #----------------------------------------------------------------
+    def _make_plan(self, family: str, config: dict, n_train_rows: int):
+        search = dict(config.get("search") or {})
+        strategy = (self.strategy_override or search.get("strategy", "grid")).lower()
+        if strategy not in SEARCH_STRATEGIES:
+            raise ValueError(f"Unknown search strategy '{strategy}' for {family}; expected one of {SEARCH_STRATEGIES}")
+        params = config["params"]
+        if strategy == "path":
+            problem = self._path_problem(config["model"], params)
+            if problem and self.strategy_override:
+                logger.app_logger.info("%s keeps the grid search under the path override: %s", family, problem)
+                strategy = "grid"
+            elif problem:
+                raise ValueError(f"Path search for {family}: {problem}")
+        if strategy == "grid":
+            return _SinglePassPlan("grid", list(ParameterGrid(params)))
+        if strategy == "random":
+            n_iter = min(int(search.get("n_iter", constants.MODEL_SEARCH_N_ITER)), len(ParameterGrid(params)))
+            return _SinglePassPlan("random", list(ParameterSampler(params, n_iter, random_state=self.random_state)))
+        if strategy == "path":
+            #----------------------------------------------------------------
+            # Path: alpha is swept inside each task over the configured alphas (plus a log-spaced
+            # range between them); Ridge uses the exact SVD solution. Generated alphas within rounding
+            # of a configured one are dropped so the configured value is the one scored and reported
+            #----------------------------------------------------------------
+            alphas = np.asarray(params.get("alpha") or [config["model"].alpha], dtype=np.float64)
+            if "n_alphas" in search:
+                generated = np.geomspace(alphas.min(), alphas.max(), int(search["n_alphas"]))
+                near_configured = np.isclose(generated[:, None], alphas[None, :], rtol=1e-9, atol=0.0).any(axis=1)
+                alphas = np.union1d(alphas, generated[~near_configured])
+            fixed = {"solver": "svd"} if isinstance(config["model"], Ridge) else {}
+            base_grid = {name: values for name, values in params.items() if name != "alpha"}
+            candidates = [{**base, **fixed, "alpha": float(alpha)} for base in ParameterGrid(base_grid) for alpha in alphas]
+            return _SinglePassPlan("path", candidates, sweep="alpha")
+        #----------------------------------------------------------------
+        # Halving: the resource parameter leaves the grid and is driven by the schedule
+        #----------------------------------------------------------------
+        resource = search.get("resource", "n_samples")
+        if resource == "n_samples":
+            max_resources = n_train_rows
+        else:
+            grid_values = params.get(resource)
+            max_resources = int(search.get("max_resources") or (max(grid_values) if grid_values
+                                    else config["model"].get_params()[resource]))
+            params = {name: values for name, values in params.items() if name != resource}
+        return _HalvingPlan(list(ParameterGrid(params)), resource, max_resources,
+                            factor=search.get("factor", 3), min_resources=search.get("min_resources"))
+    #----------------------------------------------------------------
+    @staticmethod
+    def _path_problem(model, params: dict) -> str | None:
+        """Why the path strategy cannot reproduce this family's grid, or None when it can."""
+        model_type = next((cls for cls in PATH_TYPES if isinstance(model, cls)), None)
+        if model_type is None:
+            return f"only Ridge and Lasso are supported, not {type(model).__name__}"
+        unsupported = sorted(set(params) - set(PATH_GRID_PARAMS[model_type]))
+        if unsupported:
+            return f"grid keys {unsupported} are not honoured by the path solver"
+        if model_type is Ridge and set(params.get("solver", ["svd"])) != {"svd"}:
+            return f"the path computes the svd solution; remove solver {params['solver']} from the grid"
+        return None
+    #----------------------------------------------------------------
+    def run(self, model_hyperparameters: dict, X, y, refit_X=None, data_fingerprints: tuple | None = None,
+            rows=None) -> dict:
+        """
+        Cross-validates the candidates of every family in one task pool (round by round
+        for halving families), then refits each family's best candidate on the full
+        training data. Returns {family: FamilySearchResult}; families stopped as dominated
+        or left without a fully scored candidate are only listed in self.report.
+        With a fit cache, fold tasks and refits whose results are cached are not dispatched.
+        refit_X: same data as X for the final refits (e.g. the DataFrame behind a read-only
+                 memmap X, so the champion keeps its feature names).
+        data_fingerprints: precomputed (X, y) content fingerprints for the fit cache keys.
+        rows: positions of the training rows in X and y (index-only splits); folds are cut from
+              these rows and the refits use them, so X and y can be the whole base dataset and
+              refit_X, when given, holds just these rows.
+        """
+        try:
+            started, cpu_seconds = time.monotonic(), 0.0
+            deadline = time.time() + self.budget_seconds if self.budget_seconds > 0 else None
+            families = self._ordered_families(list(model_hyperparameters))
+            positions = np.arange(len(y)) if rows is None else np.asarray(rows, dtype=np.int64)
+            splits = [(positions[train_idx], positions[test_idx])
+                      for train_idx, test_idx in KFold(n_splits=self.cv_folds).split(positions)]
+            rng = np.random.RandomState(self.random_state)
+            shuffled_train = [rng.permutation(train_idx) for train_idx, _ in splits]
+            plans = {family: self._make_plan(family, model_hyperparameters[family], len(splits[0][0]))
+                     for family in families}
+            counts = {family: {"tasks_run": 0, "tasks_cached": 0, "tasks_skipped": 0} for family in families}
+            status = {}        # family -> "stopped_dominated" | "budget_exhausted"
+            completed = {}     # family -> (candidates, fold_scores) of fully scored candidates
+            round_number = 0
+            cache = self.fit_cache
+            data_keys = None if cache is None else \
+                tuple(data_fingerprints) if data_fingerprints else (data_fingerprint(X), data_fingerprint(y))
+            if refit_X is None:
+                refit_X = X if rows is None else take_rows(X, positions)
+            refit_y = y if rows is None else take_rows(y, positions)
+            row_keys = () if rows is None else (positions,)
+            #----------------------------------------------------------------
+            def has_champion() -> bool:
+                return bool(completed) or any(np.isfinite(row).all() for scores in fold_scores.values() for row in scores)
+            #----------------------------------------------------------------
+            def budget_spent() -> bool:
+                if not has_champion():
+                    return False   # always score at least one candidate, so there is a champion
+                return (self.budget_seconds > 0 and time.monotonic() - started >= self.budget_seconds) or \
+                       (self.budget_cpu_seconds > 0 and cpu_seconds >= self.budget_cpu_seconds)
+            #----------------------------------------------------------------
+            def scored_rows(family) -> list:
+                scores = fold_scores.get(family)
+                rows = [] if scores is None else [row for row in scores if np.isfinite(row).all()]
+                if family in completed:
+                    rows.extend(completed[family][1])
+                return rows
+            #----------------------------------------------------------------
+            def best_seen(family) -> float:
+                return max((float(np.mean(row)) for row in scored_rows(family)), default=-np.inf)
+            #----------------------------------------------------------------
+            # n_samples halving trains on a seeded subsample of each training fold
+            #----------------------------------------------------------------
+            def fold_indices(n_samples, fold_index):
+                train_idx, test_idx = splits[fold_index]
+                if n_samples is None or n_samples >= len(train_idx):
+                    return train_idx, test_idx
+                return np.sort(shuffled_train[fold_index][:n_samples]), test_idx
+            #----------------------------------------------------------------
+            def score_keys(family, unit, fold_index):
+                sweep, params, n_samples, members = unit
+                method = "path" if sweep == "alpha" else "fit"
+                estimator = model_hyperparameters[family]["model"]
+                return [make_key("cv", *data_keys, method, "r2",
+                                 estimator_fingerprint(estimator, params if sweep is None else {**params, sweep: value}),
+                                 *fold_indices(n_samples, fold_index))
+                        for _, value in members]
+            #----------------------------------------------------------------
+            # 1. Rounds of (family, parameter-set, fold) fits, all families in one pool
+            #----------------------------------------------------------------
+            fold_scores = {}
+            while True:
+                rounds = {family: plan.next_round() for family, plan in plans.items()
+                          if not plan.done and family not in status}
+                if not rounds:
+                    break
+                round_number += 1
+                units = {family: group_fit_units(model_hyperparameters[family]["model"], candidates,
+                                                 self.warm_start, plans[family].sweep)
+                         for family, candidates in rounds.items()}
+                #----------------------------------------------------------------
+                # Under a budget, visit each family's grid in a seeded spread order so the
+                # first waves cover it broadly instead of one corner
+                #----------------------------------------------------------------
+                unit_order = {family: rng.permutation(len(units[family])) if self.budgeted else range(len(units[family]))
+                              for family in rounds}
+                tasks = [(family, unit_index, fold_index)
+                         for family in rounds
+                         for unit_index in unit_order[family]
+                         for fold_index in range(len(splits))]
+                fold_scores = {family: np.full((len(candidates), len(splits)), np.nan)
+                               for family, candidates in rounds.items()}
+                def record(task, scores):
+                    family, unit_index, fold_index = task
+                    for (candidate_index, _), score in zip(units[family][unit_index][3], scores):
+                        fold_scores[family][candidate_index, fold_index] = score
+                #----------------------------------------------------------------
+                # Cached fold tasks are answered from disk; the rest go to the pool
+                #----------------------------------------------------------------
+                task_keys, pending = {}, []
+                for task in tasks:
+                    family, unit_index, fold_index = task
+                    if cache is not None:
+                        task_keys[task] = score_keys(family, units[family][unit_index], fold_index)
+                        cached = [cache.get_score(key) for key in task_keys[task]]
+                        if all(score is not None for score in cached):
+                            record(task, cached)
+                            counts[family]["tasks_cached"] += 1
+                            continue
+                    pending.append(task)
+                logger.app_logger.info("Search round %d: dispatching %d of %d fit tasks (%d families, %d folds) with n_jobs=%s",
+                                       round_number, len(pending), len(tasks), len(rounds), len(splits), self.n_jobs)
+                #----------------------------------------------------------------
+                # Tasks are handed to the pool one at a time under a budget, so the budget and
+                # dominance stops are checked right before each dispatch; tasks joblib queued ahead
+                # of a free worker are dropped by the worker once the wall-clock deadline has passed
+                #----------------------------------------------------------------
+                dispatched = []
+                def task_stream():
+                    for task in pending:
+                        if budget_spent():
+                            return
+                        if task[0] in status:
+                            continue
+                        dispatched.append(task)
+                        family, unit_index, fold_index = task
+                        yield delayed(timed_score_unit)(deadline if has_champion() else None,
+                                                        model_hyperparameters[family]["model"], *units[family][unit_index][:2],
+                                                        units[family][unit_index][3], X, y,
+                                                        *fold_indices(units[family][unit_index][2], fold_index))
+                parallel = Parallel(n_jobs=self.n_jobs, return_as="generator",
+                                    **({"batch_size": 1, "pre_dispatch": "n_jobs"} if self.budgeted else {}))
+                for position, (scores, task_cpu) in enumerate(parallel(task_stream())):
+                    task = dispatched[position]
+                    if scores is None:
+                        continue
+                    record(task, scores)
+                    cpu_seconds += task_cpu
+                    counts[task[0]]["tasks_run"] += 1
+                    if cache is not None:
+                        for key, score in zip(task_keys[task], scores):
+                            cache.put_score(key, score)
+                    #----------------------------------------------------------------
+                    # Early stop of clearly dominated families (budgeted runs only)
+                    #----------------------------------------------------------------
+                    if self.budgeted and self.dominance_margin is not None and self.dominance_margin >= 0:
+                        overall = max(best_seen(family) for family in families)
+                        for family in rounds:
+                            best = best_seen(family)
+                            enough = len(scored_rows(family)) >= min(self.dominance_min_candidates, len(rounds[family]))
+                            if family not in status and enough and best + self.dominance_margin < overall:
+                                status[family] = "stopped_dominated"
+                                logger.app_logger.info("Stopping %s: best CV R2 %.4f trails %.4f by more than %.3f",
+                                                       family, best, overall, self.dominance_margin)
+                for family, unit_index, fold_index in pending:
+                    first_candidate = units[family][unit_index][3][0][0]
+                    if np.isnan(fold_scores[family][first_candidate, fold_index]):
+                        counts[family]["tasks_skipped"] += 1
+                #----------------------------------------------------------------
+                # Close the round per family: full rounds advance the plan, cut-off rounds keep what finished
+                #----------------------------------------------------------------
+                for family, candidates in rounds.items():
+                    scores = fold_scores[family]
+                    complete = np.isfinite(scores).all(axis=1)
+                    if complete.all() and family not in status:
+                        plans[family].report(scores)
+                        completed[family] = ([params for params, _ in candidates], scores)
+                        continue
+                    status.setdefault(family, "budget_exhausted")
+                    if complete.any():
+                        completed[family] = ([params for (params, _), done in zip(candidates, complete) if done],
+                                             scores[complete])
+                if cache is not None:
+                    cache.save()
+            results = {}
+            for family in families:
+                if family in completed and status.get(family) != "stopped_dominated":
+                    candidates, scores = completed[family]
+                    results[family] = FamilySearchResult(family, candidates, scores, strategy=plans[family].strategy,
+                                                         n_fits=counts[family]["tasks_run"])
+            if not results:
+                raise ValueError("No model family produced a fully cross-validated candidate")
+            #----------------------------------------------------------------
+            # 2. Refit each family's best candidate on the full training data (also in the pool)
+            #----------------------------------------------------------------
+            refit_keys = {family: make_key("refit", *data_keys, *row_keys, estimator_fingerprint(
+                              model_hyperparameters[family]["model"], result.best_params))
+                          for family, result in results.items()} if cache is not None else {}
+            for family, key in refit_keys.items():
+                results[family].best_estimator = cache.get_estimator(key)
+            pending = [family for family, result in results.items() if result.best_estimator is None]
+            refitted = Parallel(n_jobs=self.n_jobs)(
+                delayed(clone(model_hyperparameters[family]["model"]).set_params(**results[family].best_params).fit)(refit_X, refit_y)
+                for family in pending
+            )
+            for family, estimator in zip(pending, refitted):
+                results[family].best_estimator = estimator
+                if cache is not None:
+                    cache.put_estimator(refit_keys[family], estimator)
+            if cache is not None:
+                cache.save()
+                logger.app_logger.info("Fit cache: %s", cache.stats())
+            #----------------------------------------------------------------
+            # 3. Search report: what ran, what was cached and what was skipped
+            #----------------------------------------------------------------
+            self.report = {
+                "budget_seconds": self.budget_seconds,
+                "budget_cpu_seconds": self.budget_cpu_seconds,
+                "dominance_margin": self.dominance_margin if self.budgeted else None,
+                "elapsed_seconds": round(time.monotonic() - started, 3),
+                "worker_cpu_seconds": round(cpu_seconds, 3),
+                "families": {family: {
+                    "strategy": plans[family].strategy,
+                    "status": status.get(family, "complete"),
+                    **counts[family],
+                    "candidates_scored": len(completed[family][0]) if family in completed else 0,
+                    "best_cv_r2": results[family].best_score if family in results else
+                                  (best_seen(family) if np.isfinite(best_seen(family)) else None),
+                    "best_params": results[family].best_params if family in results else None,
+                } for family in families},
+            }
+            for result in results.values():
+                logger.app_logger.info("%s (%s, %d CV fits) best CV R2: %.4f with %s", result.family, result.strategy,
+                                       result.n_fits, result.best_score, result.best_params)
+            return results
+        except Exception as e:
+            exc_type, exc_value, exc_traceback = sys.exc_info()
+            raise exception.CustomException(exc_type, exc_value, exc_traceback) from e
@@ -3,9 +3,9 @@ Module for training machine learning models.
 Implements model training, hyperparameter tuning, and model selection.
 """
 import sys
+import json
 import pandas as pd
 import joblib
-from sklearn.model_selection import GridSearchCV
 from sklearn.metrics import root_mean_squared_error, r2_score
 
 #------------------------------------------------------------------
@@ -16,6 +16,11 @@ import src.myproject.exception as exception
 import src.myproject.logger as logger
 
 from src.myproject.config.config_app import ModelTrainerConfig
+from src.myproject.components.model_search import ModelSearch
+from src.myproject.components.fit_cache import FitCache, data_fingerprint
+from src.myproject.components.model_compiler import export_compiled_model
+from src.myproject.components.prediction_table import build_prediction_table
+from src.myproject.components.data_splits import DataSplits
 #------------------------------------------------------------------
 # Model Trainer Class
 #------------------------------------------------------------------
@@ -29,33 +34,88 @@ class ModelTrainer:
         """
         self.model_trainer_config = ModelTrainerConfig()
     #----------------------------------------------------------------
+    def load_family_priority(self) -> dict:
+        """Validation R2 per family from the previous training report, used to run the best families first."""
+        report_path = self.model_trainer_config.training_report_and_path
+        if not report_path.exists():
+            return {}
+        try:
+            with open(report_path, encoding="utf-8") as file:
+                families = json.load(file).get("families", {})
+            return {family: info["val_r2"] for family, info in families.items() if info.get("val_r2") is not None}
+        except (OSError, ValueError) as e:
+            logger.app_logger.warning("Ignoring unreadable training report %s: %s", report_path, e)
+            return {}
+    #----------------------------------------------------------------
+    def load_search_matrix(self, x_train_transformed: pd.DataFrame, x_fingerprint: str, matrix_path=None):
+        """
+        The read-only memory-mapped copy of x_train_transformed written by DataTransformation,
+        or the DataFrame itself when the matrix is disabled, missing or stale.
+        Workers reopen the memmap by file name instead of receiving a pickled copy.
+        """
+        if not self.model_trainer_config.use_memmap_matrices:
+            return x_train_transformed
+        matrix_path = matrix_path or self.model_trainer_config.x_transformed_matrix
+        matrix, metadata = utils.load_matrix_memmap(matrix_path)
+        if matrix is None or metadata.get("fingerprint") != x_fingerprint or \
+                metadata.get("columns") != [str(col) for col in x_train_transformed.columns]:
+            logger.app_logger.warning("No up-to-date memory-mapped training matrix at %s; searching on the DataFrame",
+                                      matrix_path)
+            return x_train_transformed
+        logger.app_logger.info("Searching on memory-mapped training matrix %s %s", matrix_path, matrix.shape)
+        return matrix
+    #----------------------------------------------------------------
     def initiate_model_trainer(self, 
-        x_train_transformed: pd.DataFrame, y_train: pd.Series,
-        x_val_transformed: pd.DataFrame, y_val: pd.Series,
-        x_test_transformed: pd.DataFrame, y_test: pd.Series
+        x_train_transformed: pd.DataFrame = None, y_train: pd.Series = None,
+        x_val_transformed: pd.DataFrame = None, y_val: pd.Series = None,
+        x_test_transformed: pd.DataFrame = None, y_test: pd.Series = None,
+        splits: DataSplits | None = None
     ):
         """
         Trains multiple models and evaluates them on validation data.
         Selects the best model based on R2 Score.
+        splits: index-only split over the transformed features, used instead of the six
+                materialized parts; each part is taken from it only where it is needed.
         """
         try:
             logger.app_logger.info("Starting model training process...")
             #----------------------------------------------------------------
-            # 1. Train and evaluate each model
+            # 1. Cross-validate every (family, parameter-set, fold) in one task pool
+            #    Same splits, scoring and tie-breaking as GridSearchCV(cv=cv_folds, scoring='r2')
             #----------------------------------------------------------------
-            best_models_report = {}
-            fitted_models = {}
-            for model_name, config in self.model_trainer_config.model_hyperparameters.items():
-                logger.app_logger.info("Training model: %s",model_name)
-                #----------------------------------------------------------------
-                # Hyperparameter Tuning using GridSearchCV
+            fit_cache = FitCache(self.model_trainer_config.fit_cache_dir, self.model_trainer_config.fit_cache_max_bytes) \
+                if self.model_trainer_config.fit_cache_enabled else None
+            search = ModelSearch(n_jobs=self.model_trainer_config.n_jobs, cv_folds=self.model_trainer_config.cv_folds,
+                                 fit_cache=fit_cache,
+                                 budget_seconds=self.model_trainer_config.budget_seconds,
+                                 budget_cpu_seconds=self.model_trainer_config.budget_cpu_seconds,
+                                 family_priority=self.load_family_priority())
+            if splits is not None:
                 #----------------------------------------------------------------
-                grid = GridSearchCV(config["model"], config["params"], cv=3, scoring='r2')
-                grid.fit(x_train_transformed, y_train)
+                # Index-only split: search the whole transformed matrix restricted to the training rows
                 #----------------------------------------------------------------
-                # 2. Evaluate the best tuned version on Validation Data
-                #----------------------------------------------------------------
-                best_version = grid.best_estimator_
+                x_train_transformed = splits.X_part("train")
+                fingerprints = (data_fingerprint(splits.X), data_fingerprint(splits.y))
+                x_search = self.load_search_matrix(splits.X, fingerprints[0],
+                                                   self.model_trainer_config.x_all_transformed_matrix)
+                y_search = splits.y if x_search is splits.X else splits.y.to_numpy()
+                search_results = search.run(self.model_trainer_config.model_hyperparameters, x_search, y_search,
+                                            refit_X=x_train_transformed, data_fingerprints=fingerprints,
+                                            rows=splits.rows("train"))
+                x_val_transformed, y_val = splits.X_part("val"), splits.y_part("val")
+            else:
+                fingerprints = (data_fingerprint(x_train_transformed), data_fingerprint(y_train))
+                x_search = self.load_search_matrix(x_train_transformed, fingerprints[0])
+                y_search = y_train if x_search is x_train_transformed else y_train.to_numpy()
+                search_results = search.run(self.model_trainer_config.model_hyperparameters, x_search, y_search,
+                                            refit_X=x_train_transformed, data_fingerprints=fingerprints)
+            #----------------------------------------------------------------
+            # 2. Evaluate the best tuned version of each family on Validation Data
+            #----------------------------------------------------------------
+            best_models_report = {}
+            fitted_models = {}
+            for model_name, result in search_results.items():
+                best_version = result.best_estimator
                 y_val_pred = best_version.predict(x_val_transformed)
                 val_score = r2_score(y_val, y_val_pred)
                 #----------------------------------------------------------------
@@ -74,6 +134,8 @@ class ModelTrainer:
             # 4. Final Verification on UNSEEN Test Data
             # This is the single unbiased estimate of real-world performance
             #----------------------------------------------------------------
+            if splits is not None:
+                x_test_transformed, y_test = splits.X_part("test"), splits.y_part("test")
             unseen_test_pred = champion_model.predict(x_test_transformed)
             final_test_score = r2_score(y_test, unseen_test_pred)
             logger.app_logger.info("Final Performance on Unseen Test Data: %.4f", final_test_score)
@@ -83,6 +145,27 @@ class ModelTrainer:
             saved_file = joblib.dump(champion_model, self.model_trainer_config.champion_model_and_path)
             logger.app_logger.info("Champion Model saved at: %s", saved_file)
             #----------------------------------------------------------------
+            # 6. Export the compiled NumPy fast path when the champion is linear
+            #----------------------------------------------------------------
+            preprocessor = joblib.load(self.model_trainer_config.joblib_object_file_path)
+            export_compiled_model(preprocessor, champion_model, self.model_trainer_config.compiled_model_and_path)
+            #----------------------------------------------------------------
+            # 7. Optionally precompute the exhaustive prediction lookup table
+            #----------------------------------------------------------------
+            if self.model_trainer_config.build_prediction_table:
+                build_prediction_table(preprocessor, champion_model,
+                                       self.model_trainer_config.prediction_table_and_path,
+                                       champion_model_path=self.model_trainer_config.champion_model_and_path)
+            #----------------------------------------------------------------
+            # 8. Training report: search budget, per-family status, skipped work and scores
+            #----------------------------------------------------------------
+            training_report = dict(search.report, champion=champion_name, test_r2=final_test_score)
+            for model_name, val_score in best_models_report.items():
+                training_report["families"][model_name]["val_r2"] = val_score
+            with open(self.model_trainer_config.training_report_and_path, "w", encoding="utf-8") as file:
+                json.dump(training_report, file, indent=2, default=str)
+            logger.app_logger.info("Training report saved at: %s", self.model_trainer_config.training_report_and_path)
+            #----------------------------------------------------------------
             
             return champion_name, champion_model, final_test_score
 
@@ -0,0 +1,171 @@
+"""
+Module for precomputing an exhaustive prediction lookup table.
+The serving input space is finite: every categorical column has a handful of fitted
+levels and the numeric scores are integers in [PREDICTION_TABLE_SCORE_MIN, PREDICTION_TABLE_SCORE_MAX].
+The build step scores every combination once with the champion and stores the result
+as a memory-mapped float32 .npy array; serving then answers with an O(1) array lookup
+and falls back to the model for out-of-range or non-integer inputs.
+"""
+import sys
+import json
+import itertools
+import numpy as np
+import pandas as pd
+import joblib
+from pathlib import Path
+from sklearn.compose import ColumnTransformer
+#------------------------------------------------------------------
+# Import custom exception, logger and constants
+#------------------------------------------------------------------
+import src.myproject.utils as utils
+import src.myproject.exception as exception
+import src.myproject.logger as logger
+import src.myproject.constants as constants
+from src.myproject.artifact_cache import file_content_hash
+#------------------------------------------------------------------
+def _metadata_path(table_path) -> Path:
+    """The JSON sidecar describing the table axes lives next to the .npy file."""
+    return Path(table_path).with_suffix(".json")
+#------------------------------------------------------------------
+# Build Step
+#------------------------------------------------------------------
+def build_prediction_table(preprocessor: ColumnTransformer, model, table_path,
+                           champion_model_path=None,
+                           score_min: int = constants.PREDICTION_TABLE_SCORE_MIN,
+                           score_max: int = constants.PREDICTION_TABLE_SCORE_MAX,
+                           combos_per_chunk: int = 16) -> Path:
+    """
+    Scores every (categorical levels x integer scores) combination with the champion
+    and writes the predictions into a memory-mapped float32 array.
+    champion_model_path: when given, its content hash is recorded so serving can
+    detect a table built for a different champion.
+    """
+    try:
+        numerical_cols, categorical_levels = utils.get_preprocessor_schema(preprocessor)
+        categorical_cols = list(categorical_levels)
+        scores = np.arange(score_min, score_max + 1, dtype=np.float64)
+        shape = tuple(len(levels) for levels in categorical_levels.values()) + (len(scores),) * len(numerical_cols)
+        logger.app_logger.info("Building prediction table with shape %s (%d entries)...", shape, int(np.prod(shape)))
+        #----------------------------------------------------------------
+        # Numeric grid shared by every categorical combination (C order = last axis fastest)
+        #----------------------------------------------------------------
+        numeric_grid = np.stack(np.meshgrid(*([scores] * len(numerical_cols)), indexing='ij'), axis=-1)
+        numeric_grid = numeric_grid.reshape(-1, len(numerical_cols))
+        block_size = len(numeric_grid)
+        #----------------------------------------------------------------
+        # Score chunks of categorical combinations straight into the memmap
+        #----------------------------------------------------------------
+        table_path = Path(table_path)
+        utils.ensure_directory_exists(table_path.parent)
+        table = np.lib.format.open_memmap(table_path, mode='w+', dtype=np.float32, shape=shape)
+        flat_table = table.reshape(-1)
+        combos = list(itertools.product(*categorical_levels.values()))
+        for start in range(0, len(combos), combos_per_chunk):
+            chunk = combos[start:start + combos_per_chunk]
+            frame = pd.DataFrame(np.repeat(np.array(chunk, dtype=object), block_size, axis=0), columns=categorical_cols)
+            for i, col in enumerate(numerical_cols):
+                frame[col] = np.tile(numeric_grid[:, i], len(chunk))
+            predictions = model.predict(preprocessor.transform(frame[categorical_cols + numerical_cols]))
+            flat_table[start * block_size:(start + len(chunk)) * block_size] = np.asarray(predictions, dtype=np.float32)
+        table.flush()
+        del flat_table, table
+        #----------------------------------------------------------------
+        # Sidecar metadata: axis order, levels and the champion it was built from
+        #----------------------------------------------------------------
+        metadata = {
+            "categorical_columns": categorical_cols,
+            "categorical_levels": [list(map(str, levels)) for levels in categorical_levels.values()],
+            "numerical_columns": numerical_cols,
+            "score_min": int(score_min),
+            "score_max": int(score_max),
+            "champion_sha256": file_content_hash(champion_model_path) if champion_model_path else None,
+        }
+        with open(_metadata_path(table_path), 'w', encoding='utf-8') as file:
+            json.dump(metadata, file, indent=2)
+        logger.app_logger.info("Prediction table saved at: %s", table_path)
+        return table_path
+    except Exception as e:
+        exc_type, exc_value, exc_traceback = sys.exc_info()
+        raise exception.CustomException(exc_type, exc_value, exc_traceback) from e
+#------------------------------------------------------------------
+# Serving-side Lookup Class
+#------------------------------------------------------------------
+class PredictionTable:
+    def __init__(self, table: np.ndarray, metadata: dict):
+        """table: the (memory-mapped) float32 array; metadata: the JSON sidecar contents."""
+        self.table = table
+        self.metadata = metadata
+        self.categorical_columns = metadata["categorical_columns"]
+        self.numerical_columns = metadata["numerical_columns"]
+        self.score_min = metadata["score_min"]
+        self.score_max = metadata["score_max"]
+        self._flat = table.reshape(-1)
+        self._level_codes = [{level: code for code, level in enumerate(levels)}
+                             for levels in metadata["categorical_levels"]]
+        #----------------------------------------------------------------
+        # Row-major strides (in elements) turn a tuple of codes into one flat offset
+        #----------------------------------------------------------------
+        strides = np.cumprod((1,) + table.shape[:0:-1])[::-1]
+        self._categorical_strides = [int(s) for s in strides[:len(self.categorical_columns)]]
+        self._numerical_strides = [int(s) for s in strides[len(self.categorical_columns):]]
+    #----------------------------------------------------------------
+    @classmethod
+    def load(cls, table_path, champion_model_path=None) -> "PredictionTable | None":
+        """
+        Memory-maps a table built by build_prediction_table. Returns None when the file
+        is missing or, if champion_model_path is given, was built for a different champion.
+        """
+        table_path = Path(table_path)
+        metadata_path = _metadata_path(table_path)
+        if not table_path.exists() or not metadata_path.exists():
+            return None
+        with open(metadata_path, 'r', encoding='utf-8') as file:
+            metadata = json.load(file)
+        if champion_model_path is not None and metadata.get("champion_sha256") != file_content_hash(champion_model_path):
+            logger.app_logger.warning("Prediction table %s is stale for the current champion; ignoring it.", table_path)
+            return None
+        return cls(np.load(table_path, mmap_mode='r'), metadata)
+    #----------------------------------------------------------------
+    def lookup(self, record: dict) -> float | None:
+        """O(1) lookup of one record; None when the record is outside the precomputed space."""
+        offset = 0
+        for col, codes, stride in zip(self.categorical_columns, self._level_codes, self._categorical_strides):
+            code = codes.get(record.get(col))
+            if code is None:
+                return None
+            offset += code * stride
+        for col, stride in zip(self.numerical_columns, self._numerical_strides):
+            try:
+                value = float(record.get(col))
+            except (TypeError, ValueError):
+                return None
+            if not value.is_integer() or not self.score_min <= value <= self.score_max:
+                return None
+            offset += (int(value) - self.score_min) * stride
+        return float(self._flat[offset])
+    #----------------------------------------------------------------
+    def lookup_many(self, df: pd.DataFrame) -> np.ndarray:
+        """Vectorized lookup of a batch; rows outside the precomputed space come back as NaN."""
+        offsets = np.zeros(len(df), dtype=np.int64)
+        valid = np.ones(len(df), dtype=bool)
+        for col, codes, stride in zip(self.categorical_columns, self._level_codes, self._categorical_strides):
+            code = df[col].map(codes)
+            valid &= code.notna().to_numpy()
+            offsets += code.fillna(0).to_numpy(dtype=np.int64) * stride
+        for col, stride in zip(self.numerical_columns, self._numerical_strides):
+            values = pd.to_numeric(df[col], errors='coerce').to_numpy(dtype=np.float64)
+            in_space = (values == np.round(values)) & (values >= self.score_min) & (values <= self.score_max)
+            valid &= in_space
+            offsets += np.where(in_space, values - self.score_min, 0).astype(np.int64) * stride
+        results = np.full(len(df), np.nan, dtype=np.float64)
+        results[valid] = self._flat[offsets[valid]]
+        return results
+#------------------------------------------------------------------
+if __name__ == "__main__":
+    #----------------------------------------------------------------
+    # Build the table for the currently persisted preprocessor + champion
+    #----------------------------------------------------------------
+    build_prediction_table(joblib.load(constants.JOBLIB_FILE_AND_PATH),
+                           joblib.load(constants.CHAMPION_MODEL_AND_PATH),
+                           constants.PREDICTION_TABLE_AND_PATH,
+                           champion_model_path=constants.CHAMPION_MODEL_AND_PATH)
@@ -60,6 +60,14 @@ class AppConfig:
     y_train_data: Path = constants.Y_TRAIN_FILE_AND_PATH
     y_val_data: Path = constants.Y_VAL_FILE_AND_PATH
     y_test_data: Path = constants.Y_TEST_FILE_AND_PATH
+    #----------------------------------------------------------------
+    # Processed Artifact Format: the paths above name the CSV export;
+    # the stored artifact swaps in the format's extension
+    #----------------------------------------------------------------
+    artifact_format: str = constants.ARTIFACT_FORMAT
+    artifact_compression: str = constants.ARTIFACT_COMPRESSION
+    artifact_csv_export: bool = constants.ARTIFACT_CSV_EXPORT
+    print("artifact_format:", artifact_format)
 #------------------------------------------------------------------
 @dataclass(frozen=True)
 class DataIngestionConfig(AppConfig):
@@ -72,6 +80,25 @@ class DataIngestionConfig(AppConfig):
     test_size: float = constants.TEST_SIZE
     test_size_val: float = constants.TEST_SIZE_VAL
     random_state: int = constants.RANDOM_STATE
+    float_precision: str = constants.FLOAT_PRECISION
+    chunk_size: int = constants.INGESTION_CHUNK_SIZE
+    schema_sample_rows: int = constants.INGESTION_SCHEMA_SAMPLE_ROWS
+    ingestion_schema_path: Path = constants.INGESTION_SCHEMA_AND_PATH
+    split_storage: str = constants.SPLIT_STORAGE
+    split_strategy: str = constants.SPLIT_STRATEGY
+    split_key_column: str = constants.SPLIT_KEY_COLUMN
+    incremental: bool = constants.INGESTION_INCREMENTAL
+    watermark_path: Path = constants.INGESTION_WATERMARK_AND_PATH
+    raw_data_glob: str = constants.RAW_DATA_GLOB
+    n_jobs: int = constants.INGESTION_N_JOBS
+    database_url: str = constants.DATABASE_URL
+    db_table: str = constants.DB_TABLE
+    db_columns: str = constants.DB_COLUMNS
+    db_where: str = constants.DB_WHERE
+    db_params: str = constants.DB_PARAMS
+    db_order_by: str = constants.DB_ORDER_BY
+    db_fetch_size: int = constants.DB_FETCH_SIZE
+    split_indices_path: Path = constants.SPLIT_INDICES_AND_PATH
     print("test_size:", test_size)
     print("test_size_val:", test_size_val)
     print("random_state:", random_state)
@@ -87,6 +114,13 @@ class DataTransformationConfig(AppConfig):
     x_transformed_data: Path = constants.X_TRANSFORMED_FILE_AND_PATH
     x_val_transformed_data: Path = constants.X_VAL_TRANSFORMED_FILE_AND_PATH
     x_test_transformed_data: Path = constants.X_TEST_TRANSFORMED_FILE_AND_PATH
+    float_precision: str = constants.FLOAT_PRECISION
+    write_memmap_matrices: bool = constants.MEMMAP_MATRICES_ENABLED
+    x_transformed_matrix: Path = constants.X_TRANSFORMED_MATRIX_AND_PATH
+    x_val_transformed_matrix: Path = constants.X_VAL_TRANSFORMED_MATRIX_AND_PATH
+    x_test_transformed_matrix: Path = constants.X_TEST_TRANSFORMED_MATRIX_AND_PATH
+    x_all_transformed_data: Path = constants.X_ALL_TRANSFORMED_FILE_AND_PATH
+    x_all_transformed_matrix: Path = constants.X_ALL_TRANSFORMED_MATRIX_AND_PATH
 #----------------------------------------------------------------
 @dataclass(frozen=True)
 class ModelTrainerConfig(AppConfig):
@@ -98,8 +132,26 @@ class ModelTrainerConfig(AppConfig):
     joblib_object_file_path: Path = constants.JOBLIB_FILE_AND_PATH
     champion_model_path: Path = constants.MODELS_DIR
     champion_model_and_path: Path = constants.CHAMPION_MODEL_AND_PATH
+    compiled_model_and_path: Path = constants.COMPILED_MODEL_AND_PATH
+    prediction_table_and_path: Path = constants.PREDICTION_TABLE_AND_PATH
+    build_prediction_table: bool = constants.PREDICTION_TABLE_BUILD
+    n_jobs: int = constants.MODEL_TRAINER_N_JOBS
+    cv_folds: int = constants.MODEL_TRAINER_CV_FOLDS
+    fit_cache_enabled: bool = constants.FIT_CACHE_ENABLED
+    fit_cache_dir: Path = constants.FIT_CACHE_DIR
+    fit_cache_max_bytes: int = constants.FIT_CACHE_MAX_BYTES
+    budget_seconds: float = constants.MODEL_TRAINER_BUDGET_SECONDS
+    budget_cpu_seconds: float = constants.MODEL_TRAINER_BUDGET_CPU_SECONDS
+    training_report_and_path: Path = constants.TRAINING_REPORT_AND_PATH
+    use_memmap_matrices: bool = constants.MEMMAP_MATRICES_ENABLED
+    x_transformed_matrix: Path = constants.X_TRANSFORMED_MATRIX_AND_PATH
+    x_all_transformed_matrix: Path = constants.X_ALL_TRANSFORMED_MATRIX_AND_PATH
     #----------------------------------------------------------------
     # Define Hyperparameter grids separately for each model
+    # Every family runs the exhaustive grid (same results as GridSearchCV). The optional "search"
+    # entry holds per-family options that only apply once a faster strategy is opted into, either
+    # with "strategy" in that entry or for every family with MODEL_SEARCH_STRATEGY
+    # (see components/model_search.py).
     #----------------------------------------------------------------
     model_hyperparameters: dict = field(default_factory=lambda: {
         "LinearRegression": {
@@ -112,7 +164,8 @@ class ModelTrainerConfig(AppConfig):
                 "alpha": [0.1, 1.0, 10.0],
                 "solver": ["auto", "svd", "cholesky", "lsqr"],
                 "fit_intercept": [True, False]
-            }
+            },
+            "search": {"n_alphas": 300}                 # path: extra alphas between the grid's min and max
         },
         "Lasso": {
             "model": Lasso(),
@@ -120,23 +173,26 @@ class ModelTrainerConfig(AppConfig):
                 "alpha": [0.01, 0.1, 1.0],
                 "fit_intercept": [True, False],
                 "max_iter": [1000, 5000, 10000]
-            }
+            },
+            "search": {"n_alphas": 300}                 # path: extra alphas between the grid's min and max
         },
         "RandomForestRegressor": {
-            "model": RandomForestRegressor(),
+            "model": RandomForestRegressor(random_state=constants.RANDOM_STATE),
             "params":{
                 "n_estimators": [25,50,75,100,150,200],
                 "max_depth": [None, 5,10,15,20,25],
                 "min_samples_split": [2,3,5]
-            }
+            },
+            "search": {"resource": "n_estimators"}      # halving: grow the forest, not the rows
         },
         "GradientBoostingRegressor": {
-            "model": GradientBoostingRegressor(),
+            "model": GradientBoostingRegressor(random_state=constants.RANDOM_STATE),
                 "params": {
                 "n_estimators": [35,50,70,90,100,150,200],
                 "learning_rate": [0.01, 0.1],
                 "max_depth": [3,5,7]
-            }
+            },
+            "search": {"n_iter": 12}                    # random: candidates sampled from the grid
         }
     })
     print("Model Hyperparameters:", model_hyperparameters)
@@ -157,5 +213,14 @@ class PredictionPipelineConfig(AppConfig):
     #----------------------------------------------------------------
     preprocessor_file_path: Path = constants.JOBLIB_FILE_AND_PATH
     champion_model_file_path: Path = constants.CHAMPION_MODEL_AND_PATH
-    
-
+    compiled_model_file_path: Path = constants.COMPILED_MODEL_AND_PATH
+    prediction_table_file_path: Path = constants.PREDICTION_TABLE_AND_PATH
+#----------------------------------------------------------------
+@dataclass(frozen=True)
+class BulkScoringConfig(PredictionPipelineConfig):
+    """Bulk Scoring Configuration Class using 2025 standards."""
+    #----------------------------------------------------------------
+    # Rows read, scored and written per chunk
+    #----------------------------------------------------------------
+    chunk_size: int = constants.BULK_SCORING_CHUNK_SIZE
+    workers: int = constants.BULK_SCORING_WORKERS
@@ -9,6 +9,39 @@ import src.myproject.exception as exception
 from src.myproject.components.data_ingestion import DataIngestion
 from src.myproject.components.data_transformation import DataTransformation
 from src.myproject.components.model_trainer import ModelTrainer
+from src.myproject.components.ingestion_watermark import IngestionWatermark
+#------------------------------------------------------------------
+# Incremental ingestion: only rows appended since the watermark
+#------------------------------------------------------------------
+def run_incremental_ingestion(data_ingestion: DataIngestion, data_transformation: DataTransformation):
+    """
+    Ingests, splits and transforms the rows appended to the raw file since the watermark and
+    appends them to the processed artifacts. Without a usable watermark every artifact is
+    rebuilt from the full file. Returns the transformed split for training, or None when no
+    rows were appended.
+    """
+    config = data_ingestion.ingestion_config
+    watermark = IngestionWatermark(config.watermark_path)
+    settings = data_ingestion.incremental_settings()
+    artifacts = data_ingestion.incremental_artifacts() + data_transformation.incremental_artifacts()
+    mark = watermark.check(config.raw_file_and_path, settings, artifacts)
+    data, X, y, end_offset = data_ingestion.ingest_delta(mark["byte_offset"] if mark else 0)
+    if mark is None:
+        data_ingestion.save_ingested_data(data, X, y)
+        splits = data_ingestion.split_data_indices(X, y)
+        data_ingestion.save_split_indices(splits)
+        preprocessor = data_transformation.get_data_transformer_object(X)
+        transformed_splits = data_transformation.initiate_data_transformation_indexed(preprocessor, splits)
+    elif len(data) == 0:
+        logger.app_logger.info("No rows appended to %s since the watermark.", config.raw_file_and_path)
+        return None
+    else:
+        data_ingestion.append_ingested_data(data, X, y)
+        splits = data_ingestion.extend_split_indices(X)
+        transformed_splits = data_transformation.initiate_data_transformation_incremental(X, splits)
+    watermark.record(config.raw_file_and_path, end_offset, len(data) + (mark["rows"] if mark else 0),
+                     settings, artifacts)
+    return transformed_splits
 #------------------------------------------------------------------
 # Main function to orchestrate data ingestion
 #------------------------------------------------------------------
@@ -19,41 +52,77 @@ def main():
         #----------------------------------------------------------------
         data_ingestion = DataIngestion()
         data_transformation = DataTransformation()
-        #----------------------------------------------------------------
-        # Initite data ingestion from RAW file source and return as DataFrame
-        #----------------------------------------------------------------
-        raw_df,X,y = data_ingestion.initiate_data_ingestion_from_file()
-        data_ingestion.save_ingested_data(raw_df, X, y)
-        #----------------------------------------------------------------
-        # Split the Dataframe into Training, Validation, and Testing sets
-        # Also derive and return the respective feature and target datasets
-        # #----------------------------------------------------------------
-        (X_train, y_train), (X_val, y_val), (X_test, y_test) = data_ingestion.train_test_split_data(X,y)
-        logger.app_logger.info("Data split into training, validation and testing sets successfully.")
-        # #----------------------------------------------------------------
-        # # Save the training and testing data to their respective paths
-        # #----------------------------------------------------------------
-        data_ingestion.save_data_splits(X_train, y_train, X_val, y_val, X_test, y_test)
-        logger.app_logger.info("Data ingestion process completed successfully.")
-        #----------------------------------------------------------------
-        # Initialize Data Transformation Component
-        #----------------------------------------------------------------
-        data_transformation = DataTransformation()
-        #----------------------------------------------------------------
-        # Get Data Transformer Object
-        #----------------------------------------------------------------
-        logger.app_logger.info("Creating Data Transformation Preprocessor Object...")
-        preprocessor = data_transformation.get_data_transformer_object(raw_df)
-        logger.app_logger.info("Data Transformation Preprocessor Object created successfully.")
-        #----------------------------------------------------------------
-        # Initiate Data Transformation Process
-        #----------------------------------------------------------------
-        logger.app_logger.info("Starting Data Transformation process...")
-        x_train_transformed, x_val_transformed, x_test_transformed = \
-            data_transformation.initiate_data_transformation(
-            preprocessor_object=preprocessor, 
-            x_train=X_train, x_val=X_val, x_test=X_test)
-        logger.app_logger.info("Data Transformation process completed successfully.")
+        if data_ingestion.ingestion_config.incremental:
+            #----------------------------------------------------------------
+            # Incremental: ingest, split and transform only the rows appended since the watermark
+            #----------------------------------------------------------------
+            splits = transformed_splits = run_incremental_ingestion(data_ingestion, data_transformation)
+            if transformed_splits is None:
+                logger.app_logger.info("No new rows; the current champion model is kept.")
+                return
+        else:
+            #----------------------------------------------------------------
+            # Initite data ingestion from RAW file source and return as DataFrame
+            #----------------------------------------------------------------
+            if data_ingestion.ingestion_config.chunk_size > 0:
+                #----------------------------------------------------------------
+                # Out-of-core: stream the raw file (database, shards) into the processed artifacts chunk by chunk,
+                # then reload only X and y (X also gives the preprocessor its column types)
+                #----------------------------------------------------------------
+                data_ingestion.initiate_data_ingestion_streaming()
+                X, y = data_ingestion.load_ingested_features()
+                raw_df = X
+            elif data_ingestion.ingestion_config.database_url:
+                raw_df,X,y = data_ingestion.initiate_data_ingestion_from_db()
+                data_ingestion.save_ingested_data(raw_df, X, y)
+            elif data_ingestion.ingestion_config.raw_data_glob:
+                raw_df,X,y = data_ingestion.initiate_data_ingestion_from_directory()
+                data_ingestion.save_ingested_data(raw_df, X, y)
+            else:
+                raw_df,X,y = data_ingestion.initiate_data_ingestion_from_file()
+                data_ingestion.save_ingested_data(raw_df, X, y)
+            #----------------------------------------------------------------
+            # Split the Dataframe into Training, Validation, and Testing sets
+            # Also derive and return the respective feature and target datasets
+            # #----------------------------------------------------------------
+            if data_ingestion.ingestion_config.split_storage == "indices":
+                #----------------------------------------------------------------
+                # Index-only split: one small index file; parts are views taken from X and y when used
+                #----------------------------------------------------------------
+                splits = data_ingestion.split_data_indices(X, y)
+                data_ingestion.save_split_indices(splits)
+            else:
+                splits = None
+                (X_train, y_train), (X_val, y_val), (X_test, y_test) = data_ingestion.train_test_split_data(X,y)
+                # #----------------------------------------------------------------
+                # # Save the training and testing data to their respective paths
+                # #----------------------------------------------------------------
+                data_ingestion.save_data_splits(X_train, y_train, X_val, y_val, X_test, y_test)
+            logger.app_logger.info("Data split into training, validation and testing sets successfully.")
+            logger.app_logger.info("Data ingestion process completed successfully.")
+            #----------------------------------------------------------------
+            # Initialize Data Transformation Component
+            #----------------------------------------------------------------
+            data_transformation = DataTransformation()
+            #----------------------------------------------------------------
+            # Get Data Transformer Object
+            #----------------------------------------------------------------
+            logger.app_logger.info("Creating Data Transformation Preprocessor Object...")
+            preprocessor = data_transformation.get_data_transformer_object(raw_df)
+            logger.app_logger.info("Data Transformation Preprocessor Object created successfully.")
+            #----------------------------------------------------------------
+            # Initiate Data Transformation Process
+            #----------------------------------------------------------------
+            logger.app_logger.info("Starting Data Transformation process...")
+            if splits is not None:
+                transformed_splits = data_transformation.initiate_data_transformation_indexed(
+                    preprocessor_object=preprocessor, splits=splits)
+            else:
+                x_train_transformed, x_val_transformed, x_test_transformed = \
+                    data_transformation.initiate_data_transformation(
+                    preprocessor_object=preprocessor, 
+                    x_train=X_train, x_val=X_val, x_test=X_test)
+            logger.app_logger.info("Data Transformation process completed successfully.")
         #----------------------------------------------------------------
         # Initialize Model Trainer Component
         #----------------------------------------------------------------
@@ -62,11 +131,15 @@ def main():
         # Initiate Model Training Process
         #----------------------------------------------------------------
         logger.app_logger.info("Starting Model Training process...")
-        champion_name, champion_model, champion_score = model_trainer.initiate_model_trainer(
-            x_train_transformed=x_train_transformed, y_train=y_train,
-            x_val_transformed=x_val_transformed, y_val=y_val,
-            x_test_transformed=x_test_transformed, y_test=y_test
-        )
+        if splits is not None:
+            champion_name, champion_model, champion_score = model_trainer.initiate_model_trainer(
+                splits=transformed_splits)
+        else:
+            champion_name, champion_model, champion_score = model_trainer.initiate_model_trainer(
+                x_train_transformed=x_train_transformed, y_train=y_train,
+                x_val_transformed=x_val_transformed, y_val=y_val,
+                x_test_transformed=x_test_transformed, y_test=y_test
+            )
         logger.app_logger.info("Model Training process completed successfully.")
         logger.app_logger.info("Champion Model: %s with R2 Score: %.4f", champion_name, champion_score)
     except exception.CustomException as ce:
@@ -0,0 +1,141 @@
+"""
+Metrics Module for the Application
+This module provides lightweight hot-path instrumentation for the prediction service:
+counters and fixed-bucket histograms fed by monotonic timers, rendered in the
+Prometheus text exposition format for the /metrics endpoint. Every update is a
+bisect plus an increment under a per-metric lock, so it is cheap enough to leave on.
+"""
+import time
+import bisect
+import threading
+from contextlib import contextmanager
+#------------------------------------------------------------------
+# Default buckets
+#------------------------------------------------------------------
+LATENCY_BUCKETS_SECONDS = (0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005,
+                           0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024, 4096, 10000)
+#------------------------------------------------------------------
+def _format_labels(labelnames, labelvalues, extra=()) -> str:
+    pairs = list(zip(labelnames, labelvalues)) + list(extra)
+    if not pairs:
+        return ""
+    escaped = (str(value).replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n') for _, value in pairs)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + "}"
+#------------------------------------------------------------------
+def _format_value(value: float) -> str:
+    return repr(float(value)) if value != int(value) else str(int(value))
+#------------------------------------------------------------------
+# Counter Class
+#------------------------------------------------------------------
+class Counter:
+    def __init__(self, name: str, documentation: str, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+    #----------------------------------------------------------------
+    def inc(self, amount: float = 1, **labels):
+        key = tuple(labels.get(name, "") for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+    #----------------------------------------------------------------
+    def value(self, **labels) -> float:
+        return self._values.get(tuple(labels.get(name, "") for name in self.labelnames), 0)
+    #----------------------------------------------------------------
+    def render(self):
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} counter"
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            yield f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+#------------------------------------------------------------------
+# Histogram Class
+#------------------------------------------------------------------
+class Histogram:
+    def __init__(self, name: str, documentation: str, buckets=LATENCY_BUCKETS_SECONDS, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = tuple(sorted(buckets))
+        self.labelnames = tuple(labelnames)
+        self._series = {}    # label values -> [bucket counts..., +Inf count, sum]
+        self._lock = threading.Lock()
+    #----------------------------------------------------------------
+    def observe(self, value: float, **labels):
+        key = tuple(labels.get(name, "") for name in self.labelnames)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[index] += 1
+            series[-1] += value
+    #----------------------------------------------------------------
+    @contextmanager
+    def time(self, **labels):
+        """Observes the wall-clock duration of the with-block (monotonic clock)."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+    #----------------------------------------------------------------
+    def render(self):
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} histogram"
+        with self._lock:
+            items = sorted((key, list(series)) for key, series in self._series.items())
+        for key, series in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), series[:-1]):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else _format_value(bound)
+                yield f"{self.name}_bucket{_format_labels(self.labelnames, key, [('le', le)])} {cumulative}"
+            yield f"{self.name}_sum{_format_labels(self.labelnames, key)} {repr(float(series[-1]))}"
+            yield f"{self.name}_count{_format_labels(self.labelnames, key)} {cumulative}"
+#------------------------------------------------------------------
+# Registry
+#------------------------------------------------------------------
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+    #----------------------------------------------------------------
+    def register(self, metric):
+        with self._lock:
+            return self._metrics.setdefault(metric.name, metric)
+    #----------------------------------------------------------------
+    def counter(self, name: str, documentation: str, labelnames=()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+    #----------------------------------------------------------------
+    def histogram(self, name: str, documentation: str, buckets=LATENCY_BUCKETS_SECONDS, labelnames=()) -> Histogram:
+        return self.register(Histogram(name, documentation, buckets, labelnames))
+    #----------------------------------------------------------------
+    def render_prometheus(self) -> str:
+        """All metrics in the Prometheus text exposition format (version 0.0.4)."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return "\n".join(line for metric in metrics for line in metric.render()) + "\n"
+#------------------------------------------------------------------
+# Process-wide registry and the prediction service metrics
+#------------------------------------------------------------------
+REGISTRY = MetricsRegistry()
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+prediction_requests = REGISTRY.counter(
+    "prediction_requests_total", "Prediction requests received.", ["endpoint"])
+prediction_errors = REGISTRY.counter(
+    "prediction_errors_total", "Prediction requests that failed or were rejected.", ["endpoint"])
+prediction_rows = REGISTRY.counter(
+    "prediction_rows_total", "Rows scored.", ["endpoint"])
+request_latency = REGISTRY.histogram(
+    "prediction_request_seconds", "End-to-end request latency.", labelnames=["endpoint"])
+stage_latency = REGISTRY.histogram(
+    "prediction_stage_seconds", "Latency of each prediction stage (parse, validate, encode, lookup, transform, predict).",
+    labelnames=["stage"])
+batch_size = REGISTRY.histogram(
+    "prediction_batch_size", "Rows per scored batch.", buckets=BATCH_SIZE_BUCKETS, labelnames=["endpoint"])
+queue_delay = REGISTRY.histogram(
+    "prediction_queue_delay_seconds", "Time a coalesced request waited before its batch started.")
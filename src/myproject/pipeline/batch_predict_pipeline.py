@@ -0,0 +1,212 @@
+"""
+Module for streaming bulk scoring with the champion model.
+Reads a CSV or Parquet input in fixed-size chunks, pushes each chunk through the
+cached preprocessor and champion (PredictionPipeline) and appends the predictions to
+an output CSV, so memory stays constant regardless of the input size. A checkpoint
+file next to the output records the last completed chunk so an interrupted run resumes.
+With workers > 1 the chunks are scored in a process pool whose workers load the
+artifacts once, memory-mapped, and the results are written back in input order.
+
+Usage:
+    python -m src.myproject.pipeline.batch_predict_pipeline INPUT OUTPUT [--chunk-size N] [--workers N]
+                                                            [--id-columns COL ...] [--no-resume]
+"""
+import os
+import sys
+import json
+import time
+import argparse
+from pathlib import Path
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import pandas as pd
+from threadpoolctl import threadpool_limits
+#------------------------------------------------------------------
+# Import custom exception, logger, config and the prediction pipeline
+#------------------------------------------------------------------
+import src.myproject.exception as exception
+import src.myproject.logger as logger
+from src.myproject.config.config_app import BulkScoringConfig
+from src.myproject.pipeline.predict_pipeline import PredictionPipeline
+from src.myproject.artifact_cache import artifact_cache
+#------------------------------------------------------------------
+# Process-pool worker state: artifacts are loaded once per worker process
+#------------------------------------------------------------------
+_worker_artifacts = None
+#------------------------------------------------------------------
+def _init_scoring_worker(preprocessor_path, model_path):
+    """
+    Loads the preprocessor and champion once per worker. mmap_mode='r' maps the numpy
+    arrays inside the joblib files (e.g. tree node arrays) read-only, so every worker
+    shares the same pages instead of holding its own copy.
+    """
+    global _worker_artifacts
+    preprocessor = artifact_cache.load(preprocessor_path, mmap_mode='r')
+    model = artifact_cache.load(model_path, mmap_mode='r')
+    #----------------------------------------------------------------
+    # One BLAS/OpenMP thread per worker: the pool already uses every core
+    #----------------------------------------------------------------
+    _worker_artifacts = (preprocessor, model, threadpool_limits(limits=1))
+#------------------------------------------------------------------
+def _score_chunk(chunk: pd.DataFrame):
+    """Worker task: one transform + predict for one chunk."""
+    preprocessor, model, _ = _worker_artifacts
+    return model.predict(preprocessor.transform(chunk))
+#------------------------------------------------------------------
+def iter_input_chunks(input_path, chunk_size: int, skip_rows: int = 0):
+    """Yields DataFrames of at most chunk_size rows from a CSV or Parquet file."""
+    input_path = Path(input_path)
+    if input_path.suffix.lower() in (".parquet", ".pq"):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError("Parquet input requires the optional 'pyarrow' package") from e
+        parquet_file = pq.ParquetFile(input_path)
+        rows_seen = 0
+        for batch in parquet_file.iter_batches(batch_size=chunk_size):
+            if rows_seen + batch.num_rows <= skip_rows:
+                rows_seen += batch.num_rows
+                continue
+            chunk = batch.to_pandas()
+            if rows_seen < skip_rows:
+                chunk = chunk.iloc[skip_rows - rows_seen:]
+            rows_seen += batch.num_rows
+            yield chunk
+    else:
+        skip = range(1, skip_rows + 1) if skip_rows else None   # keep the header line
+        yield from pd.read_csv(input_path, chunksize=chunk_size, skiprows=skip)
+#------------------------------------------------------------------
+# Bulk Scoring Pipeline Class
+#------------------------------------------------------------------
+class BulkScoringPipeline:
+    def __init__(self):
+        """
+        Initializes the bulk scoring component with immutable config.
+        Standard: Use Dependency Injection for configuration.
+        """
+        self.bulk_scoring_config = BulkScoringConfig()
+        self.prediction_pipeline = PredictionPipeline()
+    #----------------------------------------------------------------
+    @staticmethod
+    def _checkpoint_path(output_path: Path) -> Path:
+        return output_path.with_name(output_path.name + ".checkpoint.json")
+    #----------------------------------------------------------------
+    @staticmethod
+    def _write_checkpoint(checkpoint_path: Path, state: dict):
+        """Atomic write: a crash mid-write never leaves a corrupt checkpoint."""
+        tmp_path = checkpoint_path.with_name(checkpoint_path.name + ".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as file:
+            json.dump(state, file)
+        os.replace(tmp_path, checkpoint_path)
+    #----------------------------------------------------------------
+    def _load_checkpoint(self, checkpoint_path: Path, input_path: Path, chunk_size: int) -> dict | None:
+        """Returns a resumable checkpoint for this exact input/chunk size, else None."""
+        if not checkpoint_path.exists():
+            return None
+        with open(checkpoint_path, 'r', encoding='utf-8') as file:
+            state = json.load(file)
+        if state.get("input") != str(input_path) or state.get("chunk_size") != chunk_size:
+            logger.app_logger.warning("Checkpoint %s belongs to a different run; starting over.", checkpoint_path)
+            return None
+        return state
+    #----------------------------------------------------------------
+    def _iter_scored_chunks(self, input_path: Path, chunk_size: int, skip_rows: int, workers: int):
+        """
+        Yields (chunk, predictions) in input order. With several workers, up to
+        2 * workers chunks are in flight and results are re-ordered by a FIFO of futures.
+        """
+        chunks = iter_input_chunks(input_path, chunk_size, skip_rows=skip_rows)
+        if workers <= 1:
+            for chunk in chunks:
+                yield chunk, self.prediction_pipeline.initiate_prediction(chunk).to_numpy()
+            return
+        config = self.bulk_scoring_config
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_scoring_worker,
+                                 initargs=(str(config.preprocessor_file_path), str(config.champion_model_file_path))) as pool:
+            in_flight = deque()
+            for chunk in chunks:
+                in_flight.append((chunk, pool.submit(_score_chunk, chunk)))
+                if len(in_flight) >= 2 * workers:
+                    done_chunk, future = in_flight.popleft()
+                    yield done_chunk, future.result()
+            while in_flight:
+                done_chunk, future = in_flight.popleft()
+                yield done_chunk, future.result()
+    #----------------------------------------------------------------
+    def score(self, input_path, output_path, chunk_size: int | None = None,
+              id_columns=(), resume: bool = True, workers: int | None = None) -> dict:
+        """
+        Streams input_path through the champion and writes output_path as CSV with the
+        id_columns (passed through unchanged) followed by a 'prediction' column.
+        workers > 1 scores chunks in a process pool (default: BULK_SCORING_WORKERS).
+        Returns a summary with row counts and throughput.
+        """
+        try:
+            input_path, output_path = Path(input_path).resolve(), Path(output_path).resolve()
+            chunk_size = int(chunk_size or self.bulk_scoring_config.chunk_size)
+            workers = int(workers or self.bulk_scoring_config.workers)
+            checkpoint_path = self._checkpoint_path(output_path)
+            state = self._load_checkpoint(checkpoint_path, input_path, chunk_size) if resume else None
+            #----------------------------------------------------------------
+            # Resume: drop any output written after the last completed chunk
+            #----------------------------------------------------------------
+            if state is not None and state.get("completed"):
+                logger.app_logger.info("Bulk scoring of %s already completed.", input_path)
+                return state
+            if state is not None and output_path.exists():
+                with open(output_path, 'r+b') as file:
+                    file.truncate(state["output_bytes"])
+                logger.app_logger.info("Resuming bulk scoring after chunk %d (%d rows).", state["chunks_done"], state["rows_done"])
+            else:
+                state = {"input": str(input_path), "chunk_size": chunk_size, "chunks_done": 0,
+                         "rows_done": 0, "output_bytes": 0, "completed": False}
+                output_path.parent.mkdir(parents=True, exist_ok=True)
+                output_path.unlink(missing_ok=True)
+            #----------------------------------------------------------------
+            # Stream: read chunk -> transform + predict -> append -> checkpoint
+            #----------------------------------------------------------------
+            started, rows_this_run = time.perf_counter(), 0
+            with open(output_path, 'a', encoding='utf-8', newline='') as output_file:
+                chunk_started = time.perf_counter()
+                for chunk, predictions in self._iter_scored_chunks(input_path, chunk_size, state["rows_done"], workers):
+                    result = chunk[list(id_columns)].reset_index(drop=True)
+                    result["prediction"] = predictions
+                    result.to_csv(output_file, index=False, header=state["output_bytes"] == 0)
+                    output_file.flush()
+                    #----------------------------------------------------------------
+                    state["chunks_done"] += 1
+                    state["rows_done"] += len(chunk)
+                    state["output_bytes"] = output_file.tell()
+                    self._write_checkpoint(checkpoint_path, state)
+                    rows_this_run += len(chunk)
+                    logger.app_logger.info("Chunk %d: %d rows in %.3fs (%.0f rows/sec overall)",
+                                           state["chunks_done"], len(chunk), time.perf_counter() - chunk_started,
+                                           rows_this_run / max(time.perf_counter() - started, 1e-9))
+                    chunk_started = time.perf_counter()
+            #----------------------------------------------------------------
+            elapsed = time.perf_counter() - started
+            state["completed"] = True
+            self._write_checkpoint(checkpoint_path, state)
+            summary = dict(state, rows_this_run=rows_this_run, seconds=elapsed, workers=workers,
+                           rows_per_sec=rows_this_run / elapsed if elapsed > 0 else 0.0)
+            logger.app_logger.info("Bulk scoring finished: %d rows this run in %.2fs (%.0f rows/sec, %d workers) -> %s",
+                                   rows_this_run, elapsed, summary["rows_per_sec"], workers, output_path)
+            return summary
+        except Exception as e:
+            exc_type, exc_value, exc_traceback = sys.exc_info()
+            logger.app_logger.error("Error occurred in Bulk Scoring Pipeline: %s", str(e))
+            raise exception.CustomException(exc_type, exc_value, exc_traceback) from e
+#------------------------------------------------------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Stream a CSV/Parquet file through the champion model.")
+    parser.add_argument("input", help="Input CSV or Parquet file with the raw feature columns")
+    parser.add_argument("output", help="Output CSV file for the predictions")
+    parser.add_argument("--chunk-size", type=int, default=None, help="Rows per chunk (default: BULK_SCORING_CHUNK_SIZE)")
+    parser.add_argument("--workers", type=int, default=None, help="Scoring processes (default: BULK_SCORING_WORKERS)")
+    parser.add_argument("--id-columns", nargs="*", default=[], help="Input columns copied to the output")
+    parser.add_argument("--no-resume", action="store_true", help="Ignore any checkpoint and start over")
+    args = parser.parse_args()
+    summary = BulkScoringPipeline().score(args.input, args.output, chunk_size=args.chunk_size,
+                                          id_columns=args.id_columns, resume=not args.no_resume,
+                                          workers=args.workers)
+    print(f"Scored {summary['rows_done']} rows ({summary.get('rows_per_sec', 0):.0f} rows/sec) -> {args.output}")
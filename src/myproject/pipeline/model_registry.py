@@ -0,0 +1,226 @@
+"""
+Module for serving the champion model with zero-downtime hot reload.
+The registry holds one immutable ServingArtifacts bundle (preprocessor, champion,
+optional lookup table, compiled fast path of a linear champion). A reload loads the new pair in a background thread, warms it
+with a few predictions and then swaps the bundle reference in one assignment, so
+in-flight requests finish on the bundle they started with and no request pays the load cost.
+"""
+import sys
+import time
+import warnings
+import threading
+from pathlib import Path
+from dataclasses import dataclass, replace
+import numpy as np
+import pandas as pd
+#------------------------------------------------------------------
+# Import custom exception, logger and helpers
+#------------------------------------------------------------------
+import src.myproject.utils as utils
+import src.myproject.exception as exception
+import src.myproject.logger as logger
+import src.myproject.constants as constants
+import src.myproject.metrics as metrics
+from src.myproject.artifact_cache import artifact_cache, file_content_hash
+from src.myproject.components.prediction_table import PredictionTable
+from src.myproject.components.model_compiler import CompiledLinearModel, is_linear_champion
+from src.myproject.pipeline.row_encoder import PreprocessorRowEncoder
+#------------------------------------------------------------------
+@dataclass(frozen=True)
+class ServingArtifacts:
+    """One consistent, fully warmed set of serving artifacts."""
+    preprocessor: object
+    model: object
+    prediction_table: PredictionTable | None
+    encoder: PreprocessorRowEncoder
+    version: str
+    loaded_at: float
+    compiled_model: CompiledLinearModel | None = None
+    #----------------------------------------------------------------
+    def predict_dataframe(self, df: pd.DataFrame) -> np.ndarray:
+        """Transform + predict with this bundle only (table lookups + dot product for a compiled champion)."""
+        if self.compiled_model is not None:
+            with metrics.stage_latency.time(stage='predict'):
+                return self.compiled_model.predict(df)
+        with metrics.stage_latency.time(stage='transform'):
+            transformed = self.preprocessor.transform(df)
+        with metrics.stage_latency.time(stage='predict'):
+            return self.model.predict(transformed)
+    #----------------------------------------------------------------
+    def predict_record(self, record: dict) -> float:
+        """Single-row fast path: the compiled champion, else NumPy encoding instead of a DataFrame round trip."""
+        if self.compiled_model is not None:
+            with metrics.stage_latency.time(stage='predict'):
+                return float(self.compiled_model.predict_one(record))
+        with metrics.stage_latency.time(stage='encode'):
+            row = self.encoder.encode(record)
+        with metrics.stage_latency.time(stage='predict'):
+            #----------------------------------------------------------------
+            # The champion is fitted on a DataFrame; scoring the encoded row (in the
+            # preprocessor's column order) without feature names is intentional here only
+            #----------------------------------------------------------------
+            with warnings.catch_warnings():
+                warnings.filterwarnings("ignore", message="X does not have valid feature names", category=UserWarning)
+                return float(self.model.predict(row)[0])
+#------------------------------------------------------------------
+def build_warmup_frame(preprocessor, n_rows: int = 4) -> pd.DataFrame:
+    """A few synthetic, valid records that touch every categorical level at least once if n_rows allows."""
+    numerical_cols, categorical_levels = utils.get_preprocessor_schema(preprocessor)
+    records = []
+    for i in range(n_rows):
+        record = {col: levels[i % len(levels)] for col, levels in categorical_levels.items()}
+        record.update({col: float(50 + i) for col in numerical_cols})
+        records.append(record)
+    return pd.DataFrame.from_records(records)
+#------------------------------------------------------------------
+# Model Registry Class
+#------------------------------------------------------------------
+class ModelRegistry:
+    def __init__(self, preprocessor_path, model_path, table_path=None, use_table: bool = False, compiled_path=None):
+        """
+        Loads and warms the initial bundle synchronously; later reloads happen in the background.
+        compiled_path: compiled fast path exported by the trainer, served when the champion is linear.
+        """
+        self.preprocessor_path = Path(preprocessor_path)
+        self.model_path = Path(model_path)
+        self.table_path = Path(table_path) if table_path else None
+        self.compiled_path = Path(compiled_path) if compiled_path else None
+        self.use_table = use_table
+        self._reload_lock = threading.Lock()
+        self._reload_thread = None
+        self._watcher_thread = None
+        self._stop_watcher = threading.Event()
+        self.reload_count = 0
+        self.last_error = None
+        self._current = self._load_and_warm()
+    #----------------------------------------------------------------
+    @property
+    def current(self) -> ServingArtifacts:
+        """The bundle to use for one request; read it once and keep the reference."""
+        return self._current
+    #----------------------------------------------------------------
+    def _load_and_warm(self) -> ServingArtifacts:
+        """Loads a new bundle and proves it can serve before it is published."""
+        try:
+            #----------------------------------------------------------------
+            # Cached instances are shared with the other pipelines and are never reconfigured here;
+            # pandas output is set once, when the preprocessor is built
+            #----------------------------------------------------------------
+            preprocessor = artifact_cache.load(self.preprocessor_path)
+            model = artifact_cache.load(self.model_path)
+            #----------------------------------------------------------------
+            # The pair must agree on the feature space (guards against a half-finished retrain)
+            #----------------------------------------------------------------
+            n_features = len(preprocessor.get_feature_names_out())
+            if getattr(model, "n_features_in_", n_features) != n_features:
+                raise ValueError(f"Champion expects {model.n_features_in_} features, preprocessor produces {n_features}")
+            prediction_table = PredictionTable.load(self.table_path, champion_model_path=self.model_path) \
+                if self.use_table and self.table_path else None
+            artifacts = ServingArtifacts(preprocessor, model, prediction_table, PreprocessorRowEncoder(preprocessor),
+                                         version=file_content_hash(self.model_path)[:12], loaded_at=time.time())
+            #----------------------------------------------------------------
+            # Warm-up: first predictions are slow (lazy imports, caches); pay that here
+            #----------------------------------------------------------------
+            warmup_frame = build_warmup_frame(preprocessor)
+            warmup_predictions = artifacts.predict_dataframe(warmup_frame)
+            if not np.all(np.isfinite(warmup_predictions)):
+                raise ValueError("Warm-up predictions are not finite")
+            #----------------------------------------------------------------
+            # The row encoder must reproduce ColumnTransformer.transform exactly
+            #----------------------------------------------------------------
+            rtol, atol = (1e-5, 1e-4) if artifacts.encoder.dtype == np.float32 else (0, 1e-9)
+            for record, expected in zip(warmup_frame.to_dict('records'), warmup_predictions):
+                if not np.isclose(artifacts.predict_record(record), expected, rtol=rtol, atol=atol):
+                    raise ValueError("Row encoder disagrees with the preprocessor")
+            compiled_model = self._load_compiled(model, warmup_frame, warmup_predictions, rtol, atol)
+            return replace(artifacts, compiled_model=compiled_model) if compiled_model is not None else artifacts
+        except Exception as e:
+            exc_type, exc_value, exc_traceback = sys.exc_info()
+            raise exception.CustomException(exc_type, exc_value, exc_traceback) from e
+    #----------------------------------------------------------------
+    def _load_compiled(self, model, warmup_frame, warmup_predictions, rtol, atol) -> CompiledLinearModel | None:
+        """
+        The compiled fast path of a linear champion, or None. It is only served when it reproduces
+        the champion on the warm-up rows, so a compiled file left from another champion is ignored.
+        """
+        if self.compiled_path is None or not self.compiled_path.exists() or not is_linear_champion(model):
+            return None
+        compiled_model = CompiledLinearModel.load(self.compiled_path)
+        if compiled_model.dtype == np.float32:
+            rtol, atol = max(rtol, 1e-5), max(atol, 1e-4)
+        batch_ok = np.allclose(compiled_model.predict(warmup_frame), warmup_predictions, rtol=rtol, atol=atol)
+        rows_ok = all(np.isclose(compiled_model.predict_one(record), expected, rtol=rtol, atol=atol)
+                      for record, expected in zip(warmup_frame.to_dict('records'), warmup_predictions))
+        if not (batch_ok and rows_ok):
+            logger.app_logger.warning("Compiled model %s disagrees with the champion; serving the sklearn model.",
+                                      self.compiled_path)
+            return None
+        return compiled_model
+    #----------------------------------------------------------------
+    def _reload(self):
+        try:
+            logger.app_logger.info("Hot reload started for %s", self.model_path)
+            artifacts = self._load_and_warm()
+            previous, self._current = self._current, artifacts     # atomic reference swap
+            self.reload_count += 1
+            self.last_error = None
+            logger.app_logger.info("Hot reload complete: champion %s -> %s", previous.version, artifacts.version)
+        except Exception as e:
+            self.last_error = str(e)
+            logger.app_logger.error("Hot reload failed, still serving the previous champion: %s", e)
+        finally:
+            self._reload_lock.release()
+    #----------------------------------------------------------------
+    def reload(self, wait: bool = False) -> bool:
+        """
+        Starts a background reload. Returns False if one is already running.
+        wait=True blocks until the new bundle is live (or the reload failed).
+        """
+        if not self._reload_lock.acquire(blocking=False):
+            return False
+        self._reload_thread = threading.Thread(target=self._reload, name="model-reload", daemon=True)
+        self._reload_thread.start()
+        if wait:
+            self._reload_thread.join()
+        return True
+    #----------------------------------------------------------------
+    def _artifact_signature(self):
+        return tuple(path.stat().st_mtime_ns if path.exists() else None
+                     for path in (self.preprocessor_path, self.model_path, self.compiled_path) if path is not None)
+    #----------------------------------------------------------------
+    def start_watcher(self, interval_seconds: float = constants.MODEL_WATCH_INTERVAL_SECONDS):
+        """
+        Polls the artifact files and reloads once a change has been stable for one
+        interval, so a champion still being written is never picked up.
+        """
+        if interval_seconds <= 0 or self._watcher_thread is not None:
+            return
+        def watch():
+            served, pending = self._artifact_signature(), None
+            while not self._stop_watcher.wait(interval_seconds):
+                signature = self._artifact_signature()
+                if signature == served:
+                    pending = None
+                elif signature == pending and self.reload():
+                    served, pending = signature, None
+                else:
+                    pending = signature
+        self._watcher_thread = threading.Thread(target=watch, name="model-watcher", daemon=True)
+        self._watcher_thread.start()
+        logger.app_logger.info("Model watcher polling every %.1fs", interval_seconds)
+    #----------------------------------------------------------------
+    def stop_watcher(self):
+        self._stop_watcher.set()
+    #----------------------------------------------------------------
+    def status(self) -> dict:
+        artifacts = self._current
+        return {
+            "version": artifacts.version,
+            "model": type(artifacts.model).__name__,
+            "loaded_at": artifacts.loaded_at,
+            "prediction_table": artifacts.prediction_table is not None,
+            "compiled": artifacts.compiled_model is not None,
+            "reloading": self._reload_lock.locked(),
+            "reload_count": self.reload_count,
+            "last_error": self.last_error,
+        }
@@ -0,0 +1,156 @@
+"""
+Module for coalescing concurrent single-row prediction requests into micro-batches.
+Requests arriving within a short window (max_wait_ms) or until max_batch_rows are
+gathered, scored with one batched transform + predict call, and the results are
+fanned back to the waiting callers.
+"""
+import sys
+import time
+import queue
+import bisect
+import threading
+from concurrent.futures import Future
+import pandas as pd
+#------------------------------------------------------------------
+# Import custom exception, logger and constants
+#------------------------------------------------------------------
+import src.myproject.exception as exception
+import src.myproject.logger as logger
+import src.myproject.constants as constants
+import src.myproject.metrics as metrics
+#------------------------------------------------------------------
+# Fixed histogram buckets (upper bounds) for batch sizes and queueing delay
+#------------------------------------------------------------------
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256)
+QUEUE_DELAY_BUCKETS_MS = (0.5, 1, 2, 5, 10, 25, 50, 100)
+#------------------------------------------------------------------
+# Request Coalescer Class
+#------------------------------------------------------------------
+class RequestCoalescer:
+    def __init__(self, predict_batch_fn,
+                 max_batch_rows: int = constants.PREDICT_COALESCE_MAX_BATCH_ROWS,
+                 max_wait_ms: float = constants.PREDICT_COALESCE_MAX_WAIT_MS):
+        """
+        predict_batch_fn: callable taking a DataFrame of records and returning one prediction per row.
+        max_batch_rows: a batch is flushed as soon as it holds this many rows.
+        max_wait_ms: a batch is flushed this long after its first request arrived.
+        """
+        self.predict_batch_fn = predict_batch_fn
+        self.max_batch_rows = max(1, int(max_batch_rows))
+        self.max_wait_seconds = max(0.0, float(max_wait_ms)) / 1000.0
+        self._queue = queue.Queue()
+        self._stats_lock = threading.Lock()
+        self._reset_stats()
+        self._stopped = threading.Event()
+        self._worker = threading.Thread(target=self._run, name="prediction-coalescer", daemon=True)
+        self._worker.start()
+        logger.app_logger.info("Request coalescer started (max_batch_rows=%d, max_wait_ms=%.2f)",
+                               self.max_batch_rows, self.max_wait_seconds * 1000)
+    #----------------------------------------------------------------
+    def submit(self, record: dict) -> Future:
+        """Queues one {column: value} record and returns a Future for its prediction."""
+        if self._stopped.is_set():
+            raise RuntimeError("RequestCoalescer has been shut down")
+        future = Future()
+        self._queue.put((record, future, time.monotonic()))
+        return future
+    #----------------------------------------------------------------
+    def predict(self, record: dict, timeout: float | None = None) -> float:
+        """Blocking helper: submits one record and waits for its prediction."""
+        return self.submit(record).result(timeout=timeout)
+    #----------------------------------------------------------------
+    def shutdown(self, timeout: float | None = None):
+        """Stops the worker after it has flushed the requests already queued."""
+        self._stopped.set()
+        self._queue.put(None)
+        self._worker.join(timeout)
+    #----------------------------------------------------------------
+    def _collect_batch(self):
+        """Blocks for the first request, then gathers more until the window or row limit is hit."""
+        first = self._queue.get()
+        if first is None:
+            return []
+        batch = [first]
+        deadline = first[2] + self.max_wait_seconds
+        while len(batch) < self.max_batch_rows:
+            remaining = deadline - time.monotonic()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                self._queue.put(None)   # let the outer loop see the stop marker after this flush
+                break
+            batch.append(item)
+        return batch
+    #----------------------------------------------------------------
+    def _run(self):
+        """Worker loop: one batched transform + predict per collected batch."""
+        while True:
+            batch = self._collect_batch()
+            if not batch:
+                if self._stopped.is_set() and self._queue.empty():
+                    return
+                continue
+            started = time.monotonic()
+            records = [record for record, _, _ in batch]
+            futures = [future for _, future, _ in batch]
+            try:
+                predictions = self.predict_batch_fn(pd.DataFrame.from_records(records))
+                for future, prediction in zip(futures, predictions):
+                    future.set_result(float(prediction))
+            except Exception as e:
+                exc_type, exc_value, exc_traceback = sys.exc_info()
+                error = exception.CustomException(exc_type, exc_value, exc_traceback)
+                logger.app_logger.error("Coalesced batch of %d rows failed: %s", len(batch), error)
+                for future in futures:
+                    future.set_exception(error)
+            self._record_batch(batch, started, time.monotonic())
+    #----------------------------------------------------------------
+    # Metrics
+    #----------------------------------------------------------------
+    def _reset_stats(self):
+        self._batches = 0
+        self._rows = 0
+        self._batch_size_counts = [0] * (len(BATCH_SIZE_BUCKETS) + 1)
+        self._queue_delay_counts = [0] * (len(QUEUE_DELAY_BUCKETS_MS) + 1)
+        self._queue_delay_sum_ms = 0.0
+        self._queue_delay_max_ms = 0.0
+        self._batch_seconds_sum = 0.0
+    #----------------------------------------------------------------
+    def _record_batch(self, batch, started: float, finished: float):
+        delays_ms = [(started - enqueued) * 1000.0 for _, _, enqueued in batch]
+        metrics.batch_size.observe(len(batch), endpoint='coalescer')
+        for delay in delays_ms:
+            metrics.queue_delay.observe(delay / 1000.0)
+        with self._stats_lock:
+            self._batches += 1
+            self._rows += len(batch)
+            self._batch_size_counts[bisect.bisect_left(BATCH_SIZE_BUCKETS, len(batch))] += 1
+            for delay in delays_ms:
+                self._queue_delay_counts[bisect.bisect_left(QUEUE_DELAY_BUCKETS_MS, delay)] += 1
+            self._queue_delay_sum_ms += sum(delays_ms)
+            self._queue_delay_max_ms = max(self._queue_delay_max_ms, max(delays_ms))
+            self._batch_seconds_sum += finished - started
+    #----------------------------------------------------------------
+    def stats(self, reset: bool = False) -> dict:
+        """Returns batch-size and queueing-delay metrics; optionally resets them."""
+        with self._stats_lock:
+            labels = [f"le_{bound}" for bound in BATCH_SIZE_BUCKETS] + ["gt_max"]
+            delay_labels = [f"le_{bound}ms" for bound in QUEUE_DELAY_BUCKETS_MS] + ["gt_max"]
+            stats = {
+                "max_batch_rows": self.max_batch_rows,
+                "max_wait_ms": self.max_wait_seconds * 1000.0,
+                "batches": self._batches,
+                "rows": self._rows,
+                "mean_batch_size": self._rows / self._batches if self._batches else 0.0,
+                "batch_size_histogram": dict(zip(labels, self._batch_size_counts)),
+                "mean_queue_delay_ms": self._queue_delay_sum_ms / self._rows if self._rows else 0.0,
+                "max_queue_delay_ms": self._queue_delay_max_ms,
+                "queue_delay_histogram": dict(zip(delay_labels, self._queue_delay_counts)),
+                "mean_batch_latency_ms": self._batch_seconds_sum * 1000.0 / self._batches if self._batches else 0.0,
+                "queued": self._queue.qsize(),
+            }
+            if reset:
+                self._reset_stats()
+            return stats
@@ -0,0 +1,83 @@
+"""
+Module for pandas-free single-row encoding in the serving path.
+Reads the fitted OneHotEncoder categories, imputer statistics and StandardScaler
+parameters out of the preprocessor once, then turns a validated {column: value}
+record straight into a NumPy row, producing the same numbers as
+ColumnTransformer.transform without building a DataFrame per request.
+A float32 preprocessor is reproduced exactly too, including where sklearn rounds to float32.
+"""
+import sys
+import numpy as np
+from sklearn.compose import ColumnTransformer
+#------------------------------------------------------------------
+# Import custom exception and helpers
+#------------------------------------------------------------------
+import src.myproject.utils as utils
+import src.myproject.exception as exception
+#------------------------------------------------------------------
+def _is_missing(value) -> bool:
+    """Numeric columns: None and NaN both become NaN and take the imputer statistic."""
+    return value is None or value != value
+#------------------------------------------------------------------
+# Row Encoder Class
+#------------------------------------------------------------------
+class PreprocessorRowEncoder:
+    def __init__(self, preprocessor: ColumnTransformer):
+        """Extracts the fitted encoding tables from a ColumnTransformer built by utils.create_data_transformation_object."""
+        try:
+            self.feature_names = list(preprocessor.get_feature_names_out())
+            self.dtype = utils.get_preprocessor_float_dtype(preprocessor)
+            self._float32 = self.dtype == np.float32
+            self._template = np.zeros((1, len(self.feature_names)), dtype=self.dtype)
+            self._categorical = []   # (column, {level: output index}, fill level)
+            self._numerical = []     # (column, output index, fill, mean, scale)
+            for name, transformer, columns in preprocessor.transformers_:
+                if name == 'remainder':
+                    continue
+                start = preprocessor.output_indices_[name].start
+                if name == 'cat':
+                    imputer, onehot = transformer.named_steps['imputer'], transformer.named_steps['onehot']
+                    if onehot.drop is not None:
+                        raise ValueError("OneHotEncoder with drop is not supported by the row encoder")
+                    for col, levels, fill in zip(columns, onehot.categories_, imputer.statistics_):
+                        self._categorical.append((col, {level: start + i for i, level in enumerate(levels)}, fill))
+                        start += len(levels)
+                elif name == 'num':
+                    imputer, scaler = transformer.named_steps['imputer'], transformer.named_steps['scaler']
+                    means = scaler.mean_ if scaler.mean_ is not None else np.zeros(len(columns))
+                    scales = scaler.scale_ if scaler.scale_ is not None else np.ones(len(columns))
+                    for i, col in enumerate(columns):
+                        fill = float(np.float32(imputer.statistics_[i])) if self._float32 else float(imputer.statistics_[i])
+                        self._numerical.append((col, start + i, fill, float(means[i]), float(scales[i])))
+                else:
+                    raise ValueError(f"Unsupported transformer '{name}' in preprocessor")
+        except Exception as e:
+            exc_type, exc_value, exc_traceback = sys.exc_info()
+            raise exception.CustomException(exc_type, exc_value, exc_traceback) from e
+    #----------------------------------------------------------------
+    def encode(self, record: dict) -> np.ndarray:
+        """
+        Encodes one record into a (1, n_features) row of the preprocessor's float dtype.
+        Unknown levels encode as all zeros (handle_unknown='ignore'); missing values
+        take the fitted imputer statistic, except None in a categorical column, which
+        SimpleImputer keeps and the encoder treats as an unknown level.
+        """
+        row = self._template.copy()
+        values = row[0]
+        for col, level_index, fill in self._categorical:
+            value = record.get(col)
+            index = level_index.get(fill if value != value else value)
+            if index is not None:
+                values[index] = 1.0
+        for col, index, fill, mean, scale in self._numerical:
+            value = record.get(col)
+            value = fill if _is_missing(value) else float(value)
+            if self._float32:
+                #----------------------------------------------------------------
+                # StandardScaler on float32 input: X -= mean_; X /= scale_, rounding to float32 after each step
+                #----------------------------------------------------------------
+                centered = float(np.float32(float(np.float32(value)) - mean))
+                values[index] = centered / scale
+            else:
+                values[index] = (value - mean) / scale
+        return row
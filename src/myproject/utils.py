@@ -3,13 +3,25 @@ Utility Functions Module for the Application
 This module provides utility functions used across the application,
 such as ensuring the existence of directories.
 """
+import io
 import os
+import functools
 import sys
+import bz2
+import gzip
+import json
+import hashlib
+import lzma
+import time
+import pickle
+import numpy as np
 import pandas as pd
 from pathlib import Path
+from joblib import Parallel, delayed, effective_n_jobs
 from sklearn import set_config
 from sklearn.pipeline import Pipeline
 from sklearn.impute import SimpleImputer
+from sklearn.preprocessing import FunctionTransformer
 from sklearn.compose import ColumnTransformer
 from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import StandardScaler, OneHotEncoder
@@ -82,6 +94,34 @@ def train_valid_test_split_data(self, X, y, test_size=test_size, random_state=ra
         exc_type, exc_value, exc_traceback = sys.exc_info()
         raise exception.CustomException(exc_type, exc_value, exc_traceback) from e
 #--------------------------------------------------------------------
+# Row Selection by Position
+#--------------------------------------------------------------------
+def take_rows(data, indices):
+    """Row selection that works for DataFrames, Series and NumPy arrays."""
+    return data.iloc[indices] if isinstance(data, (pd.DataFrame, pd.Series)) else data[indices]
+#--------------------------------------------------------------------
+# Floating-point Precision of the Numeric Pipeline
+#--------------------------------------------------------------------
+def get_float_dtype(precision: str = constants.FLOAT_PRECISION) -> np.dtype:
+    """Maps the FLOAT_PRECISION setting ("float64" or "float32") to a NumPy dtype."""
+    if precision not in ("float64", "float32"):
+        raise ValueError(f"FLOAT_PRECISION must be 'float64' or 'float32', got {precision!r}")
+    return np.dtype(precision)
+#--------------------------------------------------------------------
+def cast_numeric_features(df: pd.DataFrame, dtype=np.float64) -> pd.DataFrame:
+    """Returns df with every numeric (non-boolean) column cast to the given float dtype."""
+    numeric_cols = [col for col in df.select_dtypes(include=['number']).columns if df[col].dtype != dtype]
+    if not numeric_cols:
+        return df
+    return df.astype({col: dtype for col in numeric_cols})
+#--------------------------------------------------------------------
+def get_preprocessor_float_dtype(preprocessor: ColumnTransformer) -> np.dtype:
+    """The float dtype a fitted preprocessor from create_data_transformation_object emits."""
+    for name, transformer, _ in getattr(preprocessor, 'transformers_', preprocessor.transformers):
+        if name == 'cat':
+            return np.dtype(transformer.named_steps['onehot'].dtype)
+    return np.dtype(np.float64)
+#--------------------------------------------------------------------
 # List Dataframe Columns by Type
 #--------------------------------------------------------------------
 def list_dataframe_columns_by_type(df: pd.DataFrame):
@@ -104,9 +144,11 @@ def list_dataframe_columns_by_type(df: pd.DataFrame):
 #--------------------------------------------------------------------
 # Perform Data Transformation Pipelines
 #--------------------------------------------------------------------
-def create_data_transformation_object(numerical_features, categorical_features) -> ColumnTransformer:
+def create_data_transformation_object(numerical_features, categorical_features, dtype=np.float64) -> ColumnTransformer:
     """
     Creates and returns data transformation pipelines for numerical and categorical features.
+    dtype: float dtype of every output column; float32 adds a leading cast so the imputer and
+           scaler also run in float32 whatever the input dtype is.
     """
     try:
         # logger.app_logger.info("Creating Numerical and Categorical data transformation pipelines...")
@@ -115,15 +157,19 @@ def create_data_transformation_object(numerical_features, categorical_features)
         #----------------------------------------------------------------
         set_config(transform_output="pandas") # Ensures output is a DataFrame
         #----------------------------------------------------------------
-        numerical_transformer = Pipeline(steps=[
+        numerical_steps = [
             ('imputer', SimpleImputer(strategy='median')),
             ('scaler', StandardScaler())
-        ])
+        ]
+        if np.dtype(dtype) != np.float64:
+            numerical_steps.insert(0, ('cast', FunctionTransformer(np.asarray, kw_args={'dtype': np.dtype(dtype).name},
+                                                                   feature_names_out='one-to-one')))
+        numerical_transformer = Pipeline(steps=numerical_steps)
         #----------------------------------------------------------------
         categorical_transformer = Pipeline(steps=[
             ('imputer', SimpleImputer(strategy='most_frequent')),
             # Standard: Set sparse_output=False to enable Pandas DataFrame output
-            ('onehot', OneHotEncoder(handle_unknown='ignore', sparse_output=False))
+            ('onehot', OneHotEncoder(handle_unknown='ignore', sparse_output=False, dtype=np.dtype(dtype).type))
         ])
         #----------------------------------------------------------------
         # Combine transformers into a ColumnTransformer
@@ -144,6 +190,555 @@ def create_data_transformation_object(numerical_features, categorical_features)
     except Exception as ce:
         exc_type, exc_value, exc_traceback = sys.exc_info()
         raise exception.CustomException(exc_type, exc_value, exc_traceback) from ce
+#--------------------------------------------------------------------
+# Read the Input Schema back out of a Fitted Preprocessor
+#--------------------------------------------------------------------
+def get_preprocessor_schema(preprocessor: ColumnTransformer):
+    """
+    Returns the numerical column names and a {column: [levels]} mapping of the
+    categorical columns a fitted ColumnTransformer expects as input.
+    """
+    try:
+        numerical_cols, categorical_levels = [], {}
+        for name, transformer, columns in preprocessor.transformers_:
+            if name == 'num':
+                numerical_cols.extend(columns)
+            elif name == 'cat':
+                onehot = transformer.named_steps['onehot']
+                for column, levels in zip(columns, onehot.categories_):
+                    categorical_levels[column] = levels.tolist()
+        return numerical_cols, categorical_levels
+    except Exception as e:
+        exc_type, exc_value, exc_traceback = sys.exc_info()
+        raise exception.CustomException(exc_type, exc_value, exc_traceback) from e
+#--------------------------------------------------------------------
+# Validate a Batch of Prediction Records in One Vectorized Pass
+#--------------------------------------------------------------------
+def validate_prediction_records(df: pd.DataFrame, preprocessor: ColumnTransformer, max_errors: int = 50):
+    """
+    Validates a DataFrame of prediction records against the fitted preprocessor.
+    Returns the cleaned DataFrame (expected columns only, numeric columns coerced)
+    and a list of error messages; the list is empty when every record is valid.
+    """
+    numerical_cols, categorical_levels = get_preprocessor_schema(preprocessor)
+    expected_cols = list(categorical_levels) + numerical_cols
+    #----------------------------------------------------
+    # Missing columns make the whole batch unusable
+    #----------------------------------------------------
+    missing_cols = [col for col in expected_cols if col not in df.columns]
+    if missing_cols:
+        return df, [f"Missing required columns: {missing_cols}"]
+    #----------------------------------------------------
+    # Column-wise checks; one boolean mask per column instead of per row
+    #----------------------------------------------------
+    clean_df = df[expected_cols].copy()
+    errors = []
+    for col, levels in categorical_levels.items():
+        invalid = ~clean_df[col].isin(levels)
+        for idx in clean_df.index[invalid][:max_errors]:
+            errors.append(f"Row {idx}: invalid value {clean_df.at[idx, col]!r} for '{col}', expected one of {levels}")
+    for col in numerical_cols:
+        coerced = pd.to_numeric(clean_df[col], errors='coerce')
+        invalid = coerced.isna()
+        for idx in clean_df.index[invalid][:max_errors]:
+            errors.append(f"Row {idx}: '{col}' must be numeric, got {clean_df.at[idx, col]!r}")
+        clean_df[col] = coerced.astype(float)
+
+    return clean_df, errors[:max_errors]
+#--------------------------------------------------------------------
+# Processed Data Artifacts: Parquet / Feather / Pickle, CSV as optional export
+#--------------------------------------------------------------------
+ARTIFACT_EXTENSIONS = {"parquet": ".parquet", "feather": ".feather", "pickle": ".pkl", "csv": ".csv"}
+DEFAULT_ARTIFACT_COMPRESSION = {"parquet": "snappy", "feather": "lz4", "pickle": None, "csv": None}
+#--------------------------------------------------------------------
+@functools.lru_cache(maxsize=None)
+def _auto_artifact_format() -> str:
+    """parquet when pyarrow is installed, else pickle; the fallback is logged once per process."""
+    try:
+        import pyarrow  # noqa: F401
+        return "parquet"
+    except ImportError:
+        import src.myproject.logger as logger   # imported here: the logger module imports utils
+        logger.app_logger.warning("ARTIFACT_FORMAT=auto: pyarrow is not installed, writing pickle artifacts "
+                                  "instead of parquet (pip install pyarrow, or set ARTIFACT_FORMAT explicitly).")
+        return "pickle"
+#--------------------------------------------------------------------
+def resolve_artifact_format(artifact_format: str = constants.ARTIFACT_FORMAT) -> str:
+    """
+    Validates the artifact format. "auto" picks parquet when pyarrow is installed
+    and falls back to pickle, which needs no extra dependency, with a warning.
+    """
+    artifact_format = artifact_format.lower()
+    if artifact_format == "auto":
+        return _auto_artifact_format()
+    if artifact_format not in ARTIFACT_EXTENSIONS:
+        raise ValueError(f"ARTIFACT_FORMAT must be 'auto' or one of {sorted(ARTIFACT_EXTENSIONS)}, got {artifact_format!r}")
+    return artifact_format
+#--------------------------------------------------------------------
+def artifact_path(file_path, artifact_format: str = constants.ARTIFACT_FORMAT) -> Path:
+    """The configured (CSV) path with the extension of the resolved artifact format."""
+    return Path(file_path).with_suffix(ARTIFACT_EXTENSIONS[resolve_artifact_format(artifact_format)])
+#--------------------------------------------------------------------
+def artifact_compression(artifact_format: str, compression: str = constants.ARTIFACT_COMPRESSION):
+    """Codec for the resolved format: "" means the format default, "none" means uncompressed."""
+    if not compression:
+        return DEFAULT_ARTIFACT_COMPRESSION[artifact_format]
+    return None if compression == "none" else compression
+#--------------------------------------------------------------------
+def to_typed_frame(data) -> pd.DataFrame:
+    """DataFrame (a Series becomes one column) with a fresh index and string columns stored as category."""
+    df = data.to_frame() if isinstance(data, pd.Series) else data.copy()
+    for col in df.select_dtypes(include=['object', 'string']).columns:
+        df[col] = df[col].astype('category')
+    return df.reset_index(drop=True)
+#--------------------------------------------------------------------
+def save_data_artifact(data, file_path, artifact_format: str = constants.ARTIFACT_FORMAT,
+                       compression: str = constants.ARTIFACT_COMPRESSION,
+                       csv_export: bool = constants.ARTIFACT_CSV_EXPORT) -> Path:
+    """
+    Writes a DataFrame or Series in the configured binary format next to file_path
+    (the CSV path), with typed categorical columns and compression, and optionally
+    exports the CSV as well. The write goes to a temporary file and is renamed into place.
+    compression: "" uses the format default, "none" writes uncompressed.
+    """
+    try:
+        artifact_format = resolve_artifact_format(artifact_format)
+        target_path = artifact_path(file_path, artifact_format)
+        ensure_directory_exists(target_path.parent)
+        codec = artifact_compression(artifact_format, compression)
+        temp_path = target_path.with_name(target_path.name + ".tmp")
+        if artifact_format == "csv":
+            data.to_csv(temp_path, index=False, header=True, encoding='utf-8', compression=codec)
+        else:
+            df = to_typed_frame(data)
+            if artifact_format == "parquet":
+                df.to_parquet(temp_path, index=False, compression=codec)
+            elif artifact_format == "feather":
+                df.to_feather(temp_path, compression=codec or "uncompressed")
+            else:
+                df.to_pickle(temp_path, compression=codec)
+        os.replace(temp_path, target_path)
+        if csv_export and artifact_format != "csv":
+            data.to_csv(file_path, index=False, header=True, encoding='utf-8')
+        return target_path
+    except Exception as e:
+        exc_type, exc_value, exc_traceback = sys.exc_info()
+        raise exception.CustomException(exc_type, exc_value, exc_traceback) from e
+#--------------------------------------------------------------------
+def load_data_artifact(file_path, artifact_format: str = constants.ARTIFACT_FORMAT,
+                       compression: str = constants.ARTIFACT_COMPRESSION, series: bool = False):
+    """
+    Reads an artifact written by save_data_artifact, given the same (CSV) path and settings.
+    series: return the single column as a Series (for y files).
+    """
+    try:
+        artifact_format = resolve_artifact_format(artifact_format)
+        source_path = artifact_path(file_path, artifact_format)
+        if artifact_format == "parquet":
+            df = pd.read_parquet(source_path)
+        elif artifact_format == "feather":
+            df = pd.read_feather(source_path)
+        elif artifact_format == "pickle":
+            df = read_pickle_frames(source_path, artifact_compression(artifact_format, compression))
+        else:
+            df = pd.read_csv(source_path, compression=artifact_compression(artifact_format, compression))
+        return df.iloc[:, 0] if series else df
+    except Exception as e:
+        exc_type, exc_value, exc_traceback = sys.exc_info()
+        raise exception.CustomException(exc_type, exc_value, exc_traceback) from e
+#--------------------------------------------------------------------
+# Chunked (Out-of-core) Ingestion: dtype schema and incremental artifact writer
+#--------------------------------------------------------------------
+COMPRESSED_OPENERS = {None: open, "gzip": gzip.open, "bz2": bz2.open, "xz": lzma.open}
+#--------------------------------------------------------------------
+def open_compressed(file_path, mode: str, codec=None):
+    """Opens file_path through the stdlib codec ("gzip", "bz2", "xz" or None); text modes use utf-8."""
+    if codec not in COMPRESSED_OPENERS:
+        raise ValueError(f"Chunked writes support compression {sorted(c for c in COMPRESSED_OPENERS if c)} or none, got {codec!r}")
+    if "b" in mode:
+        return COMPRESSED_OPENERS[codec](file_path, mode)
+    return COMPRESSED_OPENERS[codec](file_path, mode, encoding='utf-8', newline='')
+#--------------------------------------------------------------------
+def read_pickle_frames(file_path, codec=None) -> pd.DataFrame:
+    """
+    Reads a pickle artifact: the single frame from save_data_artifact, or the concatenation
+    of the per-chunk frames from ChunkedArtifactWriter (category columns stay category).
+    """
+    if codec not in COMPRESSED_OPENERS:
+        return pd.read_pickle(file_path, compression=codec)
+    frames = []
+    with open_compressed(file_path, "rb", codec) as file:
+        while True:
+            try:
+                frames.append(pickle.load(file))
+            except EOFError:
+                break
+    if len(frames) == 1:
+        return frames[0]
+    categorical = [col for col, dtype in frames[0].dtypes.items() if isinstance(dtype, pd.CategoricalDtype)]
+    df = pd.concat(frames, ignore_index=True)
+    return df.astype({col: 'category' for col in categorical}) if categorical else df
+#--------------------------------------------------------------------
+def dtype_schema_from_sample(sample: pd.DataFrame, target_column: str, float_dtype=np.float64) -> dict:
+    """
+    Column -> dtype name for chunked reads, inferred from a sample of the rows.
+    Numeric features become float_dtype and a numeric target float64, so a missing value
+    in a later chunk cannot break an integer column; booleans stay bool and every other
+    column is read as category.
+    """
+    schema = {}
+    for col, dtype in sample.dtypes.items():
+        if pd.api.types.is_bool_dtype(dtype):
+            schema[col] = "bool"
+        elif pd.api.types.is_numeric_dtype(dtype):
+            schema[col] = "float64" if col == target_column else np.dtype(float_dtype).name
+        else:
+            schema[col] = "category"
+    return schema
+#--------------------------------------------------------------------
+def infer_dtype_schema(file_path, target_column: str, sample_rows: int = constants.INGESTION_SCHEMA_SAMPLE_ROWS,
+                       float_dtype=np.float64) -> dict:
+    """dtype_schema_from_sample over the first sample_rows rows of a CSV file."""
+    return dtype_schema_from_sample(pd.read_csv(file_path, nrows=sample_rows), target_column, float_dtype)
+#--------------------------------------------------------------------
+def resolve_dtype_schema(file_path, schema_path, target_column: str,
+                         sample_rows: int = constants.INGESTION_SCHEMA_SAMPLE_ROWS, float_dtype=np.float64,
+                         sample: pd.DataFrame | None = None) -> dict:
+    """
+    The explicit dtype schema for file_path: schema_path when it exists and lists exactly the
+    file's columns, otherwise one inferred from a sample and saved to schema_path for later runs.
+    A source that is not a CSV file (e.g. a database query) passes its first rows as sample;
+    file_path then only names the source in messages.
+    """
+    try:
+        schema_path = Path(schema_path)
+        header = (sample if sample is not None else pd.read_csv(file_path, nrows=0)).columns.tolist()
+        if schema_path.exists():
+            with open(schema_path, encoding='utf-8') as file:
+                schema = json.load(file)
+            if list(schema) == header:
+                return schema
+            import src.myproject.logger as logger   # imported here: the logger module imports utils
+            logger.app_logger.warning("Ignoring dtype schema %s: its columns do not match %s", schema_path, file_path)
+        if sample is not None:
+            schema = dtype_schema_from_sample(sample, target_column, float_dtype)
+        else:
+            schema = infer_dtype_schema(file_path, target_column, sample_rows, float_dtype)
+        ensure_directory_exists(schema_path.parent)
+        with open(schema_path, 'w', encoding='utf-8') as file:
+            json.dump(schema, file, indent=2)
+        return schema
+    except Exception as e:
+        exc_type, exc_value, exc_traceback = sys.exc_info()
+        raise exception.CustomException(exc_type, exc_value, exc_traceback) from e
+#--------------------------------------------------------------------
+def read_csv_chunks(file_path, schema: dict, chunk_size: int):
+    """Yields DataFrames of at most chunk_size rows, every column read with its schema dtype."""
+    with pd.read_csv(file_path, dtype=schema, chunksize=chunk_size) as reader:
+        yield from reader
+#--------------------------------------------------------------------
+# Multi-file Raw Directories: shards parsed in parallel worker processes
+#--------------------------------------------------------------------
+def list_raw_files(raw_dir, pattern: str) -> list:
+    """Files under raw_dir matching the glob pattern, sorted by path so daily shards keep their order."""
+    files = sorted(path for path in Path(raw_dir).glob(pattern) if path.is_file())
+    if not files:
+        raise FileNotFoundError(f"No raw files match {pattern!r} under {raw_dir}")
+    return files
+#--------------------------------------------------------------------
+def parse_csv_file(file_path, schema: dict):
+    """
+    Worker for read_csv_files: one raw file read with the shared dtype schema.
+    Returns (DataFrame, stats) with the file's rows, bytes, parse seconds and worker pid.
+    """
+    started = time.perf_counter()
+    df = pd.read_csv(file_path, dtype=schema)
+    if list(df.columns) != list(schema):
+        raise ValueError(f"Columns of {file_path} do not match the dtype schema: {list(df.columns)}")
+    return df, {"file": str(file_path), "rows": len(df), "bytes": os.path.getsize(file_path),
+                "seconds": time.perf_counter() - started, "pid": os.getpid()}
+#--------------------------------------------------------------------
+def read_csv_files(file_paths, schema: dict, n_jobs: int = -1):
+    """
+    Yields parse_csv_file results in file order while up to n_jobs worker processes (-1 = all
+    cores, 1 = serial) parse the following files; at most 2 * n_jobs files are in flight.
+    """
+    n_jobs = max(1, min(effective_n_jobs(n_jobs), len(file_paths)))
+    parallel = Parallel(n_jobs=n_jobs, return_as="generator", pre_dispatch="2*n_jobs")
+    yield from parallel(delayed(parse_csv_file)(path, schema) for path in file_paths)
+#--------------------------------------------------------------------
+class ChunkedArtifactWriter:
+    """
+    Appends DataFrame/Series chunks to one processed artifact (readable with load_data_artifact),
+    so the full dataset never has to be held in memory. csv and pickle stream through the stdlib
+    codecs; parquet and feather stream record batches through pyarrow. Chunks go to a temporary
+    file that is renamed into place when the writer closes without an error.
+    """
+    def __init__(self, file_path, artifact_format: str = constants.ARTIFACT_FORMAT,
+                 compression: str = constants.ARTIFACT_COMPRESSION,
+                 csv_export: bool = constants.ARTIFACT_CSV_EXPORT):
+        self.artifact_format = resolve_artifact_format(artifact_format)
+        self.target_path = artifact_path(file_path, self.artifact_format)
+        self.temp_path = self.target_path.with_name(self.target_path.name + ".tmp")
+        self.export_path = Path(file_path) if csv_export and self.artifact_format != "csv" else None
+        self.codec = artifact_compression(self.artifact_format, compression)
+        self.rows = 0
+        self._handle = None
+        self._export = None
+        self._arrow_writer = None
+        self._arrow_schema = None
+        ensure_directory_exists(self.target_path.parent)
+    #----------------------------------------------------------------
+    def __enter__(self):
+        return self
+    #----------------------------------------------------------------
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+        return False
+    #----------------------------------------------------------------
+    def write(self, data):
+        df = data.to_frame() if isinstance(data, pd.Series) else data
+        if self.artifact_format == "csv":
+            if self._handle is None:
+                self._handle = open_compressed(self.temp_path, "wt", self.codec)
+            df.to_csv(self._handle, index=False, header=self.rows == 0)
+        elif self.artifact_format == "pickle":
+            if self._handle is None:
+                self._handle = open_compressed(self.temp_path, "wb", self.codec)
+            pickle.dump(to_typed_frame(df), self._handle, protocol=pickle.HIGHEST_PROTOCOL)
+        else:
+            self._write_arrow(df)
+        if self.export_path is not None:
+            if self._export is None:
+                self._export = open_compressed(self.export_path, "wt")
+            df.to_csv(self._export, index=False, header=self.rows == 0)
+        self.rows += len(df)
+    #----------------------------------------------------------------
+    def _write_arrow(self, df: pd.DataFrame):
+        import pyarrow as pa
+        df = df.reset_index(drop=True)
+        if self._arrow_writer is None:
+            #----------------------------------------------------------------
+            # Fix the schema on the first chunk. Parquet keeps string columns dictionary-encoded
+            # (read back as category); the Feather/IPC file format cannot change dictionaries
+            # between batches, so there they are plain strings. A categorical takes the type
+            # of its categories, so later chunks may bring categories the first one lacked.
+            #----------------------------------------------------------------
+            text_type = pa.dictionary(pa.int32(), pa.string()) if self.artifact_format == "parquet" else pa.string()
+            def arrow_type(dtype):
+                if isinstance(dtype, pd.CategoricalDtype):
+                    dtype = dtype.categories.dtype
+                return text_type if pd.api.types.is_string_dtype(dtype) else pa.from_numpy_dtype(dtype)
+            self._arrow_schema = pa.schema([pa.field(str(col), arrow_type(dtype)) for col, dtype in df.dtypes.items()])
+            if self.artifact_format == "parquet":
+                import pyarrow.parquet as pq
+                self._arrow_writer = pq.ParquetWriter(self.temp_path, self._arrow_schema, compression=self.codec or "none")
+            else:
+                import pyarrow.ipc
+                self._arrow_writer = pa.ipc.new_file(str(self.temp_path), self._arrow_schema,
+                                                     options=pa.ipc.IpcWriteOptions(compression=self.codec))
+        #----------------------------------------------------------------
+        # Categoricals of numbers are written as their plain values
+        #----------------------------------------------------------------
+        df = df.astype({col: object for col, dtype in df.dtypes.items()
+                        if isinstance(dtype, pd.CategoricalDtype) and not pd.api.types.is_string_dtype(dtype.categories.dtype)})
+        self._arrow_writer.write_table(pa.Table.from_pandas(df, schema=self._arrow_schema, preserve_index=False))
+    #----------------------------------------------------------------
+    def _close_handles(self):
+        for handle in (self._handle, self._export, self._arrow_writer):
+            if handle is not None:
+                handle.close()
+        self._handle = self._export = self._arrow_writer = None
+    #----------------------------------------------------------------
+    def close(self) -> Path:
+        """Finishes the file and renames it into place; returns the artifact path."""
+        try:
+            self._close_handles()
+            os.replace(self.temp_path, self.target_path)
+            return self.target_path
+        except Exception as e:
+            exc_type, exc_value, exc_traceback = sys.exc_info()
+            raise exception.CustomException(exc_type, exc_value, exc_traceback) from e
+    #----------------------------------------------------------------
+    def abort(self):
+        """Drops the partial file, leaving any previous artifact untouched."""
+        self._close_handles()
+        self.temp_path.unlink(missing_ok=True)
+#--------------------------------------------------------------------
+# Incremental Ingestion: delta reads and in-place appends
+#--------------------------------------------------------------------
+def read_csv_delta(file_path, byte_offset: int, schema: dict | None = None):
+    """
+    Rows appended to a CSV after byte_offset, parsed with the file's own header and the dtype
+    schema (byte_offset 0 reads every row). Rows must be appended as whole lines.
+    Returns (DataFrame, byte offset of the end of the file).
+    """
+    try:
+        with open(file_path, 'rb') as file:
+            header = file.readline()
+            start = max(byte_offset, len(header))
+            file.seek(start)
+            delta = file.read()
+        return pd.read_csv(io.BytesIO(header + delta), dtype=schema), start + len(delta)
+    except Exception as e:
+        exc_type, exc_value, exc_traceback = sys.exc_info()
+        raise exception.CustomException(exc_type, exc_value, exc_traceback) from e
+#--------------------------------------------------------------------
+def file_range_digest(file_path, start: int, end: int, digest=None, chunk_size: int = 1 << 20):
+    """
+    Feeds bytes [start, end) of file_path into digest (a new SHA-256 by default) chunk_size
+    bytes at a time and returns it, so a prefix digest can be extended with appended bytes.
+    """
+    digest = hashlib.sha256() if digest is None else digest
+    with open(file_path, 'rb') as file:
+        file.seek(start)
+        remaining = end - start
+        while remaining > 0:
+            block = file.read(min(chunk_size, remaining))
+            if not block:
+                break
+            digest.update(block)
+            remaining -= len(block)
+    return digest
+#--------------------------------------------------------------------
+def appends_in_place(artifact_format: str = constants.ARTIFACT_FORMAT,
+                     compression: str = constants.ARTIFACT_COMPRESSION) -> bool:
+    """Whether append_data_artifact adds rows to the file as is instead of rewriting it."""
+    artifact_format = resolve_artifact_format(artifact_format)
+    return artifact_format in ("csv", "pickle") and artifact_compression(artifact_format, compression) in COMPRESSED_OPENERS
+#--------------------------------------------------------------------
+def append_data_artifact(data, file_path, artifact_format: str = constants.ARTIFACT_FORMAT,
+                         compression: str = constants.ARTIFACT_COMPRESSION,
+                         csv_export: bool = constants.ARTIFACT_CSV_EXPORT, existing=None) -> Path:
+    """
+    Appends rows to an artifact written by save_data_artifact or ChunkedArtifactWriter.
+    csv and pickle (stdlib codecs) append in place, so the cost follows the new rows;
+    parquet, feather and other codecs are read back and rewritten.
+    existing: the artifact's current rows when the caller already holds them (not read again).
+    """
+    try:
+        artifact_format = resolve_artifact_format(artifact_format)
+        target_path = artifact_path(file_path, artifact_format)
+        codec = artifact_compression(artifact_format, compression)
+        if not target_path.exists():
+            return save_data_artifact(data, file_path, artifact_format, compression, csv_export)
+        if appends_in_place(artifact_format, compression):
+            if artifact_format == "csv":
+                with open_compressed(target_path, "at", codec) as file:
+                    data.to_csv(file, index=False, header=False)
+            else:
+                with open_compressed(target_path, "ab", codec) as file:
+                    pickle.dump(to_typed_frame(data), file, protocol=pickle.HIGHEST_PROTOCOL)
+        else:
+            if existing is None:
+                existing = load_data_artifact(file_path, artifact_format, compression, series=isinstance(data, pd.Series))
+            save_data_artifact(pd.concat([existing, data], ignore_index=True), file_path,
+                               artifact_format, compression, csv_export=False)
+        if csv_export and artifact_format != "csv":
+            with open_compressed(file_path, "at") as file:
+                data.to_csv(file, index=False, header=not Path(file_path).stat().st_size)
+        return target_path
+    except Exception as e:
+        exc_type, exc_value, exc_traceback = sys.exc_info()
+        raise exception.CustomException(exc_type, exc_value, exc_traceback) from e
+#--------------------------------------------------------------------
+# Memory-mapped Matrices for Parallel Training Workers
+#--------------------------------------------------------------------
+def save_matrix_memmap(df: pd.DataFrame, file_path, fingerprint: str | None = None, dtype=np.float64):
+    """
+    Writes a numeric DataFrame as a C-contiguous .npy file that can be opened with
+    np.load(mmap_mode='r'), plus a <file>.json sidecar with the column names, shape,
+    dtype and an optional content fingerprint of the source DataFrame.
+    """
+    try:
+        file_path = Path(file_path)
+        ensure_directory_exists(file_path.parent)
+        temp_path = file_path.with_name(file_path.name + ".tmp")
+        matrix = np.lib.format.open_memmap(temp_path, mode='w+', dtype=dtype, shape=df.shape)
+        matrix[:] = df.to_numpy(dtype=dtype)
+        matrix.flush()
+        del matrix
+        os.replace(temp_path, file_path)
+        metadata = {"columns": [str(col) for col in df.columns], "shape": list(df.shape),
+                    "dtype": np.dtype(dtype).name, "fingerprint": fingerprint}
+        with open(file_path.with_name(file_path.name + ".json"), 'w', encoding='utf-8') as file:
+            json.dump(metadata, file)
+        return file_path
+    except Exception as e:
+        exc_type, exc_value, exc_traceback = sys.exc_info()
+        raise exception.CustomException(exc_type, exc_value, exc_traceback) from e
+#--------------------------------------------------------------------
+def append_matrix_memmap(df: pd.DataFrame, file_path, fingerprint: str | None = None, dtype=np.float64):
+    """
+    Appends rows to a matrix written by save_matrix_memmap: the new rows go after the data and
+    the .npy header is rewritten with the new shape in place (the whole file is rewritten only
+    if the longer shape no longer fits in the padded header). Updates the sidecar.
+    """
+    try:
+        file_path = Path(file_path)
+        rows = np.ascontiguousarray(df.to_numpy(dtype=dtype))
+        if not file_path.exists():
+            return save_matrix_memmap(df, file_path, fingerprint, dtype)
+        header_io = {(1, 0): (np.lib.format.read_array_header_1_0, np.lib.format.write_array_header_1_0),
+                     (2, 0): (np.lib.format.read_array_header_2_0, np.lib.format.write_array_header_2_0)}
+        with open(file_path, 'r+b') as file:
+            version = np.lib.format.read_magic(file)
+            if version not in header_io:
+                raise ValueError(f"Unsupported .npy format version {version} in {file_path}")
+            read_header, write_header = header_io[version]
+            shape, fortran_order, stored_dtype = read_header(file)
+            data_offset = file.tell()
+            if fortran_order or stored_dtype != rows.dtype or tuple(shape[1:]) != rows.shape[1:]:
+                raise ValueError(f"Cannot append {rows.dtype} rows of width {rows.shape[1:]} to {file_path}")
+            new_shape = (shape[0] + rows.shape[0],) + tuple(shape[1:])
+            header = io.BytesIO()
+            write_header(header, {"descr": np.lib.format.dtype_to_descr(rows.dtype),
+                                  "fortran_order": False, "shape": new_shape})
+            fits = len(header.getvalue()) == data_offset
+            if fits:
+                #----------------------------------------------------------------
+                # Data first, then the header: an interrupted append leaves the old shape valid
+                #----------------------------------------------------------------
+                file.seek(data_offset + int(np.prod(shape)) * rows.dtype.itemsize)
+                file.write(rows.tobytes())
+                file.truncate()
+                file.flush()
+                file.seek(0)
+                file.write(header.getvalue())
+        if not fits:
+            existing = np.load(file_path, mmap_mode='r')
+            save_matrix_memmap(pd.DataFrame(np.concatenate([existing, rows]), columns=df.columns),
+                               file_path, fingerprint, dtype)
+            return file_path
+        with open(file_path.with_name(file_path.name + ".json"), encoding='utf-8') as file:
+            metadata = json.load(file)
+        metadata.update(shape=list(new_shape), fingerprint=fingerprint)
+        with open(file_path.with_name(file_path.name + ".json"), 'w', encoding='utf-8') as file:
+            json.dump(metadata, file)
+        return file_path
+    except Exception as e:
+        exc_type, exc_value, exc_traceback = sys.exc_info()
+        raise exception.CustomException(exc_type, exc_value, exc_traceback) from e
+#--------------------------------------------------------------------
+def load_matrix_memmap(file_path):
+    """
+    Opens a matrix written by save_matrix_memmap read-only (no data is read until used).
+    Returns (memmap, metadata), or (None, None) if the file or its sidecar is missing.
+    """
+    file_path = Path(file_path)
+    sidecar_path = file_path.with_name(file_path.name + ".json")
+    if not file_path.exists() or not sidecar_path.exists():
+        return None, None
+    try:
+        with open(sidecar_path, encoding='utf-8') as file:
+            metadata = json.load(file)
+        return np.load(file_path, mmap_mode='r'), metadata
+    except Exception as e:
+        exc_type, exc_value, exc_traceback = sys.exc_info()
+        raise exception.CustomException(exc_type, exc_value, exc_traceback) from e
     
     # def get_project_root():
     # # Searches upward for a specific marker file
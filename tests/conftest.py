@@ -0,0 +1,49 @@
+"""
+Shared test data: a small student-performance frame generated from a seed, and a fitted
+preprocessor + champion pair saved the way the trainer saves them.
+Rows depend only on (seed, row number), so make_frame(n, start=s) holds the rows that follow
+make_frame(s) and appended batches can be built without rewriting the first ones.
+"""
+from pathlib import Path
+import joblib
+import numpy as np
+import pandas as pd
+#------------------------------------------------------------------
+import src.myproject.utils as utils
+#------------------------------------------------------------------
+FEATURE_COLUMNS = ["gender", "lunch", "reading_score", "writing_score"]
+NUMERIC_COLUMNS = ["student_id", "reading_score", "writing_score"]
+#------------------------------------------------------------------
+def make_frame(n_rows: int, seed: int = 0, start: int = 0) -> pd.DataFrame:
+    """
+    Rows start .. start + n_rows - 1 of the frame for seed: a unique student_id, two categorical
+    and two numeric features (scores as floats) and a math_score target.
+    """
+    total = start + n_rows
+    columns = iter(np.random.default_rng([seed, column]) for column in range(5))   # one stream per column
+    return pd.DataFrame({
+        "student_id": np.arange(start, total, dtype=np.int64),
+        "gender": next(columns).choice(["female", "male"], total)[start:],
+        "lunch": next(columns).choice(["standard", "free/reduced"], total)[start:],
+        "reading_score": next(columns).integers(20, 100, total)[start:].astype(float),
+        "writing_score": next(columns).integers(20, 100, total)[start:].astype(float),
+        "math_score": next(columns).integers(0, 100, total)[start:].astype(float),
+    })
+#------------------------------------------------------------------
+def save_fitted_artifacts(directory, model, n_rows: int = 300, seed: int = 0):
+    """
+    Fits the project preprocessor and model on make_frame(n_rows, seed) with a math_score that
+    depends on every feature, dumps both with joblib under directory and returns
+    (preprocessor path, model path, preprocessor, model).
+    """
+    df = make_frame(n_rows, seed=seed)
+    X = df[FEATURE_COLUMNS]
+    y = 0.5 * X["reading_score"] + 0.4 * X["writing_score"] + np.where(X["lunch"] == "standard", 5.0, 0.0) + \
+        np.where(X["gender"] == "male", 2.0, 0.0)
+    numerical, categorical = utils.list_dataframe_columns_by_type(X)
+    preprocessor = utils.create_data_transformation_object(numerical, categorical)
+    model.fit(preprocessor.fit_transform(X), y)
+    preprocessor_path, model_path = Path(directory) / "preprocessor.joblib", Path(directory) / "champion.joblib"
+    joblib.dump(preprocessor, preprocessor_path)
+    joblib.dump(model, model_path)
+    return preprocessor_path, model_path, preprocessor, model
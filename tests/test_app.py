@@ -0,0 +1,114 @@
+"""
+Tests for the Flask prediction service (src/myproject/app.py) through the Flask test client,
+serving the champion and preprocessor saved under artifacts/models.
+"""
+import re
+import numpy as np
+import pandas as pd
+import pytest
+#------------------------------------------------------------------
+import src.myproject.constants as constants
+import src.myproject.metrics as metrics
+from src.myproject.app import app, registry
+#------------------------------------------------------------------
+RAW_DATA = constants.PROJECT_ROOT / "data" / "raw" / "stud.csv"
+FEATURES = ["gender", "race_ethnicity", "parental_level_of_education", "lunch", "test_preparation_course",
+            "reading_score", "writing_score"]
+#------------------------------------------------------------------
+@pytest.fixture
+def client():
+    return app.test_client()
+#------------------------------------------------------------------
+@pytest.fixture(scope="module")
+def records() -> list:
+    return pd.read_csv(RAW_DATA, nrows=25)[FEATURES].to_dict("records")
+#------------------------------------------------------------------
+def form_prediction(client, record: dict) -> float:
+    response = client.post("/predict", data=record)
+    assert response.status_code == 200
+    return float(re.search(r"Predicted Math Score: ([-\d.]+)", response.get_data(as_text=True)).group(1))
+#------------------------------------------------------------------
+# /predict/batch
+#------------------------------------------------------------------
+def test_batch_predictions_match_single_predictions(client, records):
+    response = client.post("/predict/batch", json=records)
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body["count"] == len(records)
+    expected = registry.current.predict_dataframe(pd.DataFrame.from_records(records))
+    np.testing.assert_allclose(body["predictions"], expected, rtol=0, atol=1e-9)
+    for record, prediction in zip(records[:5], body["predictions"]):
+        assert form_prediction(client, record) == round(prediction, 2)
+#------------------------------------------------------------------
+def test_csv_body_is_scored_like_json(client, records):
+    csv_body = pd.DataFrame.from_records(records).to_csv(index=False)
+    from_csv = client.post("/predict/batch", data=csv_body, content_type="text/csv").get_json()
+    from_json = client.post("/predict/batch", json={"records": records}).get_json()
+    assert from_csv["predictions"] == from_json["predictions"]
+#------------------------------------------------------------------
+def test_invalid_rows_reject_the_whole_batch(client, records):
+    bad = [dict(record) for record in records[:4]]
+    bad[1]["gender"] = "unknown"
+    bad[3]["reading_score"] = "eighty"
+    response = client.post("/predict/batch", json=bad)
+    assert response.status_code == 400
+    details = response.get_json()["details"]
+    assert len(details) == 2
+    assert details[0].startswith("Row 1: invalid value 'unknown' for 'gender'")
+    assert details[1].startswith("Row 3: 'reading_score' must be numeric")
+#------------------------------------------------------------------
+@pytest.mark.parametrize("payload, error", [
+    ([], "No records supplied"),
+    ({"rows": []}, "Expected a JSON array"),
+    ([{"gender": "female"}], "Missing required columns"),
+])
+def test_malformed_batches_are_rejected(client, payload, error):
+    response = client.post("/predict/batch", json=payload)
+    assert response.status_code == 400
+    body = response.get_json()
+    assert error in body["error"] or any(error in detail for detail in body.get("details", []))
+#------------------------------------------------------------------
+# Admin routes
+#------------------------------------------------------------------
+@pytest.mark.parametrize("configured, header", [("", None), ("", "anything"), ("s3cret", None), ("s3cret", "wrong")])
+@pytest.mark.parametrize("method, route", [("get", "/admin/model"), ("post", "/admin/reload")])
+def test_admin_routes_need_the_configured_token(client, monkeypatch, configured, header, method, route):
+    monkeypatch.setattr(constants, "ADMIN_TOKEN", configured)
+    headers = {"X-Admin-Token": header} if header is not None else {}
+    response = getattr(client, method)(route, headers=headers)
+    assert response.status_code == 401
+#------------------------------------------------------------------
+def test_admin_status_with_the_right_token(client, monkeypatch):
+    monkeypatch.setattr(constants, "ADMIN_TOKEN", "s3cret")
+    response = client.get("/admin/model", headers={"X-Admin-Token": "s3cret"})
+    assert response.status_code == 200
+    assert response.get_json()["version"] == registry.current.version
+#------------------------------------------------------------------
+# /metrics
+#------------------------------------------------------------------
+SAMPLE_LINE = re.compile(r'^[a-zA-Z_:][a-zA-Z0-9_:]*(\{[a-zA-Z_][a-zA-Z0-9_]*="[^"]*"(,[a-zA-Z_][a-zA-Z0-9_]*="[^"]*")*\})? '
+                         r'[-+]?(\d+(\.\d*)?([eE][-+]?\d+)?|Inf|NaN)$')
+#------------------------------------------------------------------
+def test_metrics_are_rendered_in_the_prometheus_text_format(client, records):
+    client.post("/predict/batch", json=records)
+    client.post("/predict/batch", json=[])
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.content_type == metrics.PROMETHEUS_CONTENT_TYPE
+    lines = response.get_data(as_text=True).splitlines()
+
+    for line in lines:
+        assert line.startswith(("# HELP ", "# TYPE ")) or SAMPLE_LINE.match(line), line
+    assert "# TYPE prediction_requests_total counter" in lines
+    assert "# TYPE prediction_stage_seconds histogram" in lines
+    samples = dict(line.rsplit(" ", 1) for line in lines if not line.startswith("#"))
+    assert float(samples['prediction_requests_total{endpoint="predict_batch"}']) >= 2
+    assert float(samples['prediction_errors_total{endpoint="predict_batch"}']) >= 1
+    assert float(samples['prediction_rows_total{endpoint="predict_batch"}']) >= len(records)
+    #----------------------------------------------------------------
+    # Histogram buckets are cumulative and end with +Inf == _count
+    #----------------------------------------------------------------
+    prefix = 'prediction_request_seconds_bucket{endpoint="predict_batch",le='
+    buckets = [int(value) for name, value in samples.items() if name.startswith(prefix)]
+    assert buckets == sorted(buckets)
+    assert samples[prefix + '"+Inf"}'] == samples['prediction_request_seconds_count{endpoint="predict_batch"}']
@@ -0,0 +1,68 @@
+"""
+Tests for the serving artifact cache (artifact_cache.ArtifactCache).
+An artifact is reloaded only when its file changes (mtime or size, confirmed by content hash
+when enabled), and the least recently used artifact is evicted once the cache is full.
+"""
+import os
+import joblib
+import pytest
+#------------------------------------------------------------------
+from src.myproject.artifact_cache import ArtifactCache
+#------------------------------------------------------------------
+def dump(path, obj, mtime_ns: int | None = None):
+    joblib.dump(obj, path)
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+    return path
+#------------------------------------------------------------------
+@pytest.mark.parametrize("hash_content", [False, True])
+def test_unchanged_file_is_served_from_memory(tmp_path, hash_content):
+    cache = ArtifactCache(max_entries=4, hash_content=hash_content)
+    path = dump(tmp_path / "model.joblib", {"weights": [1, 2, 3]})
+    first = cache.load(path)
+    assert cache.load(path) is first
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+#------------------------------------------------------------------
+@pytest.mark.parametrize("hash_content", [False, True])
+def test_changed_size_or_mtime_reloads(tmp_path, hash_content):
+    cache = ArtifactCache(max_entries=4, hash_content=hash_content)
+    path = dump(tmp_path / "model.joblib", {"version": 1}, mtime_ns=1_000_000_000)
+    assert cache.load(path) == {"version": 1}
+
+    dump(path, {"version": 2, "extra": "x" * 100}, mtime_ns=1_000_000_000)   # same mtime, new size
+    assert cache.load(path) == {"version": 2, "extra": "x" * 100}
+
+    dump(path, {"version": 3, "extra": "y" * 100}, mtime_ns=2_000_000_000)   # same size, new mtime
+    assert cache.load(path) == {"version": 3, "extra": "y" * 100}
+    assert cache.stats()["misses"] == 3
+#------------------------------------------------------------------
+def test_touched_identical_file_keeps_the_cached_object_when_hashing(tmp_path):
+    cache = ArtifactCache(max_entries=4, hash_content=True)
+    path = dump(tmp_path / "model.joblib", {"version": 1}, mtime_ns=1_000_000_000)
+    first = cache.load(path)
+    os.utime(path, ns=(2_000_000_000, 2_000_000_000))
+    assert cache.load(path) is first
+    assert cache.stats()["misses"] == 1
+#------------------------------------------------------------------
+def test_least_recently_used_artifact_is_evicted(tmp_path):
+    cache = ArtifactCache(max_entries=2, hash_content=False)
+    a, b, c = (dump(tmp_path / f"{name}.joblib", name) for name in "abc")
+    cache.load(a)
+    cache.load(b)
+    cache.load(a)            # a is now the most recently used
+    cache.load(c)            # evicts b
+    assert cache.stats()["entries"] == 2
+    misses = cache.stats()["misses"]
+    cache.load(a)
+    cache.load(c)
+    assert cache.stats()["misses"] == misses
+    cache.load(b)
+    assert cache.stats()["misses"] == misses + 1
+#------------------------------------------------------------------
+def test_invalidate_forces_a_reload(tmp_path):
+    cache = ArtifactCache(max_entries=4, hash_content=False)
+    path = dump(tmp_path / "model.joblib", [1])
+    first = cache.load(path)
+    cache.invalidate(path)
+    assert cache.load(path) is not first
+    assert cache.stats()["misses"] == 2
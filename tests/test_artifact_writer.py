@@ -0,0 +1,70 @@
+"""
+Tests for the streaming artifact writer (utils.ChunkedArtifactWriter).
+Every format must read back, through load_data_artifact, the rows of all chunks in order,
+including categorical columns whose categories differ from chunk to chunk.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+#------------------------------------------------------------------
+import src.myproject.utils as utils
+#------------------------------------------------------------------
+ARROW_FORMATS = ("parquet", "feather")
+#------------------------------------------------------------------
+def make_chunks() -> list:
+    """Three chunks whose categorical columns each bring categories the others lack."""
+    return [
+        pd.DataFrame({"group": pd.Categorical(["a", "b", "a"]), "label": ["p", None, "q"],
+                      "score": [1.5, np.nan, 3.0], "count": [1, 2, 3]}),
+        pd.DataFrame({"group": pd.Categorical(["c", "a"]), "label": ["r", "p"],
+                      "score": [4.0, 5.0], "count": [4, 5]}),
+        pd.DataFrame({"group": pd.Categorical(["d"], categories=["d", "b"]), "label": ["q"],
+                      "score": [6.0], "count": [6]}),
+    ]
+#------------------------------------------------------------------
+def write_chunks(tmp_path, artifact_format, chunks, compression=""):
+    file_path = tmp_path / f"chunks_{artifact_format}.csv"
+    with utils.ChunkedArtifactWriter(file_path, artifact_format=artifact_format,
+                                     compression=compression, csv_export=False) as writer:
+        for chunk in chunks:
+            writer.write(chunk)
+    assert writer.rows == sum(len(chunk) for chunk in chunks)
+    return utils.load_data_artifact(file_path, artifact_format=artifact_format, compression=compression)
+#------------------------------------------------------------------
+def as_values(series: pd.Series) -> list:
+    """Column values with every kind of missing value as None."""
+    values = series.astype(object)
+    return values.where(values.notna(), None).tolist()
+#------------------------------------------------------------------
+@pytest.mark.parametrize("compression", ["", "none"])
+@pytest.mark.parametrize("artifact_format", ["parquet", "feather", "pickle", "csv"])
+def test_chunks_round_trip_with_changing_categories(tmp_path, artifact_format, compression):
+    if artifact_format in ARROW_FORMATS:
+        pytest.importorskip("pyarrow")
+    chunks = make_chunks()
+    result = write_chunks(tmp_path, artifact_format, chunks, compression)
+    expected = pd.concat([chunk.astype({"group": object}) for chunk in chunks], ignore_index=True)
+
+    assert list(result.columns) == list(expected.columns)
+    assert as_values(result["group"]) == as_values(expected["group"])
+    assert as_values(result["label"]) == as_values(expected["label"])
+    np.testing.assert_array_equal(result["score"].to_numpy(), expected["score"].to_numpy())
+    assert result["count"].tolist() == expected["count"].tolist()
+#------------------------------------------------------------------
+@pytest.mark.parametrize("artifact_format", ARROW_FORMATS)
+def test_arrow_formats_keep_numeric_categories_numeric(tmp_path, artifact_format):
+    pytest.importorskip("pyarrow")
+    chunks = [pd.DataFrame({"level": pd.Categorical([1, 2])}), pd.DataFrame({"level": pd.Categorical([3])})]
+    result = write_chunks(tmp_path, artifact_format, chunks)
+    assert result["level"].tolist() == [1, 2, 3]
+    assert pd.api.types.is_integer_dtype(result["level"])
+#------------------------------------------------------------------
+def test_failed_write_keeps_previous_artifact(tmp_path):
+    file_path = tmp_path / "kept.csv"
+    utils.save_data_artifact(pd.DataFrame({"x": [1]}), file_path, artifact_format="csv", csv_export=False)
+    with pytest.raises(RuntimeError):
+        with utils.ChunkedArtifactWriter(file_path, artifact_format="csv", csv_export=False) as writer:
+            writer.write(pd.DataFrame({"x": [2, 3]}))
+            raise RuntimeError("interrupted")
+    assert not writer.temp_path.exists()
+    assert utils.load_data_artifact(file_path, artifact_format="csv")["x"].tolist() == [1]
@@ -0,0 +1,43 @@
+"""
+Tests for streaming bulk scoring (batch_predict_pipeline.BulkScoringPipeline).
+Scoring chunks in a process pool must write exactly what the serial path writes, in input order.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import RandomForestRegressor
+#------------------------------------------------------------------
+from src.myproject.config.config_app import BulkScoringConfig, PredictionPipelineConfig
+from src.myproject.pipeline.batch_predict_pipeline import BulkScoringPipeline
+from tests.conftest import FEATURE_COLUMNS, make_frame, save_fitted_artifacts
+#------------------------------------------------------------------
+@pytest.fixture(scope="module")
+def fitted_artifacts(tmp_path_factory):
+    """A preprocessor and a forest champion saved with joblib, plus the fitted objects."""
+    return save_fitted_artifacts(tmp_path_factory.mktemp("models"), RandomForestRegressor(n_estimators=10, random_state=0))
+#------------------------------------------------------------------
+def make_pipeline(preprocessor_path, model_path) -> BulkScoringPipeline:
+    pipeline = BulkScoringPipeline()
+    pipeline.bulk_scoring_config = BulkScoringConfig(preprocessor_file_path=preprocessor_path,
+                                                     champion_model_file_path=model_path)
+    pipeline.prediction_pipeline.prediction_pipeline_config = PredictionPipelineConfig(
+        preprocessor_file_path=preprocessor_path, champion_model_file_path=model_path)
+    return pipeline
+#------------------------------------------------------------------
+def test_parallel_scoring_matches_serial(fitted_artifacts, tmp_path):
+    preprocessor_path, model_path, preprocessor, model = fitted_artifacts
+    X = make_frame(500, seed=1)[FEATURE_COLUMNS]
+    X.insert(0, "row_id", np.arange(len(X)))
+    input_path = tmp_path / "input.csv"
+    X.to_csv(input_path, index=False)
+    pipeline = make_pipeline(preprocessor_path, model_path)
+
+    serial = pipeline.score(input_path, tmp_path / "serial.csv", chunk_size=64, id_columns=["row_id"], workers=1)
+    parallel = pipeline.score(input_path, tmp_path / "parallel.csv", chunk_size=64, id_columns=["row_id"], workers=2)
+
+    assert serial["rows_done"] == parallel["rows_done"] == len(X)
+    assert parallel["chunks_done"] == serial["chunks_done"] == 8
+    assert (tmp_path / "parallel.csv").read_bytes() == (tmp_path / "serial.csv").read_bytes()
+    scored = pd.read_csv(tmp_path / "parallel.csv")
+    assert scored["row_id"].tolist() == X["row_id"].tolist()
+    np.testing.assert_allclose(scored["prediction"], model.predict(preprocessor.transform(X.drop(columns="row_id"))))
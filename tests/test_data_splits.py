@@ -0,0 +1,50 @@
+"""
+Tests for the hash splitter (data_splits.DataSplits.hashed / extended).
+Appending rows must never move an existing row to another part, and the extended split
+must equal a hash split of the combined data computed from scratch.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+#------------------------------------------------------------------
+from src.myproject.components.data_splits import PARTS, DataSplits
+from tests.conftest import make_frame
+#------------------------------------------------------------------
+TEST_SIZE, TEST_SIZE_VAL, RANDOM_STATE = 0.2, 0.1, 42
+#------------------------------------------------------------------
+def part_of_each_row(splits: DataSplits, n_rows: int) -> np.ndarray:
+    parts = np.empty(n_rows, dtype=object)
+    for part in PARTS:
+        parts[splits.rows(part)] = part
+    return parts
+#------------------------------------------------------------------
+@pytest.mark.parametrize("key_column", [None, "student_id"])
+def test_appended_rows_leave_existing_assignments_unchanged(key_column):
+    base, appended = make_frame(400, seed=1), make_frame(150, seed=1, start=400)
+    combined = pd.concat([base, appended], ignore_index=True)
+    y = pd.Series(np.zeros(len(combined)))
+
+    before = DataSplits.hashed(base, y.iloc[:len(base)], TEST_SIZE, TEST_SIZE_VAL, RANDOM_STATE, key_column)
+    after = before.extended(appended, TEST_SIZE, TEST_SIZE_VAL, RANDOM_STATE, key_column)
+    rebuilt = DataSplits.hashed(combined, y, TEST_SIZE, TEST_SIZE_VAL, RANDOM_STATE, key_column)
+
+    assert (part_of_each_row(after, len(combined))[:len(base)] == part_of_each_row(before, len(base))).all()
+    for part in PARTS:
+        np.testing.assert_array_equal(after.rows(part), rebuilt.rows(part))
+    assert sum(after.sizes().values()) == len(combined)
+#------------------------------------------------------------------
+def test_assignment_ignores_chunking_and_numeric_dtypes():
+    X = make_frame(500, seed=3)
+    y = pd.Series(np.zeros(len(X)))
+    one_pass = DataSplits.hashed(X, y, TEST_SIZE, TEST_SIZE_VAL, RANDOM_STATE)
+    chunked = DataSplits.hashed(X, y, TEST_SIZE, TEST_SIZE_VAL, RANDOM_STATE, chunk_size=37)
+    retyped = DataSplits.hashed(X.astype({"reading_score": np.float32}), y, TEST_SIZE, TEST_SIZE_VAL, RANDOM_STATE)
+    for part in PARTS:
+        np.testing.assert_array_equal(chunked.rows(part), one_pass.rows(part))
+        np.testing.assert_array_equal(retyped.rows(part), one_pass.rows(part))
+#------------------------------------------------------------------
+def test_split_proportions_follow_the_configured_sizes():
+    X = make_frame(20_000, seed=4)
+    sizes = DataSplits.hashed(X, pd.Series(np.zeros(len(X))), TEST_SIZE, TEST_SIZE_VAL, RANDOM_STATE).sizes()
+    assert sizes["test"] / len(X) == pytest.approx(TEST_SIZE, abs=0.01)
+    assert sizes["val"] / len(X) == pytest.approx((1 - TEST_SIZE) * TEST_SIZE_VAL, abs=0.01)
@@ -0,0 +1,69 @@
+"""
+Tests for the database ingestion source (db_source.DatabaseSource) against a temporary SQLite file.
+The column list and predicate must be evaluated by the database, batches must respect the fetch
+size, and the ingested rows must equal the same table read from CSV.
+"""
+import sqlite3
+import dataclasses
+import pandas as pd
+import pytest
+#------------------------------------------------------------------
+import src.myproject.utils as utils
+from src.myproject.components.data_ingestion import DataIngestion
+from src.myproject.components.db_source import DatabaseSource, quote_identifier
+from tests.conftest import make_frame
+#------------------------------------------------------------------
+TABLE = "students"
+#------------------------------------------------------------------
+@pytest.fixture
+def sources(tmp_path):
+    """The same 250 rows as a CSV file and as a table in a SQLite file: (frame, csv path, database URL)."""
+    df = make_frame(250)
+    csv_path, db_path = tmp_path / "stud.csv", tmp_path / "stud.db"
+    df.to_csv(csv_path, index=False)
+    with sqlite3.connect(db_path) as connection:
+        df.to_sql(TABLE, connection, index=False)
+    connection.close()
+    return df, csv_path, f"sqlite:///{db_path}"
+#------------------------------------------------------------------
+def test_only_the_selected_columns_are_read(sources):
+    df, _, url = sources
+    source = DatabaseSource(url, TABLE, columns=["gender", "math_score"])
+    assert source.build_query() == f'SELECT "gender", "math_score" FROM "{TABLE}"'
+
+    result = pd.concat(source.iter_batches(), ignore_index=True)
+    assert list(result.columns) == ["gender", "math_score"]
+    pd.testing.assert_frame_equal(result, df[["gender", "math_score"]])
+#------------------------------------------------------------------
+def test_predicate_is_evaluated_by_the_database_with_bound_values(sources):
+    df, _, url = sources
+    source = DatabaseSource(url, TABLE, where="reading_score >= ? AND gender = ?", params=(60, "female"))
+    result = pd.concat(source.iter_batches(), ignore_index=True)
+
+    expected = df[(df["reading_score"] >= 60) & (df["gender"] == "female")].reset_index(drop=True)
+    assert 0 < len(result) < len(df)
+    pd.testing.assert_frame_equal(result, expected)
+#------------------------------------------------------------------
+def test_batches_follow_the_fetch_size(sources):
+    df, _, url = sources
+    source = DatabaseSource(url, TABLE, order_by="rowid", fetch_size=100)
+    assert [len(batch) for batch in source.iter_batches()] == [100, 100, 50]
+    assert [len(batch) for batch in source.iter_batches(batch_size=125)] == [125, 125]
+#------------------------------------------------------------------
+def test_identifiers_are_validated():
+    assert quote_identifier("main.students") == '"main"."students"'
+    with pytest.raises(ValueError):
+        quote_identifier('students"; DROP TABLE students; --')
+#------------------------------------------------------------------
+def test_database_ingestion_equals_the_csv_path(sources, tmp_path):
+    _, csv_path, url = sources
+    ingestion = DataIngestion()
+    ingestion.ingestion_config = dataclasses.replace(
+        ingestion.ingestion_config, database_url=url, db_table=TABLE, db_columns="", db_where="", db_params="",
+        db_order_by="rowid", db_fetch_size=64, target_column="math_score", float_precision="float64",
+        ingestion_schema_path=tmp_path / "schema.json")
+
+    schema, batches = ingestion.database_batches()
+    from_db = pd.concat(list(batches), ignore_index=True)
+    from_csv = pd.concat(utils.read_csv_chunks(csv_path, schema, 64), ignore_index=True)
+    pd.testing.assert_frame_equal(from_db, from_csv)
@@ -0,0 +1,84 @@
+"""
+Tests for the incremental-ingestion watermark (ingestion_watermark.IngestionWatermark).
+A delta may only be ingested on top of an appended raw file with unchanged settings and
+artifacts; a rewritten, truncated or reconfigured source must force a full rebuild.
+"""
+import pandas as pd
+import pytest
+#------------------------------------------------------------------
+import src.myproject.utils as utils
+from src.myproject.components.ingestion_watermark import IngestionWatermark
+from tests.conftest import make_frame
+#------------------------------------------------------------------
+SETTINGS = {"target_column": "math_score", "split_strategy": "hash"}
+#------------------------------------------------------------------
+def append_rows(raw_path, df: pd.DataFrame):
+    with open(raw_path, "a", encoding="utf-8", newline="") as file:
+        df.to_csv(file, index=False, header=False)
+#------------------------------------------------------------------
+@pytest.fixture
+def ingested(tmp_path):
+    """A raw CSV of 50 rows, one processed artifact and the watermark recorded after ingesting both."""
+    raw_path, artifact = tmp_path / "raw.csv", tmp_path / "processed.csv"
+    make_frame(50).to_csv(raw_path, index=False)
+    make_frame(50).to_csv(artifact, index=False)
+    watermark = IngestionWatermark(tmp_path / "watermark.json")
+    watermark.record(raw_path, raw_path.stat().st_size, 50, SETTINGS, [artifact])
+    return watermark, raw_path, artifact
+#------------------------------------------------------------------
+def test_appended_rows_are_read_as_a_delta(ingested):
+    watermark, raw_path, artifact = ingested
+    append_rows(raw_path, make_frame(7, start=50))
+
+    mark = watermark.check(raw_path, SETTINGS, [artifact])
+    assert mark is not None and mark["rows"] == 50
+    delta, end_offset = utils.read_csv_delta(raw_path, mark["byte_offset"])
+    assert delta["student_id"].tolist() == list(range(50, 57))
+    assert end_offset == raw_path.stat().st_size
+#------------------------------------------------------------------
+def test_rewritten_raw_file_forces_a_full_rebuild(ingested):
+    watermark, raw_path, artifact = ingested
+    ingested_bytes = raw_path.stat().st_size
+    rewritten = make_frame(60)
+    rewritten.loc[10, "math_score"] = 99.5   # an earlier row edited, then more rows added
+    rewritten.to_csv(raw_path, index=False)
+    assert raw_path.stat().st_size > ingested_bytes
+    assert watermark.check(raw_path, SETTINGS, [artifact]) is None
+#------------------------------------------------------------------
+def test_truncated_raw_file_forces_a_full_rebuild(ingested):
+    watermark, raw_path, artifact = ingested
+    make_frame(20).to_csv(raw_path, index=False)
+    assert watermark.check(raw_path, SETTINGS, [artifact]) is None
+#------------------------------------------------------------------
+def test_changed_settings_or_artifacts_force_a_full_rebuild(ingested):
+    watermark, raw_path, artifact = ingested
+    append_rows(raw_path, make_frame(3, start=50))
+    assert watermark.check(raw_path, {**SETTINGS, "split_strategy": "random"}, [artifact]) is None
+    append_rows(artifact, make_frame(1, start=99))
+    assert watermark.check(raw_path, SETTINGS, [artifact]) is None
+#------------------------------------------------------------------
+def test_edit_far_before_the_watermark_forces_a_full_rebuild(tmp_path):
+    raw_path, artifact = tmp_path / "raw.csv", tmp_path / "processed.csv"
+    make_frame(20_000).to_csv(raw_path, index=False)
+    artifact.write_text("processed")
+    watermark = IngestionWatermark(tmp_path / "watermark.json")
+    watermark.record(raw_path, raw_path.stat().st_size, 20_000, SETTINGS, [artifact])
+    assert raw_path.stat().st_size > 4 * 65536
+
+    ingested_bytes = raw_path.stat().st_size
+    edited = make_frame(20_000)
+    edited.loc[3, "reading_score"] = 21.0 if edited.loc[3, "reading_score"] != 21.0 else 22.0
+    edited.to_csv(raw_path, index=False)
+    assert raw_path.stat().st_size == ingested_bytes   # one two-digit score changed in place
+    append_rows(raw_path, make_frame(5, start=20_000))
+    assert watermark.check(raw_path, SETTINGS, [artifact]) is None
+#------------------------------------------------------------------
+def test_recorded_digest_extends_the_verified_prefix(ingested, tmp_path):
+    watermark, raw_path, artifact = ingested
+    append_rows(raw_path, make_frame(7, start=50))
+    mark = watermark.check(raw_path, SETTINGS, [artifact])
+    extended = watermark.record(raw_path, raw_path.stat().st_size, mark["rows"] + 7, SETTINGS, [artifact])
+
+    fresh = IngestionWatermark(tmp_path / "fresh.json").record(raw_path, raw_path.stat().st_size, 57, SETTINGS, [artifact])
+    assert extended["prefix_digest"] == fresh["prefix_digest"]
+    assert watermark.check(raw_path, SETTINGS, [artifact]) is not None
@@ -0,0 +1,83 @@
+"""
+Tests for the memory-mapped training matrices (utils.save_matrix_memmap / append_matrix_memmap).
+Appending must leave a valid .npy file holding the old rows followed by the new ones, whether
+the longer shape fits in the existing header or the file has to be rewritten.
+"""
+import json
+import numpy as np
+import pandas as pd
+import pytest
+#------------------------------------------------------------------
+import src.myproject.utils as utils
+import src.myproject.exception as exception
+from tests.conftest import NUMERIC_COLUMNS, make_frame
+#------------------------------------------------------------------
+def make_matrix_frame(n_rows: int, start: int = 0) -> pd.DataFrame:
+    """The numeric columns of the shared test frame: three columns of exact small floats."""
+    return make_frame(n_rows, start=start)[NUMERIC_COLUMNS].astype(np.float64)
+#------------------------------------------------------------------
+def header_length(file_path) -> int:
+    with open(file_path, "rb") as file:
+        read_header = {(1, 0): np.lib.format.read_array_header_1_0,
+                       (2, 0): np.lib.format.read_array_header_2_0}[np.lib.format.read_magic(file)]
+        read_header(file)
+        return file.tell()
+#------------------------------------------------------------------
+def write_tight_npy(file_path, array: np.ndarray):
+    """A version 1.0 .npy file whose header has no spare padding, as older writers produced."""
+    header = repr({"descr": np.lib.format.dtype_to_descr(array.dtype), "fortran_order": False,
+                   "shape": array.shape}).encode("latin1") + b"\n"
+    with open(file_path, "wb") as file:
+        file.write(np.lib.format.magic(1, 0))
+        file.write(len(header).to_bytes(2, "little"))
+        file.write(header)
+        file.write(array.tobytes())
+#------------------------------------------------------------------
+@pytest.mark.parametrize("dtype", [np.float64, np.float32])
+def test_append_rewrites_the_header_in_place(tmp_path, dtype):
+    file_path = tmp_path / "matrix.npy"
+    utils.save_matrix_memmap(make_matrix_frame(9), file_path, fingerprint="first", dtype=dtype)
+    offset = header_length(file_path)
+
+    utils.append_matrix_memmap(make_matrix_frame(3, start=9), file_path, fingerprint="second", dtype=dtype)
+    utils.append_matrix_memmap(make_matrix_frame(88, start=12), file_path, fingerprint="third", dtype=dtype)
+
+    matrix, metadata = utils.load_matrix_memmap(file_path)
+    assert header_length(file_path) == offset
+    assert matrix.dtype == dtype and matrix.shape == (100, 3)
+    np.testing.assert_array_equal(matrix, make_matrix_frame(100).to_numpy(dtype=dtype))
+    assert metadata["shape"] == [100, 3] and metadata["fingerprint"] == "third"
+    assert file_path.stat().st_size == offset + 100 * 3 * np.dtype(dtype).itemsize
+#------------------------------------------------------------------
+def test_append_rewrites_the_file_when_the_header_is_full(tmp_path):
+    file_path = tmp_path / "matrix.npy"
+    utils.save_matrix_memmap(make_matrix_frame(9), file_path, fingerprint="first")
+    write_tight_npy(file_path, make_matrix_frame(9).to_numpy())
+    tight_offset = header_length(file_path)
+
+    utils.append_matrix_memmap(make_matrix_frame(1, start=9), file_path, fingerprint="second")
+
+    matrix, metadata = utils.load_matrix_memmap(file_path)
+    assert header_length(file_path) != tight_offset
+    np.testing.assert_array_equal(matrix, make_matrix_frame(10).to_numpy())
+    assert metadata["shape"] == [10, 3] and metadata["fingerprint"] == "second"
+    assert metadata["columns"] == NUMERIC_COLUMNS
+#------------------------------------------------------------------
+def test_append_rejects_rows_of_another_width_or_dtype(tmp_path):
+    file_path = tmp_path / "matrix.npy"
+    utils.save_matrix_memmap(make_matrix_frame(4), file_path)
+    before = file_path.read_bytes()
+    with pytest.raises(exception.CustomException):
+        utils.append_matrix_memmap(make_matrix_frame(2)[NUMERIC_COLUMNS[:2]], file_path)
+    with pytest.raises(exception.CustomException):
+        utils.append_matrix_memmap(make_matrix_frame(2), file_path, dtype=np.float32)
+    assert file_path.read_bytes() == before
+    with open(file_path.with_name(file_path.name + ".json"), encoding="utf-8") as file:
+        assert json.load(file)["shape"] == [4, 3]
+#------------------------------------------------------------------
+def test_append_to_a_missing_matrix_creates_it(tmp_path):
+    file_path = tmp_path / "new.npy"
+    utils.append_matrix_memmap(make_matrix_frame(5), file_path, fingerprint="only")
+    matrix, metadata = utils.load_matrix_memmap(file_path)
+    np.testing.assert_array_equal(matrix, make_matrix_frame(5).to_numpy())
+    assert metadata["fingerprint"] == "only"
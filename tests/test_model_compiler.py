@@ -0,0 +1,71 @@
+"""
+Tests for the compiled linear fast path (model_compiler.CompiledLinearModel).
+The compiled tables must reproduce preprocessor + linear model predictions, for batches and
+single records, including missing values and categories unseen during fitting.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.linear_model import Lasso, LinearRegression, Ridge
+#------------------------------------------------------------------
+import src.myproject.utils as utils
+import src.myproject.exception as exception
+from src.myproject.components.model_compiler import CompiledLinearModel, compile_linear_pipeline
+from tests.conftest import FEATURE_COLUMNS, make_frame
+#------------------------------------------------------------------
+@pytest.fixture(scope="module")
+def training_data():
+    X = make_frame(200, seed=0)[FEATURE_COLUMNS]
+    y = 0.6 * X["reading_score"] + 0.3 * X["writing_score"] + np.where(X["lunch"] == "standard", 5.0, 0.0)
+    return X, y + np.random.default_rng(1).normal(0, 2, len(X))
+#------------------------------------------------------------------
+def fit_pipeline(X, y, model, dtype=np.float64):
+    numerical, categorical = utils.list_dataframe_columns_by_type(X)
+    preprocessor = utils.create_data_transformation_object(numerical, categorical, dtype=dtype)
+    model.fit(preprocessor.fit_transform(X), y)
+    return preprocessor, model
+#------------------------------------------------------------------
+def scoring_frame() -> pd.DataFrame:
+    """
+    Fresh rows plus a missing number, an unseen category and both kinds of missing category:
+    NaN is imputed, None is kept by SimpleImputer and encoded as an unknown level.
+    """
+    X = make_frame(50, seed=2)[FEATURE_COLUMNS]
+    X.loc[0, "reading_score"] = np.nan
+    X.loc[1, "gender"] = None
+    X.loc[2, "lunch"] = "unknown"
+    X.loc[3, "gender"] = np.nan
+    return X
+#------------------------------------------------------------------
+@pytest.mark.parametrize("model", [LinearRegression(), Ridge(alpha=3.0), Lasso(alpha=0.1)], ids=lambda m: type(m).__name__)
+def test_compiled_model_matches_sklearn(training_data, model):
+    preprocessor, model = fit_pipeline(*training_data, model)
+    compiled = compile_linear_pipeline(preprocessor, model, dtype=np.float64)
+    X = scoring_frame()
+    expected = model.predict(preprocessor.transform(X))
+
+    np.testing.assert_allclose(compiled.predict(X), expected, rtol=0, atol=1e-9)
+    np.testing.assert_allclose([compiled.predict_one(record) for record in X.to_dict("records")], expected,
+                               rtol=0, atol=1e-9)
+#------------------------------------------------------------------
+def test_compiled_model_round_trips_through_npz(training_data, tmp_path):
+    preprocessor, model = fit_pipeline(*training_data, Ridge())
+    compiled = compile_linear_pipeline(preprocessor, model, dtype=np.float64)
+    compiled.save(tmp_path / "compiled.npz")
+    loaded = CompiledLinearModel.load(tmp_path / "compiled.npz")
+    X = scoring_frame()
+    np.testing.assert_array_equal(loaded.predict(X), compiled.predict(X))
+#------------------------------------------------------------------
+def test_float32_compiled_model_predicts_float32(training_data):
+    preprocessor, model = fit_pipeline(*training_data, Ridge())
+    compiled = compile_linear_pipeline(preprocessor, model, dtype=np.float32)
+    X = scoring_frame()
+    predictions = compiled.predict(X)
+    assert predictions.dtype == np.float32
+    np.testing.assert_allclose(predictions, model.predict(preprocessor.transform(X)), rtol=1e-5, atol=1e-3)
+#------------------------------------------------------------------
+def test_non_linear_champion_is_rejected(training_data):
+    preprocessor, model = fit_pipeline(*training_data, RandomForestRegressor(n_estimators=2, random_state=0))
+    with pytest.raises(exception.CustomException):
+        compile_linear_pipeline(preprocessor, model)
@@ -0,0 +1,50 @@
+"""
+Tests for the hot-reloading model registry (model_registry.ModelRegistry).
+A reload must publish the new bundle in one swap, leave bundles already handed out unchanged,
+and keep serving the previous bundle when the new artifacts fail to load or warm up.
+"""
+import joblib
+import numpy as np
+import pytest
+from sklearn.linear_model import Ridge
+#------------------------------------------------------------------
+from src.myproject.pipeline.model_registry import ModelRegistry
+from tests.conftest import FEATURE_COLUMNS, make_frame, save_fitted_artifacts
+#------------------------------------------------------------------
+@pytest.fixture
+def registry_and_artifacts(tmp_path):
+    preprocessor_path, model_path, preprocessor, model = save_fitted_artifacts(tmp_path, Ridge(alpha=1.0))
+    return ModelRegistry(preprocessor_path, model_path), preprocessor, model, model_path
+#------------------------------------------------------------------
+def test_reload_swaps_in_the_new_champion(registry_and_artifacts):
+    registry, preprocessor, model, model_path = registry_and_artifacts
+    df = make_frame(30, seed=3)[FEATURE_COLUMNS]
+    in_flight = registry.current
+    new_model = Ridge(alpha=500.0).fit(preprocessor.transform(make_frame(300)[FEATURE_COLUMNS]),
+                                       make_frame(300)["math_score"])
+    joblib.dump(new_model, model_path)
+
+    assert registry.reload(wait=True)
+    assert registry.last_error is None and registry.reload_count == 1
+    assert registry.current is not in_flight and registry.current.version != in_flight.version
+    np.testing.assert_allclose(registry.current.predict_dataframe(df), new_model.predict(preprocessor.transform(df)))
+    # a request that started before the swap finishes on the bundle it pinned
+    np.testing.assert_allclose(in_flight.predict_dataframe(df), model.predict(preprocessor.transform(df)))
+#------------------------------------------------------------------
+def test_failed_reload_keeps_serving_the_previous_bundle(registry_and_artifacts):
+    registry, preprocessor, model, model_path = registry_and_artifacts
+    served = registry.current
+    joblib.dump(Ridge().fit(np.ones((5, 3)) * np.arange(5)[:, None], np.arange(5.0)), model_path)   # wrong width
+
+    assert registry.reload(wait=True)
+    assert registry.current is served
+    assert "features" in registry.last_error
+    assert registry.status()["reload_count"] == 0 and not registry.status()["reloading"]
+#------------------------------------------------------------------
+def test_single_record_path_matches_the_batch_path(registry_and_artifacts):
+    registry, _, _, _ = registry_and_artifacts
+    df = make_frame(10, seed=4)[FEATURE_COLUMNS]
+    artifacts = registry.current
+    expected = artifacts.predict_dataframe(df)
+    for record, prediction in zip(df.to_dict("records"), expected):
+        assert artifacts.predict_record(record) == pytest.approx(prediction, abs=1e-9)
@@ -0,0 +1,165 @@
+"""
+Tests for the shared-pool hyperparameter search (model_search.ModelSearch).
+With the default grid strategy every family must select the same parameters, with the same
+per-candidate CV scores, as GridSearchCV(cv=cv_folds, scoring='r2').
+"""
+import numpy as np
+import pytest
+from sklearn.base import clone
+from sklearn.datasets import make_regression
+from sklearn.ensemble import GradientBoostingRegressor, RandomForestRegressor
+from sklearn.linear_model import Lasso, LinearRegression, Ridge
+from sklearn.model_selection import GridSearchCV, ParameterGrid, cross_val_score
+#------------------------------------------------------------------
+from src.myproject.components.fit_cache import FitCache
+from src.myproject.components.model_search import ModelSearch
+#------------------------------------------------------------------
+MODEL_HYPERPARAMETERS = {
+    "LinearRegression": {"model": LinearRegression(), "params": {}},
+    "Ridge": {"model": Ridge(), "params": {"alpha": [0.01, 1.0, 100.0], "fit_intercept": [True, False]}},
+    "Lasso": {"model": Lasso(max_iter=5000), "params": {"alpha": [0.001, 0.1, 10.0]}},
+    "RandomForestRegressor": {"model": RandomForestRegressor(random_state=0),
+                              "params": {"n_estimators": [4, 8], "max_depth": [2, None]}},
+    "GradientBoostingRegressor": {"model": GradientBoostingRegressor(random_state=0),
+                                  "params": {"n_estimators": [5, 10], "learning_rate": [0.1, 0.5]}},
+}
+#------------------------------------------------------------------
+@pytest.fixture(scope="module")
+def regression_data():
+    X, y = make_regression(n_samples=90, n_features=6, noise=10.0, random_state=0)
+    return X, y
+#------------------------------------------------------------------
+@pytest.mark.parametrize("n_jobs", [1, 2])
+def test_grid_search_matches_gridsearchcv(regression_data, n_jobs):
+    X, y = regression_data
+    results = ModelSearch(n_jobs=n_jobs, cv_folds=3).run(MODEL_HYPERPARAMETERS, X, y)
+    assert set(results) == set(MODEL_HYPERPARAMETERS)
+    for family, spec in MODEL_HYPERPARAMETERS.items():
+        reference = GridSearchCV(spec["model"], spec["params"], cv=3, scoring="r2").fit(X, y)
+        result = results[family]
+        assert result.strategy == "grid"
+        assert result.candidates == list(reference.cv_results_["params"])
+        np.testing.assert_allclose(result.mean_scores, reference.cv_results_["mean_test_score"], rtol=0, atol=1e-12)
+        assert result.best_params == reference.best_params_
+        np.testing.assert_allclose(result.best_estimator.predict(X), reference.best_estimator_.predict(X),
+                                   rtol=0, atol=1e-9)
+#------------------------------------------------------------------
+# Regularization path: one pass per fold must score every alpha like an independent fit
+#------------------------------------------------------------------
+@pytest.mark.parametrize("model, atol", [(Ridge(), 1e-9), (Lasso(max_iter=5000, tol=1e-6), 1e-4)])
+def test_path_scores_match_independent_fits(regression_data, model, atol):
+    X, y = regression_data
+    family = type(model).__name__
+    spec = {family: {"model": model, "params": {"alpha": [0.01, 1.0, 10.0], "fit_intercept": [True, False]},
+                     "search": {"strategy": "path", "n_alphas": 7}}}
+    result = ModelSearch(n_jobs=1, cv_folds=3).run(spec, X, y)[family]
+    assert result.strategy == "path"
+    assert len(result.candidates) == 2 * 7
+
+    for candidate, mean_score in zip(result.candidates, result.mean_scores):
+        reference = cross_val_score(clone(model).set_params(**candidate), X, y, cv=3, scoring="r2").mean()
+        assert mean_score == pytest.approx(reference, abs=atol)
+#------------------------------------------------------------------
+def test_path_alphas_keep_the_configured_values():
+    # geomspace(0.3, 30.0, 3) has a midpoint within rounding of 3.0; only the configured 3.0 may be scored
+    plan = ModelSearch(n_jobs=1)._make_plan("Ridge", {"model": Ridge(), "params": {"alpha": [0.3, 3.0, 30.0]},
+                                                      "search": {"strategy": "path", "n_alphas": 3}}, 60)
+    alphas = [candidate["alpha"] for candidate, _ in plan.next_round()]
+    assert alphas == [0.3, 3.0, 30.0]
+#------------------------------------------------------------------
+# Randomized and successive-halving strategies
+#------------------------------------------------------------------
+RIDGE_GRID = {"alpha": [0.001, 0.01, 0.1, 1.0, 10.0, 100.0], "fit_intercept": [True, False]}
+#------------------------------------------------------------------
+def test_random_search_scores_n_iter_candidates_from_the_grid(regression_data):
+    X, y = regression_data
+    spec = {"Ridge": {"model": Ridge(), "params": RIDGE_GRID, "search": {"strategy": "random", "n_iter": 5}}}
+    result = ModelSearch(n_jobs=1, cv_folds=3).run(spec, X, y)["Ridge"]
+    assert result.strategy == "random"
+    assert len(result.candidates) == 5 and result.n_fits == 5 * 3
+    assert all(candidate in list(ParameterGrid(RIDGE_GRID)) for candidate in result.candidates)
+    assert result.best_params == result.candidates[int(np.argmax(result.mean_scores))]
+    assert result.best_estimator.get_params()["alpha"] == result.best_params["alpha"]
+#------------------------------------------------------------------
+@pytest.mark.parametrize("model, params, search, n_final", [
+    # 12 candidates on 20 then 60 training rows: 12 -> 4
+    (Ridge(), RIDGE_GRID, {"strategy": "halving", "resource": "n_samples", "min_resources": 20}, 4),
+    # 8 candidates with 9 then 27 trees: 8 -> 3
+    (RandomForestRegressor(random_state=0), {"n_estimators": [27], "max_depth": [1, 2, 3, None], "max_features": [0.5, 1.0]},
+     {"strategy": "halving", "resource": "n_estimators", "min_resources": 3}, 3),
+])
+def test_halving_search_narrows_the_grid_to_a_champion(regression_data, model, params, search, n_final):
+    X, y = regression_data
+    family = type(model).__name__
+    result = ModelSearch(n_jobs=1, cv_folds=3, warm_start=False).run(
+        {family: {"model": model, "params": params, "search": search}}, X, y)[family]
+    n_grid = len(ParameterGrid({name: values for name, values in params.items() if name != search["resource"]}))
+    assert result.strategy == "halving"
+    assert len(result.candidates) == n_final
+    assert result.n_fits == 3 * (n_grid + n_final)
+    if search["resource"] == "n_estimators":
+        assert all(candidate["n_estimators"] == 27 for candidate in result.candidates)
+    assert result.best_params == result.candidates[int(np.argmax(result.mean_scores))]
+    assert result.best_estimator.predict(X).shape == y.shape
+#------------------------------------------------------------------
+# Warm-start n_estimators sweep: prefixes of one fit must score like fits from scratch
+#------------------------------------------------------------------
+@pytest.mark.parametrize("family", ["RandomForestRegressor", "GradientBoostingRegressor"])
+def test_warm_start_sizes_match_fits_from_scratch(regression_data, family):
+    X, y = regression_data
+    spec = {family: {"model": MODEL_HYPERPARAMETERS[family]["model"],
+                     "params": {**MODEL_HYPERPARAMETERS[family]["params"], "n_estimators": [2, 5, 9]}}}
+    warm = ModelSearch(n_jobs=1, cv_folds=3, warm_start=True).run(spec, X, y)[family]
+    scratch = ModelSearch(n_jobs=1, cv_folds=3, warm_start=False).run(spec, X, y)[family]
+    assert warm.candidates == scratch.candidates
+    np.testing.assert_array_equal(warm.fold_scores, scratch.fold_scores)
+    assert warm.best_params == scratch.best_params
+    # one fit per fold for every group of candidates that differ only by n_estimators
+    assert warm.n_fits == scratch.n_fits // 3
+#------------------------------------------------------------------
+# Fit cache: a rerun on unchanged data is answered from disk
+#------------------------------------------------------------------
+def test_second_run_is_served_from_the_fit_cache(regression_data, tmp_path):
+    X, y = regression_data
+    first = ModelSearch(n_jobs=1, cv_folds=3, fit_cache=FitCache(tmp_path)).run(MODEL_HYPERPARAMETERS, X, y)
+
+    cache = FitCache(tmp_path)   # a fresh process reads the saved index
+    search = ModelSearch(n_jobs=1, cv_folds=3, fit_cache=cache)
+    second = search.run(MODEL_HYPERPARAMETERS, X, y)
+    assert cache.misses == 0
+    for family, result in second.items():
+        report = search.report["families"][family]
+        assert report["tasks_run"] == 0 and report["tasks_cached"] > 0
+        assert result.candidates == first[family].candidates
+        np.testing.assert_array_equal(result.fold_scores, first[family].fold_scores)
+        np.testing.assert_array_equal(result.best_estimator.predict(X), first[family].best_estimator.predict(X))
+#------------------------------------------------------------------
+# Budgeted scheduling: stops dispatching but always returns a fitted champion
+#------------------------------------------------------------------
+def test_spent_budget_stops_dispatch_and_keeps_a_champion(regression_data):
+    X, y = regression_data
+    search = ModelSearch(n_jobs=1, cv_folds=3, budget_seconds=1e-6, dominance_margin=None)
+    results = search.run(MODEL_HYPERPARAMETERS, X, y)
+
+    families = search.report["families"]
+    assert sum(report["tasks_skipped"] for report in families.values()) > 0
+    assert any(report["status"] == "budget_exhausted" for report in families.values())
+    assert results
+    for result in results.values():
+        assert np.isfinite(result.fold_scores).all()
+        assert result.best_estimator.predict(X).shape == y.shape
+#------------------------------------------------------------------
+def test_dominated_family_is_stopped_early(regression_data):
+    X, y = regression_data
+    spec = {"Ridge": MODEL_HYPERPARAMETERS["Ridge"],
+            "Lasso": {"model": Lasso(), "params": {"alpha": [1e4, 1e5, 1e6, 1e7]}}}   # predicts the mean: R2 <= 0
+    search = ModelSearch(n_jobs=1, cv_folds=3, budget_seconds=600, dominance_margin=0.1, dominance_min_candidates=1,
+                         family_priority={"Ridge": 1.0, "Lasso": 0.0})
+    results = search.run(spec, X, y)
+
+    lasso = search.report["families"]["Lasso"]
+    assert lasso["status"] == "stopped_dominated"
+    assert lasso["tasks_run"] == 3 and lasso["tasks_skipped"] == 3 * 3
+    assert list(results) == ["Ridge"]
+    assert search.report["families"]["Ridge"]["status"] == "complete"
+    assert results["Ridge"].best_estimator.predict(X).shape == y.shape
@@ -0,0 +1,67 @@
+"""
+Tests for the exhaustive prediction lookup table (prediction_table.PredictionTable).
+Lookups inside the precomputed space must return the champion's prediction; anything outside
+it (unseen level, non-integer or out-of-range score) must fall back to the model.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import Ridge
+#------------------------------------------------------------------
+import src.myproject.app as serving_app
+from src.myproject.components.prediction_table import PredictionTable, build_prediction_table
+from src.myproject.pipeline.model_registry import ModelRegistry
+from tests.conftest import FEATURE_COLUMNS, make_frame, save_fitted_artifacts
+#------------------------------------------------------------------
+SCORE_MIN, SCORE_MAX = 20, 100
+#------------------------------------------------------------------
+@pytest.fixture(scope="module")
+def table_and_model(tmp_path_factory):
+    artifact_dir = tmp_path_factory.mktemp("table")
+    _, model_path, preprocessor, model = save_fitted_artifacts(artifact_dir, Ridge(alpha=1.0))
+    table_path = build_prediction_table(preprocessor, model, artifact_dir / "table.npy", champion_model_path=model_path,
+                                        score_min=SCORE_MIN, score_max=SCORE_MAX)
+    return PredictionTable.load(table_path, champion_model_path=model_path), preprocessor, model, model_path
+#------------------------------------------------------------------
+def model_predictions(preprocessor, model, df: pd.DataFrame) -> np.ndarray:
+    return model.predict(preprocessor.transform(df[FEATURE_COLUMNS]))
+#------------------------------------------------------------------
+def test_lookups_match_the_model(table_and_model):
+    table, preprocessor, model, _ = table_and_model
+    df = make_frame(200, seed=5)[FEATURE_COLUMNS]
+    expected = model_predictions(preprocessor, model, df)
+    np.testing.assert_allclose(table.lookup_many(df), expected, rtol=1e-6, atol=1e-4)   # stored as float32
+    for record, prediction in zip(df.head(20).to_dict("records"), expected):
+        assert table.lookup(record) == pytest.approx(prediction, rel=1e-6, abs=1e-4)
+#------------------------------------------------------------------
+@pytest.mark.parametrize("column, value", [("gender", "unknown"), ("reading_score", 55.5),
+                                           ("writing_score", SCORE_MAX + 1), ("reading_score", None)])
+def test_records_outside_the_table_fall_back(table_and_model, column, value):
+    table, _, _, _ = table_and_model
+    df = make_frame(4, seed=6)[FEATURE_COLUMNS]
+    df[column] = df[column].astype(object)
+    df.loc[2, column] = value
+    assert table.lookup(df.loc[2].to_dict()) is None
+    looked_up = table.lookup_many(df)
+    assert np.isnan(looked_up[2]) and np.isfinite(np.delete(looked_up, 2)).all()
+#------------------------------------------------------------------
+def test_table_for_another_champion_is_ignored(table_and_model, tmp_path):
+    _, _, _, model_path = table_and_model
+    _, other_model_path, _, _ = save_fitted_artifacts(tmp_path, Ridge(alpha=50.0))
+    table_path = model_path.parent / "table.npy"
+    assert PredictionTable.load(table_path, champion_model_path=model_path) is not None
+    assert PredictionTable.load(table_path, champion_model_path=other_model_path) is None
+#------------------------------------------------------------------
+def test_batch_endpoint_scores_rows_outside_the_table_with_the_model(table_and_model, monkeypatch):
+    _, preprocessor, model, model_path = table_and_model
+    registry = ModelRegistry(model_path.parent / "preprocessor.joblib", model_path,
+                             table_path=model_path.parent / "table.npy", use_table=True)
+    assert registry.current.prediction_table is not None
+    monkeypatch.setattr(serving_app, "registry", registry)
+
+    df = make_frame(6, seed=7)[FEATURE_COLUMNS]
+    df.loc[[1, 4], "reading_score"] = [55.5, SCORE_MAX + 10]
+    response = serving_app.app.test_client().post("/predict/batch", json=df.to_dict("records"))
+    assert response.status_code == 200
+    np.testing.assert_allclose(response.get_json()["predictions"], model_predictions(preprocessor, model, df),
+                               rtol=1e-6, atol=1e-4)
@@ -0,0 +1,68 @@
+"""
+Tests for the micro-batching request coalescer (request_coalescer.RequestCoalescer).
+Every caller must get the prediction of its own record, and a failed batch must fail every
+request waiting on it.
+"""
+import threading
+import pytest
+#------------------------------------------------------------------
+import src.myproject.exception as exception
+from src.myproject.pipeline.request_coalescer import RequestCoalescer
+#------------------------------------------------------------------
+class RecordingModel:
+    """Predicts 10 * x for each row and remembers the batch sizes it was called with."""
+    def __init__(self, fail_when=None):
+        self.batch_sizes = []
+        self.fail_when = fail_when
+    #----------------------------------------------------------------
+    def __call__(self, df):
+        self.batch_sizes.append(len(df))
+        if self.fail_when is not None and (df["x"] == self.fail_when).any():
+            raise ValueError("bad row in batch")
+        return (df["x"] * 10.0).to_numpy()
+#------------------------------------------------------------------
+def test_results_fan_out_to_their_own_callers():
+    model = RecordingModel()
+    coalescer = RequestCoalescer(model, max_batch_rows=8, max_wait_ms=50)
+    try:
+        futures = [coalescer.submit({"x": i}) for i in range(20)]
+        assert [future.result(timeout=10) for future in futures] == [10.0 * i for i in range(20)]
+    finally:
+        coalescer.shutdown(timeout=10)
+    assert sum(model.batch_sizes) == 20
+    assert max(model.batch_sizes) <= 8 and len(model.batch_sizes) < 20
+    assert coalescer.stats()["rows"] == 20
+#------------------------------------------------------------------
+def test_concurrent_callers_get_their_own_predictions():
+    coalescer = RequestCoalescer(RecordingModel(), max_batch_rows=16, max_wait_ms=20)
+    results = {}
+    def call(i):
+        results[i] = coalescer.predict({"x": i}, timeout=10)
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(40)]
+    try:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=10)
+    finally:
+        coalescer.shutdown(timeout=10)
+    assert results == {i: 10.0 * i for i in range(40)}
+#------------------------------------------------------------------
+def test_failed_batch_fails_every_waiting_request():
+    model = RecordingModel(fail_when=3)
+    coalescer = RequestCoalescer(model, max_batch_rows=5, max_wait_ms=200)
+    try:
+        futures = [coalescer.submit({"x": i}) for i in range(5)]    # one full batch holding the bad row
+        for future in futures:
+            with pytest.raises(exception.CustomException):
+                future.result(timeout=10)
+        assert coalescer.predict({"x": 7}, timeout=10) == 70.0        # the worker keeps serving
+    finally:
+        coalescer.shutdown(timeout=10)
+    assert model.batch_sizes[0] == 5
+#------------------------------------------------------------------
+def test_submit_after_shutdown_is_rejected():
+    coalescer = RequestCoalescer(RecordingModel(), max_batch_rows=4, max_wait_ms=1)
+    coalescer.shutdown(timeout=10)
+    with pytest.raises(RuntimeError):
+        coalescer.submit({"x": 1})
@@ -0,0 +1,27 @@
+"""
+Tests for the pandas-free single-row encoder (row_encoder.PreprocessorRowEncoder).
+Each encoded record must equal the matching row of ColumnTransformer.transform.
+"""
+import numpy as np
+import pytest
+#------------------------------------------------------------------
+import src.myproject.utils as utils
+from src.myproject.pipeline.row_encoder import PreprocessorRowEncoder
+from tests.conftest import make_frame
+#------------------------------------------------------------------
+@pytest.mark.parametrize("dtype", [np.float64, np.float32])
+def test_encoded_records_match_the_preprocessor(dtype):
+    X = make_frame(60)[["gender", "lunch", "reading_score"]]
+    numerical, categorical = utils.list_dataframe_columns_by_type(X)
+    preprocessor = utils.create_data_transformation_object(numerical, categorical, dtype=dtype).fit(X)
+    records = X.head(10).copy()
+    records.loc[0, "reading_score"] = np.nan
+    records.loc[1, "gender"] = np.nan
+    records.loc[2, "gender"] = None
+    records.loc[3, "lunch"] = "unknown"
+
+    encoder = PreprocessorRowEncoder(preprocessor)
+    encoded = np.vstack([encoder.encode(record) for record in records.to_dict("records")])
+    expected = np.asarray(preprocessor.transform(records))
+    assert encoded.dtype == expected.dtype
+    np.testing.assert_array_equal(encoded, expected)